@@ -0,0 +1,64 @@
+# 낮/밤 판별 방식 비교: 별도 ResNet18 분류 모델(classifier) vs YOLO 특징 헤드(detector_head)
+# 배치 크기별 이미지당 지연시간, 모델 로딩 시간, 두 방식의 낮/밤 일치율
+# 실행: python -m src.bench.bench_day_night_head --batch-sizes 1 4 8
+# (먼저 python -m src.utils.train_day_night_head 로 src/models/day_night_head.pth 생성)
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.core.ModelWrapper import ModelWrapper
+from src.utils.eval_utils import list_images
+from src.utils.image_utils import load_image
+
+MODEL_PATHS = ["night_day_model.pth", "yolo_best.pt"]
+
+
+def day_or_night(result) -> str:
+    classification = result["classification"]
+    return "night" if classification["night"] > classification["day"] else "day"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="낮/밤 분류 모델 vs YOLO 특징 헤드 지연시간 비교")
+    parser.add_argument("--images", nargs="+",
+                        default=[os.path.join("dataset", "images", "test"), os.path.join("dataset", "images", "val")])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    images = []
+    for image_dir in args.images:
+        for path in list_images(image_dir):
+            with open(path, "rb") as f:
+                images.append(load_image(f.read())[0])
+    print(f"images={len(images)}")
+
+    labels = {}
+    for source in ("classifier", "detector_head"):
+        start = time.perf_counter()
+        model = ModelWrapper(MODEL_PATHS, day_night_source=source, parallel_load=False)
+        load_ms = (time.perf_counter() - start) * 1000
+        model.predict_batch(images[:max(args.batch_sizes)])  # 워밍업
+
+        labels[source] = [day_or_night(r) for b in range(0, len(images), 8)
+                          for r in model.predict_batch(images[b:b + 8])]
+        for batch_size in args.batch_sizes:
+            per_image = []
+            for _ in range(args.repeat):
+                for b in range(0, len(images) - batch_size + 1, batch_size):
+                    start = time.perf_counter()
+                    model.predict_batch(images[b:b + batch_size])
+                    per_image.append((time.perf_counter() - start) * 1000 / batch_size)
+            lat = np.array(per_image)
+            print(f"{source:<14} load={load_ms:7.0f}ms  batch={batch_size:<2}  "
+                  f"p50={np.percentile(lat, 50):7.1f}ms/img  p95={np.percentile(lat, 95):7.1f}ms/img")
+        del model
+
+    agreement = np.mean([a == b for a, b in zip(labels["classifier"], labels["detector_head"])])
+    print(f"day/night agreement (detector_head vs classifier): {agreement:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# 위치 저장소(HazardStore) 벤치마크: 관측 적재 속도와 bbox 조회 지연
+# 서울 일대에 위험 요소를 흩뿌리고, 여러 차량이 같은 위치를 반복 촬영하는 관측을 생성
+# 실행: python -m src.bench.bench_hazard_store --observations 1000000 --hazards 50000
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.utils.hazard_store import METERS_PER_DEGREE, HazardStore
+
+# 서울 대략적 범위 (위도, 경도)
+REGION = (37.45, 126.80, 37.70, 127.15)
+CLASS_IDS = (1, 4, 5, 8, 11, 12)
+
+
+def query_box(center_lat, center_lon, size_m):
+    half_lat = size_m / 2 / METERS_PER_DEGREE
+    half_lon = half_lat / np.cos(np.radians(center_lat))
+    return center_lat - half_lat, center_lon - half_lon, center_lat + half_lat, center_lon + half_lon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="위치 저장소 적재/조회 벤치마크")
+    parser.add_argument("--observations", type=int, default=200_000)
+    parser.add_argument("--hazards", type=int, default=20_000, help="서로 다른 실제 위험 요소 수")
+    parser.add_argument("--jitter-m", type=float, default=3.0, help="같은 위험 요소 관측의 GPS 오차 (미터)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--path", help="저장소 파일 (기본: 임시 파일)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lat0, lon0, lat1, lon1 = REGION
+    sites = np.column_stack([rng.uniform(lat0, lat1, args.hazards), rng.uniform(lon0, lon1, args.hazards)])
+    site_classes = rng.choice(CLASS_IDS, args.hazards)
+    # 관측 분포는 일부 도로에 몰리도록 Zipf 비슷하게
+    picks = np.minimum(rng.zipf(1.3, args.observations) - 1, args.hazards - 1)
+    jitter = rng.normal(0, args.jitter_m / METERS_PER_DEGREE, (args.observations, 2))
+    risks = rng.choice(["A", "B", "C"], args.observations, p=[0.6, 0.3, 0.1])
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "hazards.sqlite3")
+    store = HazardStore(path)
+    start = time.perf_counter()
+    for i, site in enumerate(picks):
+        lat, lon = sites[site] + jitter[i]
+        store.add_observation(lat, lon, 1.7e9 + i, [{"class_id": int(site_classes[site]), "risk_level": risks[i]}],
+                              overall_risk=risks[i])
+    elapsed = time.perf_counter() - start
+    stats = store.stats()
+    print(f"observations={stats['observations']}  hazards(cells)={stats['hazards']}  "
+          f"insert={args.observations / elapsed:,.0f} obs/s  file={os.path.getsize(path) / 2**20:.1f}MB")
+
+    for size_m in (200, 1000, 5000, 20000):
+        latencies, counts = [], []
+        for _ in range(args.queries):
+            center = sites[rng.integers(args.hazards)]
+            box = query_box(center[0], center[1], size_m)
+            start = time.perf_counter()
+            counts.append(len(store.query(*box, limit=10000)))
+            latencies.append((time.perf_counter() - start) * 1000)
+        lat = np.array(latencies)
+        print(f"bbox {size_m / 1000:>5.1f}km  p50={np.percentile(lat, 50):7.3f}ms  p99={np.percentile(lat, 99):7.3f}ms  "
+              f"avg hazards={np.mean(counts):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
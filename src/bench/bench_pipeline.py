@@ -0,0 +1,245 @@
+# /predict 파이프라인 오프라인 벤치마크 (네트워크/실제 S3 불필요)
+# - dataset/images/test 이미지를 ASGI 테스트 클라이언트로 /predict 에 전송
+# - S3는 프로세스 내 스텁(src.bench.in_memory_s3.InMemoryS3)으로 대체 (--s3-latency-ms 로 업로드 지연 모사)
+#   --s3-endpoint 를 주면 실제 boto3 클라이언트(커넥션 풀/재시도 설정 포함)로 S3 호환 엔드포인트에 업로드
+#   ("stand-in"이면 src.bench.s3_stand_in 스텁 서버를 같은 프로세스에서 띄워 사용)
+# - 단일 요청 단계별 지연(/metrics 히스토그램), 동시성별 처리량, 최대 RSS를 JSON으로 저장
+# 실행: python -m src.bench.bench_pipeline --output bench_results/pipeline.json
+# 비교: python -m src.bench.bench_pipeline --compare bench_results/pipeline.json  (회귀 시 종료 코드 1)
+import argparse
+import asyncio
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.bench.in_memory_s3 import InMemoryS3
+
+CONCURRENCY_LEVELS = (1, 4, 16, 64)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss 단위: Linux KiB, macOS bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def stage_totals():
+    # /metrics 단계별 히스토그램의 (누적 시간, 횟수)
+    from src.utils.metrics_utils import METRICS_ENABLED
+
+    if not METRICS_ENABLED:
+        return {}
+    from src.utils.metrics_utils import STAGE_SECONDS
+
+    totals = {}
+    for metric in STAGE_SECONDS.collect():
+        for sample in metric.samples:
+            stage = sample.labels.get("stage")
+            if sample.name.endswith("_sum"):
+                totals.setdefault(stage, [0.0, 0])[0] = sample.value
+            elif sample.name.endswith("_count"):
+                totals.setdefault(stage, [0.0, 0])[1] = sample.value
+    return totals
+
+
+def summarize(latencies):
+    lat = np.array(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "p90_ms": round(float(np.percentile(lat, 90)), 3),
+        "p99_ms": round(float(np.percentile(lat, 99)), 3),
+        "mean_ms": round(float(lat.mean()), 3),
+    }
+
+
+async def post_image(client, payload: bytes):
+    start = time.perf_counter()
+    response = await client.post("/predict", files={"file": ("image.jpg", payload, "image/jpeg")})
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/predict 실패 ({response.status_code}): {response.text[:200]}")
+    return elapsed
+
+
+async def run_single(client, payloads, repeat: int):
+    # 동시성 1로 순차 요청 - 요청 전후 히스토그램 차이로 단계별 평균 지연 계산
+    before = stage_totals()
+    latencies = [await post_image(client, payloads[i % len(payloads)]) for i in range(repeat)]
+    after = stage_totals()
+    stages = {}
+    for stage, (total, count) in after.items():
+        prev_total, prev_count = before.get(stage, (0.0, 0))
+        if count > prev_count:
+            stages[stage] = {"mean_ms": round((total - prev_total) / (count - prev_count) * 1000, 3),
+                             "count": int(count - prev_count)}
+    return {"requests": repeat, "latency": summarize(latencies), "stages": stages}
+
+
+async def run_concurrency(client, payloads, concurrency: int, total: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await post_image(client, payloads[i % len(payloads)])
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, "requests": total,
+            "throughput_rps": round(total / elapsed, 3), "latency": summarize(latencies)}
+
+
+async def run_benchmark(args, payloads):
+    import httpx
+
+    from src.main import app
+
+    await app.router.startup()
+    if not args.s3_endpoint:
+        app.state.s3_uploader.s3_client = InMemoryS3(args.s3_latency_ms)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # 워밍업 (첫 추론의 지연 초기화 비용 제외)
+            for payload in payloads[:args.warmup]:
+                await post_image(client, payload)
+            single = await run_single(client, payloads, args.repeat)
+            concurrency = []
+            for level in args.concurrency:
+                total = max(args.requests, level * 2)
+                concurrency.append(await run_concurrency(client, payloads, level, total))
+                print(f"concurrency={level:<3} {concurrency[-1]['throughput_rps']:8.2f} req/s  "
+                      f"p50={concurrency[-1]['latency']['p50_ms']:.1f}ms  "
+                      f"p99={concurrency[-1]['latency']['p99_ms']:.1f}ms", file=sys.stderr)
+            stats = app.state.scheduler.stats()
+    finally:
+        await app.router.shutdown()
+    return single, concurrency, stats
+
+
+def compare(result, baseline, max_regression: float, min_delta_ms: float):
+    # 처리량 감소 / 지연 증가가 max_regression 비율을 넘으면 회귀로 판단
+    # (지연은 min_delta_ms 이상 늘어난 경우만 - 1ms 미만 단계의 측정 잡음 제외)
+    regressions = []
+
+    def check(name, new, old, higher_is_better, is_latency=False):
+        if not old:
+            return
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        significant = not is_latency or new - old >= min_delta_ms
+        flag = "REGRESSION" if worse > max_regression and significant else ""
+        print(f"{name:<32} {old:10.2f} -> {new:10.2f} ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(name)
+
+    check("single p50_ms", result["single"]["latency"]["p50_ms"], baseline["single"]["latency"]["p50_ms"], False, True)
+    for stage, values in result["single"]["stages"].items():
+        old = baseline["single"]["stages"].get(stage)
+        if old:
+            check(f"stage {stage} mean_ms", values["mean_ms"], old["mean_ms"], False, True)
+    old_levels = {run["concurrency"]: run for run in baseline["concurrency"]}
+    for run in result["concurrency"]:
+        old = old_levels.get(run["concurrency"])
+        if old:
+            check(f"c={run['concurrency']} throughput_rps", run["throughput_rps"], old["throughput_rps"], True)
+    check("peak_rss_mb", result["peak_rss_mb"], baseline["peak_rss_mb"], False)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/predict 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--limit", type=int, default=32, help="사용할 최대 이미지 수")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20, help="단일 요청 측정 횟수")
+    parser.add_argument("--requests", type=int, default=64, help="동시성 단계별 요청 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(CONCURRENCY_LEVELS))
+    parser.add_argument("--s3-latency-ms", type=float, default=0.0)
+    parser.add_argument("--s3-endpoint", help="S3 호환 엔드포인트 URL 또는 stand-in (기본: 프로세스 내 스텁)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")) + glob.glob(os.path.join(args.images, "*.png")))
+    if not paths:
+        raise SystemExit(f"이미지를 찾을 수 없습니다: {args.images}")
+    payloads = []
+    for path in paths[:args.limit]:
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+
+    # src.main import 전에 설정: 결과 캐시를 끄고(같은 이미지 반복), 모델은 시작 시 로드, 더미 S3 자격 증명
+    os.environ["RESULT_CACHE_MAX_ENTRIES"] = "0"
+    os.environ["MODEL_LOAD_MODE"] = "startup"
+    for key, value in (("AWS_ACCESS_KEY_ID", "bench"), ("AWS_SECRET_ACCESS_KEY", "bench"),
+                       ("AWS_REGION", "us-east-1"), ("S3_BUCKET_NAME", "bench")):
+        os.environ.setdefault(key, value)
+    stand_in = None
+    if args.s3_endpoint == "stand-in":
+        from src.bench.s3_stand_in import serve
+
+        stand_in = serve(port=0, latency_ms=args.s3_latency_ms)
+        threading.Thread(target=stand_in.serve_forever, daemon=True).start()
+        args.s3_endpoint = f"http://127.0.0.1:{stand_in.server_address[1]}"
+    if args.s3_endpoint:
+        os.environ["S3_ENDPOINT_URL"] = args.s3_endpoint
+
+    single, concurrency, scheduler_stats = asyncio.run(run_benchmark(args, payloads))
+
+    import torch
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "cpu_count": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "infer_backend": os.getenv("INFER_BACKEND", "torch"),
+            "upload_mode": os.getenv("UPLOAD_MODE", "parallel"),
+        },
+        "config": {"images": len(payloads), "s3_latency_ms": args.s3_latency_ms,
+                   "s3_endpoint": "stand-in" if stand_in is not None else args.s3_endpoint},
+        "single": single,
+        "concurrency": concurrency,
+        "batching": scheduler_stats,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n비교 기준: {baseline['commit']} ({baseline['timestamp']})")
+        regressions = compare(result, baseline, args.max_regression, args.min_delta_ms)
+        if regressions:
+            raise SystemExit(f"성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
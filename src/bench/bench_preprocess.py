@@ -0,0 +1,75 @@
+# 분류 모델 전처리 마이크로벤치마크: 매 호출마다 transforms.Compose를 만들던 기존 방식 vs Preprocessor
+# 실행: python -m src.bench.bench_preprocess --images dataset/images/test
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import torch
+import torchvision.transforms as transforms
+from PIL import Image
+from torch.profiler import ProfilerActivity, profile
+
+from src.core.Preprocessor import Preprocessor
+
+
+def legacy_preprocess(image: Image.Image) -> torch.Tensor:
+    preprocess = transforms.Compose([
+        transforms.Resize((224, 224)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+    ])
+    return preprocess(image).unsqueeze(0)
+
+
+def measure(name, func, images, repeat):
+    for image in images[:2]:
+        func(image)  # warm-up
+
+    latencies = []
+    for _ in range(repeat):
+        for image in images:
+            start = time.perf_counter()
+            func(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # 이미지 1장당 torch 텐서 할당 횟수/바이트
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        for image in images:
+            func(image)
+    allocs = [e for e in prof.events() if e.cpu_memory_usage > 0]
+    alloc_count = len(allocs) / len(images)
+    alloc_bytes = sum(e.cpu_memory_usage for e in allocs) / len(images)
+
+    lat = np.array(latencies)
+    print(f"{name:<12} p50={np.percentile(lat, 50):7.3f}ms  p99={np.percentile(lat, 99):7.3f}ms  "
+          f"mean={lat.mean():7.3f}ms  allocs/img={alloc_count:6.1f}  alloc_bytes/img={alloc_bytes / 1024:9.1f}KiB")
+    return lat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분류 모델 전처리 지연시간/할당 비교")
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")) + glob.glob(os.path.join(args.images, "*.png")))
+    if not paths:
+        raise SystemExit(f"이미지를 찾을 수 없습니다: {args.images}")
+    images = [Image.open(p).convert("RGB") for p in paths]
+
+    preprocessor = Preprocessor()
+    max_diff = max(
+        float((legacy_preprocess(image) - preprocessor([image])).abs().max())
+        for image in images
+    )
+    print(f"images={len(images)}  repeat={args.repeat}  max|legacy - cached|={max_diff:.2e}")
+
+    legacy = measure("legacy", legacy_preprocess, images, args.repeat)
+    cached = measure("cached", lambda image: preprocessor([image]), images, args.repeat)
+    print(f"speedup (p50): {np.percentile(legacy, 50) / np.percentile(cached, 50):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
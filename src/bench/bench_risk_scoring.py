@@ -0,0 +1,82 @@
+# 마스크 기반 위험도 측정 비용 벤치마크 (dataset/masks 의 실제 마스크 사용)
+# 실행: python -m src.bench.bench_risk_scoring --masks dataset/masks/test --imgsz 640
+import argparse
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+from shapely.geometry import Polygon
+
+from src.utils.mask_utils import mask_geometry
+from src.utils.risk_utils import classify_image_risks, classify_risk
+
+CLASS_NAMES = {1: "거북등", 4: "불량 보수", 7: "젖은 도로", 9: "차선", 10: "차선 손상"}
+
+
+def load_objects(mask_path: str, imgsz: int):
+    # 클래스별 연결 요소를 하나의 객체 마스크로 보고, 모델 출력처럼 imgsz 해상도로 축소
+    full = cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE)
+    h0, w0 = full.shape
+    r = min(imgsz / h0, imgsz / w0)
+    small = cv2.resize(full, (round(w0 * r), round(h0 * r)), interpolation=cv2.INTER_NEAREST)
+    objects, classes = [], []
+    for class_id in np.unique(small):
+        if class_id == 0:
+            continue
+        n, labels = cv2.connectedComponents((small == class_id).astype(np.uint8))
+        for i in range(1, n):
+            objects.append(labels == i)
+            classes.append(int(class_id))
+    masks = np.stack(objects) if objects else np.zeros((0,) + small.shape, dtype=bool)
+    return masks, classes, (h0, w0)
+
+
+def vectorized(masks, classes, orig_shape):
+    area_px, length_px = mask_geometry(masks, orig_shape)
+    detections = [
+        {"bbox": [0, 0, 0, 0], "class": class_id, "mask_area_px": area, "mask_length_px": length}
+        for class_id, area, length in zip(classes, area_px.tolist(), length_px.tolist())
+    ]
+    return classify_image_risks(detections)[1]
+
+
+def shapely_per_object(masks, classes, orig_shape):
+    # 비교용: 객체마다 윤곽선 → shapely Polygon 생성 후 면적 계산
+    risks = []
+    for mask, class_id in zip(masks, classes):
+        contours, _ = cv2.findContours(mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+        area = sum(Polygon(c[:, 0, :]).area for c in contours if len(c) >= 3)
+        risks.append(classify_risk(CLASS_NAMES.get(class_id), area=area))
+    return risks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마스크 기반 위험도 측정 벤치마크")
+    parser.add_argument("--masks", default=os.path.join("dataset", "masks", "test"))
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = [load_objects(p, args.imgsz) for p in sorted(glob.glob(os.path.join(args.masks, "*.png")))]
+    n_objects = sum(len(classes) for _, classes, _ in samples)
+    if not n_objects:
+        raise SystemExit(f"마스크를 찾을 수 없습니다: {args.masks}")
+    print(f"images={len(samples)}  objects={n_objects}  mask resolution≈{args.imgsz}px")
+
+    for name, func in (("vectorized", vectorized), ("shapely", shapely_per_object)):
+        per_image = []
+        for _ in range(args.repeat):
+            for masks, classes, orig_shape in samples:
+                start = time.perf_counter()
+                func(masks, classes, orig_shape)
+                per_image.append((time.perf_counter() - start) * 1000)
+        lat = np.array(per_image)
+        per_object = lat.sum() / (n_objects * args.repeat)
+        print(f"{name:<11} per-image p50={np.percentile(lat, 50):7.3f}ms  p99={np.percentile(lat, 99):7.3f}ms  "
+              f"per-object={per_object:6.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
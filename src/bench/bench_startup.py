@@ -0,0 +1,77 @@
+# 서버 콜드 스타트 벤치마크: 설정별로 새 프로세스를 띄워 import → 첫 /  응답 → /ready 200 까지의 시간을 측정
+# 실행: python -m src.bench.bench_startup --repeat 3
+# (src/models 의 night_day_model.pth, yolo_best.pt 와 S3 환경 변수가 필요. 리포지토리 루트에서 실행)
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+CONFIGS = {
+    # 이름: 환경 변수
+    "sequential": {"MODEL_LOAD_MODE": "startup", "MODEL_PARALLEL_LOAD": "0", "MODEL_MMAP": "0"},
+    "parallel": {"MODEL_LOAD_MODE": "startup", "MODEL_PARALLEL_LOAD": "1", "MODEL_MMAP": "0"},
+    "parallel+mmap": {"MODEL_LOAD_MODE": "startup", "MODEL_PARALLEL_LOAD": "1", "MODEL_MMAP": "1"},
+    "background": {"MODEL_LOAD_MODE": "background", "MODEL_PARALLEL_LOAD": "1", "MODEL_MMAP": "1"},
+}
+
+
+def child():
+    # 측정 대상 프로세스: 결과를 JSON 한 줄로 stdout에 출력
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+    imported = time.perf_counter()
+
+    with TestClient(app) as client:
+        client.get("/").raise_for_status()
+        serving = time.perf_counter()
+        while True:
+            response = client.get("/ready")
+            if response.status_code == 200:
+                break
+            if response.json().get("status") == "error":
+                raise SystemExit(f"모델 로딩 실패: {response.json()['message']}")
+            time.sleep(0.01)
+        ready = time.perf_counter()
+        load_seconds = response.json()["model_load_seconds"]
+
+    print(json.dumps({
+        "import_s": imported - start,
+        "serving_s": serving - start,
+        "ready_s": ready - start,
+        "model_load_s": load_seconds,
+    }))
+
+
+def run_config(env_overrides):
+    env = dict(os.environ, **env_overrides)
+    out = subprocess.run([sys.executable, "-m", "src.bench.bench_startup", "--child"],
+                         env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 콜드 스타트 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    print(f"{'config':<14} {'import':>8} {'serving':>8} {'ready':>8} {'model load':>11}  (median of {args.repeat}, s)")
+    for name in args.configs:
+        runs = [run_config(CONFIGS[name]) for _ in range(args.repeat)]
+        median = {key: float(np.median([run[key] for run in runs])) for key in runs[0]}
+        print(f"{name:<14} {median['import_s']:8.2f} {median['serving_s']:8.2f} {median['ready_s']:8.2f} "
+              f"{median['model_load_s']:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# 타일 추론(TILED_INFERENCE) 벤치마크: 전체 프레임 대비 이미지당 지연시간과 mAP@0.5 / recall 비교
+# 실행: python -m src.bench.bench_tiling --images dataset/images/test --labels dataset/labels/test --max-side 2560
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.core.ModelWrapper import ModelWrapper
+from src.utils.eval_utils import evaluate_detections, label_path_for, list_images, load_yolo_labels
+from src.utils.image_utils import load_image, rescale_detections
+
+MODEL_PATHS = ["night_day_model.pth", "yolo_best.pt"]
+
+# (이름, 타일 사용, 타일 크기, 겹침 비율)
+CONFIGS = [
+    ("full-frame", False, 640, 0.0),
+    ("tiled 640/0.20", True, 640, 0.2),
+    ("tiled 512/0.25", True, 512, 0.25),
+    ("tiled 384/0.25", True, 384, 0.25),  # dataset/images/test(512px)에서도 타일이 생기는 크기
+]
+
+
+def to_arrays(detections):
+    # ModelWrapper 검출([x, y, w, h]) -> evaluate_detections 입력 (classes, confs, xyxy)
+    if not detections:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros((0, 4))
+    cls = np.array([d["class"] for d in detections], dtype=np.int64)
+    conf = np.array([d["confidence"] for d in detections])
+    xywh = np.array([d["bbox"] for d in detections], dtype=np.float64)
+    return cls, conf, np.column_stack([xywh[:, :2], xywh[:, :2] + xywh[:, 2:]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="타일 추론 지연/정확도 벤치마크")
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--labels", default=os.path.join("dataset", "labels", "test"))
+    parser.add_argument("--max-side", type=int, default=2560, help="디코딩 해상도 상한 (서비스의 MAX_INPUT_SIDE)")
+    parser.add_argument("--max-tiles", type=int, default=8)
+    parser.add_argument("--conf", type=float, default=0.25, help="mAP 계산용 최소 신뢰도")
+    parser.add_argument("--recall-conf", type=float, default=0.5)
+    parser.add_argument("--limit", type=int, default=0, help="사용할 이미지 수 (0이면 전체)")
+    parser.add_argument("--warmup", type=int, default=2)
+    args = parser.parse_args()
+
+    paths = list_images(args.images)
+    if args.limit:
+        paths = paths[:args.limit]
+    model = ModelWrapper(MODEL_PATHS, conf_threshold=args.conf, max_tiles=args.max_tiles)
+    with open(paths[0], "rb") as f:
+        warmup_image, _ = load_image(f.read(), args.max_side)
+    loaded = []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        image, scale = load_image(data, args.max_side)
+        w, h = round(image.width * scale[0]), round(image.height * scale[1])
+        loaded.append((image, scale, load_yolo_labels(label_path_for(path, args.labels), w, h)))
+    print(f"images={len(loaded)}  max_side={args.max_side}  conf>={args.conf}")
+
+    for name, tiled, tile_size, overlap in CONFIGS:
+        model.tiled, model.tile_size, model.tile_overlap = tiled, tile_size, overlap
+        for _ in range(args.warmup):
+            model.predict(warmup_image)
+
+        predictions, ground_truths, latencies = [], [], []
+        for image, scale, (gt_cls, gt_xyxy) in loaded:
+            start = time.perf_counter()
+            result = model.predict(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+            detections = rescale_detections(result["detection"]["detections"], scale)
+            predictions.append(to_arrays(detections))
+            # 서비스에서 제외하는 클래스는 정답에서도 제외
+            keep = ~np.isin(gt_cls, model.excluded_classes)
+            ground_truths.append((gt_cls[keep], gt_xyxy[keep]))
+
+        metrics = evaluate_detections(predictions, ground_truths, iou_threshold=0.5, recall_conf=args.recall_conf)
+        lat = np.array(latencies)
+        print(f"{name:<16} p50={np.percentile(lat, 50):8.1f}ms  p95={np.percentile(lat, 95):8.1f}ms  "
+              f"mAP50={metrics['map50']:.3f}  recall@{args.recall_conf}={metrics['recall']:.3f}  "
+              f"(gt={metrics['num_ground_truths']})")
+
+
+if __name__ == "__main__":
+    main()
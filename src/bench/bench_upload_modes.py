@@ -0,0 +1,80 @@
+# UPLOAD_MODE별(sequential / parallel / background) /predict 응답 지연 비교
+# - S3는 프로세스 내 스텁(InMemoryS3)으로 대체하고 --s3-latency-ms 로 업로드 지연을 주입
+# - 응답 본문이 준비될 때까지(run_prediction 반환)의 시간을 측정 - background 모드의 업로드는 이 시간에 포함되지 않음
+# 실행: python -m src.bench.bench_upload_modes --s3-latency-ms 50
+import argparse
+import asyncio
+import glob
+import os
+import time
+from typing import Dict, List
+
+from src.bench.bench_pipeline import summarize
+from src.bench.in_memory_s3 import InMemoryS3
+
+UPLOAD_MODES = ("sequential", "parallel", "background")
+
+
+async def measure_upload_mode(mode: str, payloads: List[bytes]) -> List[float]:
+    # 앱 startup 이후(app.state 준비)에 호출 - 요청마다 응답 준비까지의 시간(초)을 반환
+    import src.main as main
+    from src.utils.cache_utils import PendingResult
+
+    previous, main.UPLOAD_MODE = main.UPLOAD_MODE, mode
+    latencies = []
+    try:
+        for payload in payloads:
+            start = time.perf_counter()
+            result = await main.run_prediction(payload)
+            latencies.append(time.perf_counter() - start)
+            # 다음 요청 전에 백그라운드 업로드를 끝내 측정 구간이 겹치지 않도록 함
+            if isinstance(result, PendingResult):
+                await result.ready
+    finally:
+        main.UPLOAD_MODE = previous
+    return latencies
+
+
+async def run_benchmark(payloads: List[bytes], s3_latency_ms: float, warmup: int) -> Dict[str, Dict]:
+    from src.main import app
+
+    await app.router.startup()
+    app.state.s3_uploader.s3_client = InMemoryS3(s3_latency_ms)
+    try:
+        await measure_upload_mode("parallel", payloads[:warmup])  # 워밍업
+        return {mode: summarize(await measure_upload_mode(mode, payloads)) for mode in UPLOAD_MODES}
+    finally:
+        await app.router.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UPLOAD_MODE별 /predict 응답 지연 비교")
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--limit", type=int, default=20, help="모드별 요청 수 (이미지 수)")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--s3-latency-ms", type=float, default=50.0, help="업로드 1회에 추가할 지연")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")) + glob.glob(os.path.join(args.images, "*.png")))
+    if not paths:
+        raise SystemExit(f"이미지를 찾을 수 없습니다: {args.images}")
+    payloads = []
+    for path in paths[:args.limit]:
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+
+    # src.main import 전에 설정: 모델은 시작 시 로드, 더미 S3 자격 증명
+    os.environ["MODEL_LOAD_MODE"] = "startup"
+    for key, value in (("AWS_ACCESS_KEY_ID", "bench"), ("AWS_SECRET_ACCESS_KEY", "bench"),
+                       ("AWS_REGION", "us-east-1"), ("S3_BUCKET_NAME", "bench")):
+        os.environ.setdefault(key, value)
+
+    results = asyncio.run(run_benchmark(payloads, args.s3_latency_ms, args.warmup))
+    print(f"images={len(payloads)}  s3_latency={args.s3_latency_ms:.0f}ms")
+    for mode, latency in results.items():
+        print(f"{mode:<11} p50={latency['p50_ms']:8.1f}ms  p99={latency['p99_ms']:8.1f}ms  "
+              f"mean={latency['mean_ms']:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
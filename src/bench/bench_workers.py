@@ -0,0 +1,123 @@
+# 멀티 워커 메모리/처리량 벤치마크: pre-fork(모델 공유) vs 워커별 개별 로드
+# 워커 수를 늘려 가며 워커당 RSS/PSS와 /predict_batch 처리량을 측정
+# 실행: python -m src.bench.bench_workers --workers 1 2 4 --duration 20
+# (src/models 의 모델 파일과 S3 환경 변수가 필요, 리포지토리 루트에서 실행, Linux 전용 - PSS 측정)
+import argparse
+import glob
+import io
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import numpy as np
+import psutil
+from PIL import Image
+
+
+def load_payload(images_dir: str) -> bytes:
+    paths = sorted(glob.glob(os.path.join(images_dir, "*.jpg")))
+    if paths:
+        with open(paths[0], "rb") as f:
+            return f.read()
+    buf = io.BytesIO()
+    Image.fromarray(np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def wait_ready(url: str, workers: int, timeout: float = 300):
+    # 워커마다 /ready가 200이 되어야 하므로 연속 성공 횟수로 판단 (연결은 워커에 무작위로 분배됨)
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while time.monotonic() < deadline:
+        try:
+            with httpx.Client() as client:
+                streak = streak + 1 if client.get(f"{url}/ready").status_code == 200 else 0
+        except httpx.HTTPError:
+            streak = 0
+        if streak >= workers * 5:
+            return
+        time.sleep(0.05)
+    raise TimeoutError("서버가 준비되지 않았습니다.")
+
+
+def memory_mb(server: psutil.Process):
+    workers = server.children()
+    rss = [w.memory_info().rss / 2**20 for w in workers]
+    # PSS: 공유 페이지를 공유 프로세스 수로 나눠 계산한 실제 점유량
+    pss = [w.memory_full_info().pss / 2**20 for w in workers]
+    parent_pss = server.memory_full_info().pss / 2**20
+    return float(np.mean(rss)), float(np.mean(pss)), parent_pss + sum(pss)
+
+
+def throughput(url: str, payload: bytes, concurrency: int, duration: float):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client_loop():
+        with httpx.Client(timeout=60) as client:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = client.post(f"{url}/predict_batch",
+                                       files=[("files", ("frame.jpg", payload, "image/jpeg"))])
+                with lock:
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors[0] += 1
+
+    threads = [threading.Thread(target=client_loop) for _ in range(concurrency)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+    p50 = np.percentile(latencies, 50) * 1000 if latencies else float("nan")
+    return len(latencies) / elapsed, p50, errors[0]
+
+
+def run(workers: int, preload: bool, args, payload: bytes):
+    cmd = [sys.executable, "-m", "src.serve", "--workers", str(workers), "--port", str(args.port)]
+    if not preload:
+        cmd.append("--no-preload")
+    server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(url, workers)
+        # 워밍업 후 (첫 추론에서 생성되는 버퍼까지 포함해) 메모리 측정
+        throughput(url, payload, workers, 2)
+        rps, p50, errors = throughput(url, payload, workers * args.concurrency_per_worker, args.duration)
+        rss, pss, total = memory_mb(psutil.Process(server.pid))
+        return rss, pss, total, rps, p50, errors
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멀티 워커 메모리/처리량 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency-per-worker", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    payload = load_payload(args.images)
+    print(f"{'mode':<10} {'workers':>7} {'RSS/worker':>11} {'PSS/worker':>11} {'total PSS':>10} "
+          f"{'req/s':>7} {'p50 ms':>8} {'errors':>6}")
+    for workers in args.workers:
+        for preload in (False, True):
+            rss, pss, total, rps, p50, errors = run(workers, preload, args, payload)
+            mode = "prefork" if preload else "separate"
+            print(f"{mode:<10} {workers:>7} {rss:>9.0f}MB {pss:>9.0f}MB {total:>8.0f}MB "
+                  f"{rps:>7.1f} {p50:>8.1f} {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
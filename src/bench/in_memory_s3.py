@@ -0,0 +1,24 @@
+# 벤치마크/테스트용 프로세스 내 S3 클라이언트 스텁 (표준 라이브러리만 사용)
+# S3Uploader가 쓰는 put_object / upload_fileobj(멀티파트 임계값 이상의 큰 파일)만 흉내 냄
+import threading
+import time
+
+
+class InMemoryS3:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def _store(self, bucket: str, key: str, size: int):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.objects[(bucket, key)] = size
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._store(Bucket, Key, len(Body))
+        return {"ETag": '"stub"'}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None, Callback=None):
+        self._store(Bucket, Key, len(Fileobj.read()))
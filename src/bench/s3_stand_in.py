@@ -0,0 +1,164 @@
+# 오프라인 부하 테스트용 S3 호환 스텁 서버 (path-style PutObject / 멀티파트 업로드만 지원, 본문은 크기만 기록)
+# 실행: python -m src.bench.s3_stand_in --port 9000 --latency-ms 20
+# 서버: S3_ENDPOINT_URL=http://127.0.0.1:9000 uvicorn src.main:app
+# 벤치: python -m src.bench.bench_pipeline --s3-endpoint http://127.0.0.1:9000
+import argparse
+import hashlib
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StandInS3:
+    def __init__(self, latency_ms: float = 0.0, fail_requests: int = 0):
+        self.latency = latency_ms / 1000
+        # 처음 fail_requests개의 쓰기 요청은 500 InternalError로 응답 (클라이언트 재시도 확인용)
+        self.fail_requests = fail_requests
+        self.objects = {}
+        self.uploads = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+
+def make_handler(store: StandInS3):
+    class Handler(BaseHTTPRequestHandler):
+        # keep-alive를 지원해야 클라이언트 커넥션 풀 재사용 효과를 측정할 수 있음
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length) if length else b""
+            if "aws-chunked" in self.headers.get("Content-Encoding", ""):
+                body = decode_aws_chunked(body)
+            return body
+
+        def _reply(self, status: int, body: bytes = b"", headers: dict = None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _target(self):
+            url = urlsplit(self.path)
+            bucket, _, key = url.path.lstrip("/").partition("/")
+            return bucket, key, {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+
+        def _begin(self) -> bool:
+            # False면 실패 응답을 이미 보냈으므로 요청을 처리하지 않음
+            with store._lock:
+                store.requests += 1
+                fail = store.fail_requests > 0
+                if fail:
+                    store.fail_requests -= 1
+            if store.latency:
+                time.sleep(store.latency)
+            if fail:
+                self._read_body()
+                self._reply(500, b"<Error><Code>InternalError</Code><Message>injected</Message></Error>",
+                            {"Content-Type": "application/xml"})
+            return not fail
+
+        def do_PUT(self):
+            if not self._begin():
+                return
+            bucket, key, query = self._target()
+            body = self._read_body()
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            with store._lock:
+                if "uploadId" in query:
+                    store.uploads[query["uploadId"]][1][int(query["partNumber"])] = len(body)
+                else:
+                    store.objects[(bucket, key)] = (len(body), self.headers.get("Content-Type"))
+            self._reply(200, headers={"ETag": etag})
+
+        def do_POST(self):
+            if not self._begin():
+                return
+            bucket, key, query = self._target()
+            self._read_body()
+            if "uploads" in query:
+                upload_id = uuid.uuid4().hex
+                with store._lock:
+                    store.uploads[upload_id] = (self.headers.get("Content-Type"), {})
+                body = (f"<InitiateMultipartUploadResult><Bucket>{bucket}</Bucket><Key>{key}</Key>"
+                        f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>").encode()
+            else:
+                with store._lock:
+                    content_type, parts = store.uploads.pop(query["uploadId"])
+                    store.objects[(bucket, key)] = (sum(parts.values()), content_type)
+                body = (f"<CompleteMultipartUploadResult><Bucket>{bucket}</Bucket><Key>{key}</Key>"
+                        f"<ETag>\"{uuid.uuid4().hex}-{len(parts)}\"</ETag></CompleteMultipartUploadResult>").encode()
+            self._reply(200, body, {"Content-Type": "application/xml"})
+
+        def do_DELETE(self):
+            if not self._begin():
+                return
+            bucket, key, query = self._target()
+            with store._lock:
+                store.uploads.pop(query.get("uploadId"), None)
+                store.objects.pop((bucket, key), None)
+            self._reply(204)
+
+        def do_HEAD(self):
+            bucket, key, _ = self._target()
+            with store._lock:
+                entry = store.objects.get((bucket, key))
+            if entry is None:
+                self._reply(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(entry[0]))
+            self.send_header("Content-Type", entry[1] or "application/octet-stream")
+            self.end_headers()
+
+    return Handler
+
+
+def decode_aws_chunked(body: bytes) -> bytes:
+    # botocore가 체크섬 trailer와 함께 보내는 aws-chunked 본문에서 데이터만 추출
+    data, pos = bytearray(), 0
+    while pos < len(body):
+        line_end = body.index(b"\r\n", pos)
+        size = int(body[pos:line_end].split(b";")[0], 16)
+        if size == 0:
+            break
+        data += body[line_end + 2:line_end + 2 + size]
+        pos = line_end + 2 + size + 2
+    return bytes(data)
+
+
+def serve(host: str = "127.0.0.1", port: int = 9000, latency_ms: float = 0.0, fail_requests: int = 0):
+    store = StandInS3(latency_ms, fail_requests)
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    server.daemon_threads = True
+    server.store = store
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 S3 호환 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청마다 추가할 지연 (실제 S3 RTT 모사)")
+    parser.add_argument("--fail-requests", type=int, default=0, help="처음 N개의 쓰기 요청을 500으로 실패시킴")
+    args = parser.parse_args()
+    server = serve(args.host, args.port, args.latency_ms, args.fail_requests)
+    print(f"S3 stand-in: http://{args.host}:{args.port} (latency {args.latency_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"requests={server.store.requests} objects={len(server.store.objects)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.core.ModelWrapper import ModelWrapper
+
+# 배치 수집 한도 (환경 변수로 조정 가능)
+MAX_BATCH_SIZE = int(os.getenv("INFER_MAX_BATCH_SIZE", "8"))
+MAX_WAIT_MS = float(os.getenv("INFER_MAX_WAIT_MS", "5"))
+
+
+class BatchScheduler:
+    """동시에 들어온 predict 요청을 모아 ModelWrapper.predict_batch 한 번으로 처리한다.
+
+    첫 요청이 도착한 뒤 max_wait_ms 동안, 또는 max_batch_size 장이 모일 때까지 기다렸다가
+    ResNet/YOLO를 배치로 한 번씩만 실행하고 각 결과를 요청자에게 돌려준다.
+    """
+
+    def __init__(self, model: ModelWrapper,
+                 max_batch_size: int = MAX_BATCH_SIZE,
+                 max_wait_ms: float = MAX_WAIT_MS,
+                 executor: Optional[Executor] = None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size는 1 이상이어야 합니다.")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # 추론을 실행할 CPU 풀 (None이면 이벤트 루프 기본 executor)
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # 모니터링용 지표
+        self.batches_total = 0
+        self.images_total = 0
+        self.last_batch_size = 0
+        self.max_observed_batch_size = 0
+
+    def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "batches_total": self.batches_total,
+            "images_total": self.images_total,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_observed": self.max_observed_batch_size,
+            "avg_batch_size": round(self.images_total / self.batches_total, 3) if self.batches_total else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    async def predict(self, image: Image.Image) -> Dict:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def predict_many(self, images: List[Image.Image]) -> List[Dict]:
+        # 여러 장을 한꺼번에 큐에 넣어 max_batch_size 단위 배치로 처리 (모델 호출은 항상 워커 한 곳에서만)
+        return list(await asyncio.gather(*(self.predict(image) for image in images)))
+
+    async def _collect(self) -> List[Tuple[Image.Image, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # 이미 취소된 요청(클라이언트 연결 종료 등)은 추론에서 제외
+            batch = [(image, future) for image, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            self.batches_total += 1
+            self.images_total += len(batch)
+            self.last_batch_size = len(batch)
+            self.max_observed_batch_size = max(self.max_observed_batch_size, len(batch))
+
+            images = [image for image, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.model.predict_batch, images)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,80 @@
+import threading
+from typing import Optional
+
+import torch
+import torch.nn as nn
+
+
+def feature_layer(detector) -> nn.Module:
+    # YOLO 백본의 마지막 레이어 (yolo11은 C2PSA, yolov8은 SPPF - 어느 쪽이든 stride 32, 채널 수는 모델 크기에 따름)
+    model = detector.model
+    return model.model[len(model.yaml["backbone"]) - 1]
+
+
+class DayNightHead(nn.Module):
+    """YOLO 백본 특징으로 낮/밤을 분류하는 경량 헤드.
+
+    detector의 백본 마지막 레이어에 forward hook을 걸어 검출 추론 중 나온 특징 맵을 받아 두므로,
+    별도 ResNet18 forward 없이 이미지당 백본 한 번으로 낮/밤과 검출 결과를 함께 얻는다.
+    가중치는 src/utils/train_day_night_head.py로 기존 분류 모델을 증류해 만든다.
+    """
+
+    def __init__(self, channels: int, hidden: int = 128):
+        super().__init__()
+        self.channels = channels
+        self.hidden = hidden
+        self.pool = nn.Sequential(nn.AdaptiveAvgPool2d(1), nn.Flatten())
+        self.classifier = nn.Sequential(
+            nn.Linear(channels, hidden),
+            nn.ReLU(),
+            nn.Linear(hidden, 2),  # day, night
+        )
+        # hook은 추론을 호출한 스레드에서 실행되므로 스레드별로 특징을 보관
+        self._captured = threading.local()
+        self._handle = None
+
+    def forward(self, features: torch.Tensor) -> torch.Tensor:
+        # (N, C, H, W) 특징 맵 또는 이미 풀링된 (N, C) 특징 -> logits
+        if features.dim() == 4:
+            features = self.pool(features)
+        return self.classifier(features)
+
+    def attach(self, detector):
+        # torch 가중치(.pt)로 로드한 YOLO에서만 내부 레이어에 hook을 걸 수 있음
+        if not isinstance(getattr(detector, "model", None), nn.Module):
+            raise ValueError("DAY_NIGHT_SOURCE=detector_head는 INFER_BACKEND=torch/compile에서만 사용할 수 있습니다.")
+        self.detach()
+        self._handle = feature_layer(detector).register_forward_hook(self._capture)
+
+    def detach(self):
+        if self._handle is not None:
+            self._handle.remove()
+            self._handle = None
+
+    def _capture(self, module, inputs, output):
+        # 풀링한 (N, C)만 보관 (특징 맵 전체를 들고 있지 않음)
+        if getattr(self._captured, "features", None) is None:
+            self._captured.features = []
+        self._captured.features.append(self.pool(output.detach()).float())
+
+    def reset(self):
+        self._captured.features = []
+
+    def pop_features(self, n: Optional[int] = None) -> torch.Tensor:
+        # 마지막 검출 호출의 배치 특징 (predictor 워밍업 등 앞선 forward는 버림)
+        captured = getattr(self._captured, "features", None)
+        self._captured.features = []
+        if not captured:
+            raise RuntimeError("검출 모델에서 특징을 받지 못했습니다. attach()가 호출되었는지 확인하세요.")
+        features = torch.cat(captured)
+        return features[-n:] if n else features
+
+    def state(self) -> dict:
+        return {"channels": self.channels, "hidden": self.hidden, "state_dict": self.state_dict()}
+
+    @classmethod
+    def load(cls, path: str, device: torch.device) -> "DayNightHead":
+        checkpoint = torch.load(path, map_location=device, weights_only=True)
+        head = cls(checkpoint["channels"], checkpoint["hidden"])
+        head.load_state_dict(checkpoint["state_dict"])
+        return head.to(device).eval()
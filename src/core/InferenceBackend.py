@@ -0,0 +1,131 @@
+import json
+import os
+import zipfile
+from typing import TYPE_CHECKING, List, Optional
+
+import torch
+from torchvision.models import resnet18
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+# 추론 백엔드 선택
+# - "torch": eager PyTorch (기본값)
+# - "compile": torch.compile 로 최적화한 분류 모델 (YOLO는 eager)
+# - "torchscript": export_models.py로 만든 .ts / .torchscript 아티팩트
+# - "onnx": export_models.py로 만든 .onnx 아티팩트를 ONNX Runtime으로 실행
+# - "int8": quantize_models.py로 만든 INT8 아티팩트 (분류: 양자화 TorchScript, YOLO: 양자화 ONNX)
+INFER_BACKEND = os.getenv("INFER_BACKEND", "torch")
+BACKENDS = ("torch", "compile", "torchscript", "onnx", "int8")
+
+# ONNX Runtime 스레드 설정 (0이면 ONNX Runtime 기본값)
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "0"))
+
+CLASSIFIER_EXTENSIONS = {"torchscript": ".ts", "onnx": ".onnx", "int8": "_int8.ts"}
+DETECTOR_EXTENSIONS = {"torchscript": ".torchscript", "onnx": ".onnx", "int8": "_int8.onnx"}
+
+# 분류 모델 가중치를 torch.load(mmap=True)로 읽어 파일 전체를 메모리로 복사하지 않음
+MODEL_MMAP = os.getenv("MODEL_MMAP", "1") == "1"
+
+
+def artifact_path(model_path: str, backend: str, extensions: dict) -> str:
+    # 백엔드별 아티팩트는 원본 가중치와 같은 위치에 확장자만 바꿔 저장됨
+    if backend not in extensions:
+        return model_path
+    return os.path.splitext(model_path)[0] + extensions[backend]
+
+
+def build_classifier(model_path: str, device: torch.device, mmap: bool = MODEL_MMAP) -> torch.nn.Module:
+    # torch.hub(네트워크/허브 캐시) 대신 torchvision으로 골격을 구성
+    # meta 디바이스에서 만들어 무작위 초기화를 건너뛰고, 불러온 텐서를 그대로 파라미터로 사용
+    with torch.device("meta"):
+        model = resnet18(weights=None, num_classes=2)
+    state = torch.load(model_path, map_location=device, mmap=mmap, weights_only=True)
+    model.load_state_dict(state, assign=True)
+    return model.to(device).eval()
+
+
+class OnnxClassifier:
+    # torch 모델과 같은 방식으로 호출할 수 있도록 (N,3,224,224) 텐서를 받아 logits 텐서를 반환
+    def __init__(self, path: str, intra_op_threads: int = ORT_INTRA_OP_THREADS,
+                 inter_op_threads: int = ORT_INTER_OP_THREADS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        if inter_op_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, tensor: torch.Tensor) -> torch.Tensor:
+        logits = self.session.run(None, {self.input_name: tensor.cpu().numpy()})[0]
+        return torch.from_numpy(logits)
+
+
+def load_classifier(model_path: str, backend: str, device: torch.device):
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 INFER_BACKEND 입니다: {backend}")
+    path = artifact_path(model_path, backend, CLASSIFIER_EXTENSIONS)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {path} (export_models.py로 생성하세요)")
+
+    if backend == "onnx":
+        return OnnxClassifier(path)
+    if backend in ("torchscript", "int8"):
+        return torch.jit.load(path, map_location=device).eval()
+    model = build_classifier(path, device)
+    if backend == "compile":
+        # 배치 크기가 요청마다 달라지므로 dynamic shape로 컴파일
+        model = torch.compile(model, dynamic=True)
+    return model
+
+
+def load_detector(model_path: str, backend: str) -> "YOLO":
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 INFER_BACKEND 입니다: {backend}")
+    path = artifact_path(model_path, backend, DETECTOR_EXTENSIONS)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {path} (export_models.py로 생성하세요)")
+    # ultralytics는 .pt / .torchscript / .onnx (INT8 포함) 를 같은 YOLO 인터페이스로 로드함
+    # (export 시 저장된 메타데이터로 task와 클래스 이름을 복원)
+    # ultralytics는 import 비용이 커서 실제 로딩 시점에 import
+    from ultralytics import YOLO
+
+    try:
+        return YOLO(path)
+    except Exception as e:
+        print(f"YOLO 모델 로딩 실패: {str(e)}")
+        raise
+
+
+def detector_static_batch(model_path: str, backend: str) -> Optional[int]:
+    # TorchScript YOLO는 export 시 배치 크기로 trace되어 그 크기의 입력만 받을 수 있음
+    # ultralytics가 아티팩트(zip)의 extra/config.txt에 저장한 메타데이터에서 배치 크기를 읽음 (모델을 다시 로드하지 않음)
+    if backend != "torchscript":
+        return None
+    path = artifact_path(model_path, backend, DETECTOR_EXTENSIONS)
+    with zipfile.ZipFile(path) as archive:
+        name = next((n for n in archive.namelist() if n.endswith("extra/config.txt")), None)
+        if name is None:
+            return None
+        metadata = json.loads(archive.read(name))
+    if metadata.get("args", {}).get("dynamic"):
+        return None
+    return metadata.get("batch")
+
+
+def run_detector(detector, images: List, static_batch: Optional[int] = None, **kwargs) -> List:
+    # 고정 배치 모델이면 입력을 static_batch장씩 나누고, 모자라는 마지막 묶음은 마지막 이미지로 채운 뒤 그 결과를 버림
+    # (BatchScheduler는 1~INFER_MAX_BATCH_SIZE장, 타일 모드는 이미지당 최대 1 + MAX_TILES장을 한 번에 넘김)
+    if static_batch is None:
+        return detector(images, **kwargs)
+    results = []
+    for start in range(0, len(images), static_batch):
+        chunk = images[start:start + static_batch]
+        padded = chunk + [chunk[-1]] * (static_batch - len(chunk))
+        results.extend(detector(padded, **kwargs)[:len(chunk)])
+    return results
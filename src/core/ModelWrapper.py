@@ -1,72 +1,246 @@
+import numpy as np
 import torch
-import torchvision.transforms as transforms
 from PIL import Image
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 import os
-from ultralytics import YOLO
+
+from src.core.DayNightHead import DayNightHead
+from src.core.Preprocessor import Preprocessor
+from src.core.InferenceBackend import (
+    INFER_BACKEND, detector_static_batch, load_classifier, load_detector, run_detector
+)
+from src.utils.luminance_utils import DAY_NIGHT_GATE, LuminanceGate
+from src.utils.mask_utils import mask_geometry
+from src.utils.metrics_utils import stage_timer
+from src.utils.tile_utils import merge_tile_boxes, tile_grid, validate_tile_config
+
+# 프론트엔드로 보내지 않는 클래스: 2(낮), 3(밤), 6(양호) / 9(차선)는 포함
+EXCLUDED_CLASSES = (2, 3, 6)
+CONF_THRESHOLD = 0.5
+
+# 분류 모델과 YOLO를 동시에 로드 (가중치 읽기/역직렬화는 대부분 GIL 밖에서 실행됨)
+PARALLEL_LOAD = os.getenv("MODEL_PARALLEL_LOAD", "1") == "1"
+
+# 타일 추론: 전체 프레임과 겹치는 타일들을 한 배치로 YOLO에 넣어, 축소 시 사라지는 작은 균열/포트홀을 검출
+# (고해상도 입력에서 의미가 있으므로 MAX_INPUT_SIDE도 함께 키우는 것을 권장)
+TILED_INFERENCE = os.getenv("TILED_INFERENCE", "0") == "1"
+TILE_SIZE = int(os.getenv("TILE_SIZE", "640"))
+TILE_OVERLAP = float(os.getenv("TILE_OVERLAP", "0.2"))
+MAX_TILES = int(os.getenv("MAX_TILES", "8"))
+TILE_NMS_IOU = float(os.getenv("TILE_NMS_IOU", "0.5"))
+validate_tile_config(TILE_SIZE, TILE_OVERLAP, MAX_TILES)
+
+# 낮/밤 판별 방식
+# - "classifier": 별도 ResNet18 분류 모델 (기본값)
+# - "detector_head": YOLO 백본 특징 위의 경량 헤드 (train_day_night_head.py로 생성, 이미지당 백본 한 번)
+DAY_NIGHT_SOURCE = os.getenv("DAY_NIGHT_SOURCE", "classifier")
+DAY_NIGHT_SOURCES = ("classifier", "detector_head")
+DAY_NIGHT_HEAD_PATH = os.getenv("DAY_NIGHT_HEAD_PATH", "day_night_head.pth")
+
+# (xyxy, conf, cls, mask_area_px 또는 None, mask_length_px 또는 None)
+DetectionArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]
 
 class ModelWrapper:
-    def __init__(self, model_paths: List[str], device: str = "cpu"):
+    def __init__(self, model_paths: List[str], device: str = "cpu",
+                 conf_threshold: float = CONF_THRESHOLD,
+                 excluded_classes: Iterable[int] = EXCLUDED_CLASSES,
+                 backend: str = INFER_BACKEND,
+                 parallel_load: bool = PARALLEL_LOAD,
+                 tiled: bool = TILED_INFERENCE,
+                 tile_size: int = TILE_SIZE,
+                 tile_overlap: float = TILE_OVERLAP,
+                 max_tiles: int = MAX_TILES,
+                 day_night_source: str = DAY_NIGHT_SOURCE,
+                 day_night_gate: bool = DAY_NIGHT_GATE):
+        if day_night_source not in DAY_NIGHT_SOURCES:
+            raise ValueError(f"지원하지 않는 DAY_NIGHT_SOURCE 입니다: {day_night_source}")
+        if tiled:
+            validate_tile_config(tile_size, tile_overlap, max_tiles)
         self.device = torch.device(device)
-        self.models = self._load_models(model_paths)
-        for model in self.models:
-            if not isinstance(model, YOLO):  # YOLO 모델이 아닌 경우에만 eval() 호출
-                model.eval()
-
-    def _load_models(self, paths: List[str]) -> List[torch.nn.Module]:
-        models = []
-        for path in paths:
-            model_path = os.path.join("src", "models", path)
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
-            
-            if path.endswith('.pt'):  # YOLO 모델
-                try:
-                    # ultralytics YOLO 직접 사용
-                    model = YOLO(model_path)
-                except Exception as e:
-                    print(f"YOLO 모델 로딩 실패: {str(e)}")
-                    raise
-            else:  # 일반 PyTorch 모델
-                model = torch.hub.load("pytorch/vision:v0.14.0", "resnet18", pretrained=False)
-                model.fc = torch.nn.Linear(model.fc.in_features, 2)
-                state = torch.load(model_path, map_location=self.device)
-                model.load_state_dict(state)
-            
-            models.append(model)
-        return models
+        self.conf_threshold = conf_threshold
+        self.excluded_classes = np.asarray(list(excluded_classes), dtype=np.int64)
+        self.backend = backend
+        self.tiled = tiled
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.max_tiles = max_tiles
+        self.day_night_source = day_night_source
+        # 밝기 사전 판별은 분류 모델 방식에서만 사용 (헤드 방식은 이미 분류 비용이 거의 없음)
+        self.day_night_gate = LuminanceGate.load() if day_night_gate and day_night_source == "classifier" else None
+        # 고정 배치로 trace된 YOLO의 배치 크기 (None이면 임의 배치 크기를 받음) - YOLO 로딩 시 설정
+        self.detector_batch: Optional[int] = None
+        self.models = self._load_models(model_paths, parallel_load)
+        if isinstance(self.models[0], DayNightHead):
+            self.models[0].attach(self.models[1])
+        # 분류 모델 전처리는 생성 시 한 번만 구성
+        self.preprocess = Preprocessor(size=224, device=self.device)
+
+    def _load_model(self, path: str):
+        model_path = os.path.join("src", "models", path)
+        if path.endswith('.pt'):  # YOLO 모델
+            detector = load_detector(model_path, self.backend)
+            self.detector_batch = detector_static_batch(model_path, self.backend)
+            return detector
+        if self.day_night_source == "detector_head":
+            # 분류 모델 대신 YOLO 특징을 쓰는 헤드 (hook은 YOLO 로딩 후 연결)
+            return DayNightHead.load(os.path.join("src", "models", DAY_NIGHT_HEAD_PATH), self.device)
+        # 일반 PyTorch 모델 (night_day_model)
+        return load_classifier(model_path, self.backend, self.device)
+
+    def _load_models(self, paths: List[str], parallel: bool = True) -> List[torch.nn.Module]:
+        if not parallel or len(paths) < 2:
+            return [self._load_model(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix="model-load") as pool:
+            return list(pool.map(self._load_model, paths))
+
+    def prepare_for_fork(self):
+        # 워커를 fork하기 전에 YOLO Conv+BN 융합을 미리 수행
+        # (첫 추론 때 워커마다 융합된 가중치를 새로 만들면 공유 메모리가 각자 복사됨)
+        detector = self.models[1]
+        if isinstance(getattr(detector, "model", None), torch.nn.Module):
+            detector.fuse()
 
     def predict(self, image: Image.Image) -> Dict:
-        results = {}
-        
-        # 첫 번째 모델 (night_day_model) 예측
-        preprocess = transforms.Compose([
-            transforms.Resize((224, 224)),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485,0.456,0.406], std=[0.229,0.224,0.225])
-        ])
-        tensor = preprocess(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
+        return self.predict_batch([image])[0]
+
+    def predict_batch(self, images: List[Image.Image]) -> List[Dict]:
+        batch_results = [{} for _ in images]
+        head = self.models[0] if isinstance(self.models[0], DayNightHead) else None
+
+        # 첫 번째 모델 (night_day_model) 예측 - 배치 전체를 한 번의 forward로 처리
+        if head is None:
+            with stage_timer("classifier"), torch.no_grad():
+                probs = self._classify(images)
+            self._set_classification(batch_results, probs)
+
+        # 두 번째 모델 (YOLO) 예측 - 이미지 리스트를 넘기면 하나의 배치로 추론
+        with stage_timer("detector"):
+            if head is not None:
+                head.reset()
+            if self.tiled:
+                full_frame_index, num_inputs = self._detect_tiled(images, batch_results)
+            else:
+                # YOLO 모델은 PIL Image를 직접 받을 수 있음
+                yolo_results = run_detector(self.models[1], images, self.detector_batch, verbose=False)
+                full_frame_index, num_inputs = list(range(len(images))), len(images)
+                # YOLO 결과를 필요한 형식으로 변환
+                for results, result in zip(batch_results, yolo_results):
+                    results["detection"] = {"detections": self._convert_detections(result)}
+                    # 시각화 등에서 재추론하지 않도록 ultralytics Results 원본을 함께 반환
+                    results["yolo_results"] = [result]
+
+        # 헤드 방식이면 검출 중 hook으로 받은 백본 특징(전체 프레임 행)으로 낮/밤을 판별
+        if head is not None:
+            with stage_timer("classifier"), torch.no_grad():
+                features = head.pop_features(num_inputs)[full_frame_index]
+                probs = torch.softmax(head(features.to(self.device)), dim=1).cpu().numpy()
+            self._set_classification(batch_results, probs)
+
+        return batch_results
+
+    def _classify(self, images: List[Image.Image]) -> np.ndarray:
+        if self.day_night_gate is None:
+            tensor = self.preprocess(images)
             logits = self.models[0](tensor)
-            probs = torch.softmax(logits, dim=1).cpu().numpy()[0]
+            return torch.softmax(logits, dim=1).cpu().numpy()
+        # 밝기 통계로 결정된 이미지는 확률 1로 두고, 애매한 이미지만 모아 CNN을 실행
+        decisions = self.day_night_gate.decide(images)
+        probs = np.zeros((len(images), 2), dtype=np.float32)
+        pending = []
+        for i, decision in enumerate(decisions):
+            if decision is None:
+                pending.append(i)
+            else:
+                probs[i, decision] = 1.0
+        if pending:
+            tensor = self.preprocess([images[i] for i in pending])
+            probs[pending] = torch.softmax(self.models[0](tensor), dim=1).cpu().numpy()
+        return probs
+
+    @staticmethod
+    def _set_classification(batch_results: List[Dict], probs: np.ndarray):
         classes = ["day", "night"]
-        results["classification"] = {cls: float(probs[i]) for i, cls in enumerate(classes)}
-
-        # 두 번째 모델 (YOLO) 예측
-        yolo_results = self.models[1](image)  # YOLO 모델은 PIL Image를 직접 받을 수 있음
-        # YOLO 결과를 필요한 형식으로 변환
-        yolo_predictions = []
-        for result in yolo_results:
-            boxes = result.boxes
-            for box in boxes:
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                conf = box.conf.cpu().numpy()[0]
-                cls = int(box.cls.cpu().numpy()[0])
-                yolo_predictions.append({
-                    "bbox": [int(x1), int(y1), int(x2-x1), int(y2-y1)],
-                    "confidence": float(conf),
-                    "class": cls
-                })
-        results["detection"] = {"detections": yolo_predictions}
-
-        return results
\ No newline at end of file
+        for results, image_probs in zip(batch_results, probs):
+            results["classification"] = {cls: float(image_probs[i]) for i, cls in enumerate(classes)}
+
+    def _detect_tiled(self, images: List[Image.Image], batch_results: List[Dict]) -> Tuple[List[int], int]:
+        # 이미지별 [전체 프레임, 타일...]을 한 리스트로 모아 YOLO를 한 번만 호출
+        inputs, owners, offsets, full_frame_index = [], [], [], []
+        for i, image in enumerate(images):
+            full_frame_index.append(len(inputs))
+            inputs.append(image)
+            owners.append(i)
+            offsets.append((0, 0))
+            for box in tile_grid(image.width, image.height, self.tile_size, self.tile_overlap, self.max_tiles):
+                inputs.append(image.crop(box))
+                owners.append(i)
+                offsets.append(box[:2])
+        yolo_results = run_detector(self.models[1], inputs, self.detector_batch, verbose=False)
+
+        parts: List[List[DetectionArrays]] = [[] for _ in images]
+        for owner, (dx, dy), result in zip(owners, offsets, yolo_results):
+            arrays = self._detection_arrays(result)
+            if arrays is not None:
+                arrays[0][:, [0, 2]] += dx  # 타일 좌표 -> 원본 좌표
+                arrays[0][:, [1, 3]] += dy
+                parts[owner].append(arrays)
+
+        for results, image_parts, index in zip(batch_results, parts, full_frame_index):
+            detections = []
+            if image_parts:
+                xyxy, conf, cls, area_px, length_px = (
+                    None if any(p[k] is None for p in image_parts) else np.concatenate([p[k] for p in image_parts])
+                    for k in range(5)
+                )
+                keep = merge_tile_boxes(xyxy, conf, cls, TILE_NMS_IOU)
+                detections = self._to_detections(
+                    xyxy[keep], conf[keep], cls[keep],
+                    area_px[keep] if area_px is not None else None,
+                    length_px[keep] if length_px is not None else None)
+            results["detection"] = {"detections": detections}
+            # 시각화(RENDER_MODE=ultralytics)에는 전체 프레임 결과를 사용
+            results["yolo_results"] = [yolo_results[index]]
+        # 낮/밤 헤드가 YOLO 입력 중 전체 프레임 행만 고를 수 있도록 위치와 입력 수를 반환
+        return full_frame_index, len(inputs)
+
+    def _detection_arrays(self, result) -> Optional[DetectionArrays]:
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return None
+        # 박스별 .cpu().numpy() 대신 한 번에 NumPy로 옮긴 뒤 신뢰도/제외 클래스 필터를 벡터 연산으로 적용
+        xyxy = boxes.xyxy.cpu().numpy()
+        conf = boxes.conf.cpu().numpy()
+        cls = boxes.cls.cpu().numpy().astype(np.int64)
+        keep = (conf > self.conf_threshold) & ~np.isin(cls, self.excluded_classes)
+        if not keep.any():
+            return None
+
+        # 세그멘테이션 모델이면 마스크 픽셀 수/골격 길이로 실제 면적과 길이를 함께 제공 (원본 픽셀 단위)
+        area_px = length_px = None
+        masks = getattr(result, "masks", None)
+        if masks is not None and masks.data is not None:
+            kept_masks = masks.data[torch.from_numpy(keep).to(masks.data.device)].cpu().numpy()
+            area_px, length_px = mask_geometry(kept_masks, result.orig_shape)
+        return xyxy[keep], conf[keep], cls[keep], area_px, length_px
+
+    def _convert_detections(self, result) -> List[Dict]:
+        arrays = self._detection_arrays(result)
+        return self._to_detections(*arrays) if arrays is not None else []
+
+    @staticmethod
+    def _to_detections(xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray,
+                       area_px: Optional[np.ndarray], length_px: Optional[np.ndarray]) -> List[Dict]:
+        # [x, y, w, h] (기존과 동일하게 소수점 이하 버림)
+        bboxes = np.empty((len(xyxy), 4), dtype=np.int64)
+        bboxes[:, 0:2] = xyxy[:, 0:2]
+        bboxes[:, 2:4] = xyxy[:, 2:4] - xyxy[:, 0:2]
+        detections = [
+            {"bbox": bbox, "confidence": confidence, "class": class_id}
+            for bbox, confidence, class_id in zip(bboxes.tolist(), conf.tolist(), cls.tolist())
+        ]
+        if area_px is not None:
+            for detection, area, length in zip(detections, area_px.tolist(), length_px.tolist()):
+                detection["mask_area_px"] = area
+                detection["mask_length_px"] = length
+        return detections
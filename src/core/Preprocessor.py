@@ -0,0 +1,51 @@
+import threading
+from typing import List, Sequence
+
+import numpy as np
+import torch
+from PIL import Image
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class Preprocessor:
+    """night_day_model 입력 전처리 (Resize → ToTensor → Normalize)를 한 번만 구성해 재사용한다.
+
+    정규화 상수는 생성 시 미리 계산하고, 입력 텐서는 스레드별로 할당한 버퍼를 재사용하므로
+    여러 요청이 동시에 들어와도 버퍼가 섞이지 않는다.
+    """
+
+    def __init__(self, size: int = 224, device: torch.device = torch.device("cpu"),
+                 mean: Sequence[float] = IMAGENET_MEAN, std: Sequence[float] = IMAGENET_STD):
+        self.size = size
+        self.device = device
+        # ToTensor의 /255 와 Normalize를 하나의 곱셈/뺄셈으로 합침: (x/255 - mean)/std = x*scale - shift
+        std_t = torch.tensor(std, dtype=torch.float32).view(1, 3, 1, 1)
+        mean_t = torch.tensor(mean, dtype=torch.float32).view(1, 3, 1, 1)
+        self._scale = 1.0 / (255.0 * std_t)
+        self._shift = mean_t / std_t
+        # GPU로 보낼 때만 pinned memory가 의미가 있음
+        self._pin = device.type == "cuda"
+        self._local = threading.local()
+
+    def _buffer(self, batch_size: int) -> torch.Tensor:
+        buf = getattr(self._local, "buffer", None)
+        if buf is None or buf.shape[0] < batch_size:
+            buf = torch.empty((batch_size, 3, self.size, self.size), dtype=torch.float32,
+                              pin_memory=self._pin)
+            self._local.buffer = buf
+        return buf[:batch_size]
+
+    def __call__(self, images: List[Image.Image]) -> torch.Tensor:
+        buf = self._buffer(len(images))
+        # 버퍼와 메모리를 공유하는 NumPy 뷰에 바로 채움 (PIL이 준 읽기 전용 배열을 from_numpy로 감싸지 않음)
+        buf_np = buf.numpy()
+        for i, image in enumerate(images):
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            # transforms.Resize와 동일하게 PIL bilinear(antialias) 리사이즈 사용
+            resized = np.asarray(image.resize((self.size, self.size), Image.BILINEAR))
+            buf_np[i] = resized.transpose(2, 0, 1)
+        buf.mul_(self._scale).sub_(self._shift)
+        return buf.to(self.device, non_blocking=self._pin)
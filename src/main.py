@@ -1,16 +1,28 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, Query, HTTPException, BackgroundTasks, WebSocket
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 from uuid import uuid4
-import io
+import asyncio
+import os
+import time
 from PIL import Image
 import numpy as np
 
 from src.core.PredictionItem import BBoxPrediction, PolygonPrediction, Point, PredictionItem
 from src.core.ModelWrapper import ModelWrapper
-from src.utils.s3_utils import S3Uploader, make_filename
-from src.utils.risk_utils import classify_risk, summarize_image_risk, PIXEL_TO_CM, PIXEL_TO_M
+from src.core.BatchScheduler import BatchScheduler
+from src.utils.s3_utils import S3Uploader, detect_content_type, make_filename
+from src.utils.executor_utils import create_cpu_executor, create_io_executor, run_in
+from src.utils.cache_utils import PendingResult, create_result_cache, content_key
+from src.utils.risk_utils import classify_image_risks
+from src.utils.image_utils import Scale, load_image, read_exif_geotag, rescale_detections
+from src.utils.hazard_store import RISK_RANKS, create_hazard_store
+from src.utils.upload_utils import BodySizeLimitMiddleware
+from src.utils.render_utils import encode_jpeg, render_boxes
+from src.utils.metrics_utils import (
+    METRICS_ENABLED, stage_timer, count_detections, count_error, register_stats_collector, render_metrics
+)
 
 app = FastAPI(
     title="Road Hazard Classification API",
@@ -18,16 +30,6 @@ app = FastAPI(
     version="1.0"
 )
 
-# CORS 설정
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"]
-)
-
 DAMAGE_CLASSES = {
     0: '기타',
     1: '거북등 균열',
@@ -44,108 +46,498 @@ DAMAGE_CLASSES = {
     12: '횡방향 균열'
 }
 
+# S3 업로드 방식
+# - "sequential": 추론이 끝난 뒤 원본과 결과 이미지를 차례로 업로드 (비교 기준용 기존 방식)
+# - "parallel": 원본 업로드를 추론과 동시에 진행하고, 두 업로드가 끝난 뒤 응답
+# - "background": 키를 미리 생성해 예측 결과만 먼저 응답하고, 업로드는 백그라운드에서 완료
+#   (실패 시 재시도는 S3 클라이언트의 adaptive 재시도가 담당 - s3_utils 참고)
+UPLOAD_MODE = os.getenv("UPLOAD_MODE", "parallel")
+if UPLOAD_MODE not in ("sequential", "parallel", "background"):
+    raise ValueError(f"지원하지 않는 UPLOAD_MODE 입니다: {UPLOAD_MODE}")
+
+# 결과 이미지 생성 방식
+# - "boxes": 응답에 포함된 검출만 위험도 색상 박스로 그려 JPEG 인코딩 (기본값)
+# - "ultralytics": 기존 result.plot() 시각화 (마스크/모든 클래스 포함)
+# - "none": 결과 이미지를 만들지 않음 - 프론트엔드가 predictions의 박스를 원본 이미지 위에 직접 그림
+RENDER_MODE = os.getenv("RENDER_MODE", "boxes")
+if RENDER_MODE not in ("boxes", "ultralytics", "none"):
+    raise ValueError(f"지원하지 않는 RENDER_MODE 입니다: {RENDER_MODE}")
+
+# 모델 로딩 방식
+# - "background": 서버는 바로 요청을 받고 모델은 백그라운드에서 로드 (준비 여부는 /ready로 확인)
+# - "startup": 기존처럼 모델 로딩이 끝난 뒤에 서버 시작
+MODEL_LOAD_MODE = os.getenv("MODEL_LOAD_MODE", "background")
+if MODEL_LOAD_MODE not in ("background", "startup"):
+    raise ValueError(f"지원하지 않는 MODEL_LOAD_MODE 입니다: {MODEL_LOAD_MODE}")
+
+# /predict_batch 한 번에 받을 최대 이미지 수, 스트리밍 연결당 동시에 처리 중인 최대 프레임 수
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "64"))
+STREAM_MAX_IN_FLIGHT = int(os.getenv("STREAM_MAX_IN_FLIGHT", "16"))
+
+# 이미지 1장당 최대 업로드 크기 - 넘으면 본문을 끝까지 읽지 않고 413
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "20")) * 2**20)
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    "/predict": MAX_UPLOAD_BYTES,
+    "/predict_batch": MAX_UPLOAD_BYTES * MAX_BATCH_FILES,
+})
+
+# CORS 설정 (마지막에 추가한 미들웨어가 가장 바깥 - 413 등 안쪽 미들웨어의 응답에도 CORS 헤더가 붙음)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:5173"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["*"]
+)
+
+def decode_image(data: bytes) -> Tuple[Image.Image, Scale]:
+    # 큰 이미지는 MAX_INPUT_SIDE로 축소 디코딩 - (이미지, 원본 좌표 배율) 반환
+    with stage_timer("decode"):
+        return load_image(data)
+
+def render_result_image(image: Image.Image, predictions_for_frontend: List[Dict], scale: Scale, result) -> bytes:
+    with stage_timer("render"):
+        if RENDER_MODE == "ultralytics":
+            return encode_jpeg(result.plot(), bgr=True)  # plot()은 BGR 배열을 반환
+        return render_boxes(image, predictions_for_frontend, scale)
+
+def upload_to_s3(stage: str, data: bytes, file_name: str) -> str:
+    # stage: "upload_original" 또는 "upload_result"
+    with stage_timer(stage):
+        return app.state.s3_uploader.upload_file(data, file_name=file_name)
+
+def analyze_predictions(predictions: Dict, scale: Scale = (1.0, 1.0)):
+    predictions_for_frontend = []
+
+    # 분류 결과 (낮/밤) 처리
+    classification_output = predictions["classification"] # 예: {"day": 0.9, "night": 0.1}
+    
+    # 가장 확률이 높은 클래스 ("day" 또는 "night") 찾기
+    predicted_time_label = max(classification_output, key=classification_output.get)
+    
+    if predicted_time_label == "day":
+        day_or_night = DAMAGE_CLASSES[2]  # '낮'
+    elif predicted_time_label == "night":
+        day_or_night = DAMAGE_CLASSES[3]  # '밤'
+    else:
+        day_or_night = "알수없음" # 이 경우는 발생하지 않아야 함
+
+    # YOLO 검출 결과: class id 기준 한글 클래스명 매핑
+    # (신뢰도 0.5 초과, 낮/밤/양호 제외 필터는 ModelWrapper에서 이미 적용됨)
+    # 측정값(마스크 또는 bbox 기준)과 위험도는 이미지의 모든 검출에 대해 한 번에 계산
+    # 축소 디코딩한 경우 bbox와 마스크 면적/길이를 원본 해상도로 되돌린 뒤 측정 (PIXEL_TO_CM은 원본 기준)
+    detections = rescale_detections(predictions["detection"]["detections"], scale)
+    with stage_timer("risk"):
+        measurements, risk_list, overall_risk = classify_image_risks(detections)
+    count_detections(DAMAGE_CLASSES.get(d["class"], "알수없음") for d in detections)
+    for i, detection in enumerate(detections):
+        class_id = detection["class"]
+        bbox = detection["bbox"]
+        predictions_for_frontend.append({
+            "class_id": class_id,
+            "name": DAMAGE_CLASSES.get(class_id, "알수없음"),
+            "confidence": detection["confidence"],
+            "type": "bbox",
+            "x": int(bbox[0]),
+            "y": int(bbox[1]),
+            "width": int(bbox[2]),
+            "height": int(bbox[3]),
+            "width_cm": round(float(measurements["width_cm"][i]), 1),
+            "length_cm": round(float(measurements["length_cm"][i]), 1),
+            "area_m2": round(float(measurements["area_m2"][i]), 3),
+            "measured_from": "mask" if measurements["from_mask"][i] else "bbox",
+            "risk_level": risk_list[i]
+        })
+    return predictions_for_frontend, day_or_night, overall_risk
+
+async def publish_results(data: bytes, upload_file_name: str, render_args: Tuple, result_file_name: str) -> bool:
+    # 모든 업로드가 성공하면 True (결과 캐시는 True일 때만 응답을 저장)
+    async def upload_result_image():
+        result_img_bytes = await run_in(app.state.cpu_executor, render_result_image, *render_args)
+        await run_in(app.state.io_executor, upload_to_s3, "upload_result", result_img_bytes, result_file_name)
+
+    uploads = [run_in(app.state.io_executor, upload_to_s3, "upload_original", data, upload_file_name)]
+    if RENDER_MODE != "none":
+        uploads.append(upload_result_image())
+    outcomes = await asyncio.gather(*uploads, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            count_error("publish")
+            print(f"백그라운드 업로드 중 에러 발생: {str(outcome)}")
+    return not any(isinstance(outcome, Exception) for outcome in outcomes)
+
+# 진행 중인 백그라운드 업로드 (요청과 독립된 작업이므로 GC되지 않도록 참조 유지)
+publish_tasks = set()
+
+def start_publish(*args) -> asyncio.Task:
+    task = asyncio.ensure_future(publish_results(*args))
+    publish_tasks.add(task)
+    task.add_done_callback(publish_tasks.discard)
+    return task
+
+def day_night_gate_stats() -> Optional[Dict]:
+    # 밝기 사전 판별(DAY_NIGHT_GATE)이 켜져 있을 때만 결정 수/적중률을 반환
+    gate = getattr(getattr(app.state, "model", None), "day_night_gate", None)
+    return gate.stats() if gate is not None else None
+
+# 배치 스케줄러/결과 캐시/낮밤 사전 판별 상태는 /metrics 스크레이프 시점에 읽어 게이지로 내보냄
+register_stats_collector(
+    "road_hazard_batching",
+    lambda: app.state.scheduler.stats() if getattr(app.state, "scheduler", None) is not None else None,
+    counters=("batches_total", "images_total"))
+register_stats_collector(
+    "road_hazard_result_cache",
+    lambda: app.state.result_cache.stats() if getattr(app.state, "result_cache", None) is not None else None,
+    counters=("hits", "misses", "inflight_hits", "evictions"))
+register_stats_collector(
+    "road_hazard_day_night_gate",
+    day_night_gate_stats,
+    counters=("day", "night", "fallback"))
+
+MODEL_PATHS = ["night_day_model.pth", "yolo_best.pt"]
+
+def create_model() -> ModelWrapper:
+    return ModelWrapper(model_paths=MODEL_PATHS, device="cpu")
+
+async def load_model() -> BatchScheduler:
+    start = time.perf_counter()
+    # src.serve로 실행하면 fork 전에 부모 프로세스가 로드해 둔 모델을 그대로 사용 (copy-on-write 공유)
+    model = getattr(app.state, "preloaded_model", None)
+    if model is None:
+        model = await run_in(app.state.cpu_executor, create_model)
+    app.state.model = model
+    app.state.scheduler = BatchScheduler(model, executor=app.state.cpu_executor)
+    app.state.scheduler.start()
+    app.state.model_load_seconds = time.perf_counter() - start
+    print(f"모델 로딩 완료: {app.state.model_load_seconds:.2f}s")
+    return app.state.scheduler
+
+def report_model_load_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"모델 로딩 중 에러 발생: {str(task.exception())}")
+
+async def get_scheduler() -> BatchScheduler:
+    # 모델 로딩이 끝날 때까지 대기 (요청이 취소되어도 로딩 작업은 계속되도록 shield)
+    return await asyncio.shield(app.state.model_loading)
+
 @app.on_event("startup")
 async def startup_event():
-    app.state.model = ModelWrapper(
-        model_paths=["night_day_model.pth", "yolo_best.pt"],
-        device="cpu"
-    )
+    # CPU 단계(디코딩/추론/인코딩)와 S3 업로드를 서로 다른 풀에서 실행해 이벤트 루프를 막지 않음
+    app.state.cpu_executor = create_cpu_executor()
+    app.state.io_executor = create_io_executor()
+    app.state.scheduler = None
+    app.state.model_load_seconds = None
+    app.state.model_loading = asyncio.ensure_future(load_model())
+    app.state.model_loading.add_done_callback(report_model_load_failure)
     app.state.s3_uploader = S3Uploader()
+    app.state.result_cache = create_result_cache(executor=app.state.io_executor)
+    app.state.hazard_store = create_hazard_store()
+    if MODEL_LOAD_MODE == "startup":
+        await app.state.model_loading
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.model_loading.cancel()
+    if app.state.scheduler is not None:
+        await app.state.scheduler.stop()
+    # 진행 중인 백그라운드 업로드를 마친 뒤 풀을 종료
+    if publish_tasks:
+        await asyncio.gather(*publish_tasks, return_exceptions=True)
+    app.state.cpu_executor.shutdown(wait=False)
+    app.state.io_executor.shutdown(wait=False)
 
 @app.get("/", tags=["health"])
 async def health_check():
     return {"status": "ok", "message": "Service is up and running"}
 
-@app.post("/predict")
-async def predict_hazard(file: UploadFile = File(...)):
+@app.get("/ready", tags=["health"])
+async def readiness_check():
+    # 모델 로딩이 끝나야 200 (로드밸런서/오토스케일러의 readiness probe용, / 는 liveness용)
+    loading = app.state.model_loading
+    if not loading.done():
+        return JSONResponse(status_code=503, content={"status": "loading"})
+    if loading.cancelled() or loading.exception() is not None:
+        message = "cancelled" if loading.cancelled() else str(loading.exception())
+        return JSONResponse(status_code=503, content={"status": "error", "message": message})
+    return {"status": "ready", "model_load_seconds": app.state.model_load_seconds}
+
+@app.get("/metrics", tags=["monitoring"])
+async def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="METRICS_ENABLED=0 으로 지표 수집이 비활성화되어 있습니다.")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/hazards", tags=["hazards"])
+async def query_hazards(min_lat: float = Query(..., ge=-90, le=90), min_lon: float = Query(..., ge=-180, le=180),
+                        max_lat: float = Query(..., ge=-90, le=90), max_lon: float = Query(..., ge=-180, le=180),
+                        class_id: Optional[int] = None, min_risk: Optional[str] = None,
+                        since: Optional[float] = None, limit: int = Query(500, ge=1, le=10000)):
+    # bbox 안의 위험 요소를 (클래스, 격자) 단위로 합쳐 반환 - 여러 차량이 찍은 같은 위치는 count로 집계
+    store = app.state.hazard_store
+    if store is None:
+        raise HTTPException(status_code=404, detail="HAZARD_STORE_PATH가 설정되지 않아 위치 저장소가 비활성화되어 있습니다.")
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="min 값은 max 값보다 클 수 없습니다.")
+    if min_risk is not None and min_risk not in RISK_RANKS:
+        raise HTTPException(status_code=400, detail=f"min_risk는 {', '.join(RISK_RANKS)} 중 하나여야 합니다.")
+    start = time.perf_counter()
+    hazards = await run_in(app.state.io_executor, store.query, min_lat, min_lon, max_lat, max_lon,
+                           class_id=class_id, min_risk=min_risk, since=since, limit=limit)
+    for hazard in hazards:
+        hazard["name"] = DAMAGE_CLASSES.get(hazard["class_id"], "알수없음")
+    return {
+        "hazards": hazards,
+        "count": len(hazards),
+        "query_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
+@app.get("/stats", tags=["monitoring"])
+async def stats():
+    scheduler = app.state.scheduler
+    return {
+        "batching": scheduler.stats() if scheduler is not None else None,
+        "result_cache": app.state.result_cache.stats(),
+        "day_night_gate": day_night_gate_stats()
+    }
+
+async def record_observation(data: bytes, result: Dict, latitude: Optional[float],
+                             longitude: Optional[float], captured_at: Optional[float]):
+    # 위치 저장소가 켜져 있으면 폼 필드(없으면 EXIF GPS)의 위치로 분석 결과를 저장 (응답 이후 백그라운드 실행)
+    try:
+        if latitude is None or longitude is None:
+            geotag = await run_in(app.state.cpu_executor, read_exif_geotag, data)
+            if geotag is None:
+                return
+            latitude, longitude, exif_time = geotag
+            captured_at = captured_at if captured_at is not None else exif_time
+        await run_in(
+            app.state.io_executor, app.state.hazard_store.add_observation,
+            latitude, longitude, captured_at if captured_at is not None else time.time(),
+            result["predictions"], result["overall_risk"],
+            day_or_night=result.get("day_or_night"), image_url=result.get("original_image_url"))
+    except Exception as e:
+        count_error("hazard_store")
+        print(f"위치 정보 저장 중 에러 발생: {str(e)}")
+
+async def run_prediction(data: bytes) -> Union[Dict, PendingResult]:
+    upload_task = publish = None
     try:
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(status_code=400, detail="이미지 파일을 업로드하세요.")
-        
-        data = await file.read()
         try:
-            image = Image.open(io.BytesIO(data)).convert("RGB")
+            image, scale = await run_in(app.state.cpu_executor, decode_image, data)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"이미지 파싱에 실패했습니다: {str(e)}")
 
-        # 1. 원본 이미지 S3 업로드
-        upload_file_name = make_filename("website/uploads")
-        s3_url_upload = app.state.s3_uploader.upload_file(data, file_name=upload_file_name)
+        # 1. 원본 이미지 S3 업로드 (추론과 동시에 진행)
+        # 원본은 업로드된 형식 그대로 저장되므로 키 확장자도 실제 형식을 따름 (Content-Type은 업로드 시 판별)
+        upload_file_name = make_filename("website/uploads", detect_content_type(data)[1])
+        result_file_name = make_filename("website/results")
+        if UPLOAD_MODE == "parallel":
+            upload_task = asyncio.ensure_future(run_in(
+                app.state.io_executor, upload_to_s3, "upload_original", data, upload_file_name))
 
         # 2. 예측 및 바운딩박스 시각화
-        predictions = app.state.model.predict(image)
-        predictions_for_frontend = []
-        risk_list = []
+        scheduler = await get_scheduler()
+        predictions = await scheduler.predict(image)
+        predictions_for_frontend, day_or_night, overall_risk = analyze_predictions(predictions, scale)
 
-        # 분류 결과 (낮/밤) 처리
-        classification_output = predictions["classification"] # 예: {"day": 0.9, "night": 0.1}
-        
-        # 가장 확률이 높은 클래스 ("day" 또는 "night") 찾기
-        predicted_time_label = max(classification_output, key=classification_output.get)
-        
-        if predicted_time_label == "day":
-            day_or_night = DAMAGE_CLASSES[2]  # '낮'
-        elif predicted_time_label == "night":
-            day_or_night = DAMAGE_CLASSES[3]  # '밤'
+        render_args = (image, predictions_for_frontend, scale, predictions["yolo_results"][0])
+        if UPLOAD_MODE == "sequential":
+            # 3-4. 원본 업로드 -> 시각화 -> 결과 업로드를 순서대로 진행
+            s3_url_upload = await run_in(app.state.io_executor, upload_to_s3, "upload_original", data, upload_file_name)
+            s3_url_result = None
+            if RENDER_MODE != "none":
+                result_img_bytes = await run_in(app.state.cpu_executor, render_result_image, *render_args)
+                s3_url_result = await run_in(app.state.io_executor, upload_to_s3,
+                                             "upload_result", result_img_bytes, result_file_name)
+        elif UPLOAD_MODE == "background":
+            # 3-4. 시각화와 두 업로드는 요청과 독립된 작업으로 완료 (URL은 미리 생성한 키로 계산)
+            # 요청이 취소되어도 업로드는 계속되고, 결과 캐시는 업로드가 성공한 뒤에만 저장
+            publish = start_publish(data, upload_file_name, render_args, result_file_name)
+            s3_url_upload = app.state.s3_uploader.url_for(upload_file_name)
+            s3_url_result = app.state.s3_uploader.url_for(result_file_name) if RENDER_MODE != "none" else None
+        elif RENDER_MODE == "none":
+            # 3-4. 결과 이미지 없이 원본 업로드만 대기 (박스는 프론트엔드에서 그림)
+            s3_url_upload = await upload_task
+            s3_url_result = None
         else:
-            day_or_night = "알수없음" # 이 경우는 발생하지 않아야 함
-
-        # YOLO 검출 결과: class id 기준 한글 클래스명 매핑
-        for detection in predictions["detection"]["detections"]:
-            class_id = detection["class"]
-            # 2(낮), 3(밤), 6(양호)는 제외, 9(차선)는 포함
-            if class_id in [2, 3, 6]:
-                continue
-            if detection["confidence"] > 0.5:
-                bbox = detection["bbox"]
-                class_name = DAMAGE_CLASSES.get(class_id, "알수없음")
-                w = bbox[2] * PIXEL_TO_CM
-                h = bbox[3] * PIXEL_TO_CM
-                area_m2 = (bbox[2] * bbox[3]) * (PIXEL_TO_M ** 2)
-                risk_level = classify_risk(class_name, area=area_m2, width=w, length=h)
-                risk_list.append(risk_level)
-                predictions_for_frontend.append({
-                    "class_id": class_id,
-                    "name": class_name,
-                    "confidence": detection["confidence"],
-                    "type": "bbox",
-                    "x": int(bbox[0]),
-                    "y": int(bbox[1]),
-                    "width": int(bbox[2]),
-                    "height": int(bbox[3]),
-                    "width_cm": round(w, 1),
-                    "length_cm": round(h, 1),
-                    "area_m2": round(area_m2, 3),
-                    "risk_level": risk_level
-                })
-        overall_risk = summarize_image_risk(risk_list)
-
-        # 3. 바운딩박스 시각화 이미지 생성 (YOLO 결과 활용)
-        yolo_results = app.state.model.models[1](image)
-        result = yolo_results[0]
-        img_with_boxes = result.plot()  # numpy array
-        img_with_boxes_pil = Image.fromarray(img_with_boxes)
-        buf = io.BytesIO()
-        img_with_boxes_pil.save(buf, format='JPEG')
-        buf.seek(0)
-        result_img_bytes = buf.getvalue()
-
-        # 4. 결과 이미지 S3 업로드
-        result_file_name = make_filename("website/results")
-        s3_url_result = app.state.s3_uploader.upload_file(result_img_bytes, file_name=result_file_name)
+            # 3. 바운딩박스 시각화 이미지 생성 (2단계의 검출/위험도 결과 재사용)
+            result_img_bytes = await run_in(app.state.cpu_executor, render_result_image, *render_args)
+
+            # 4. 결과 이미지 S3 업로드 (원본 업로드 완료 대기)
+            s3_url_result, s3_url_upload = await asyncio.gather(
+                run_in(app.state.io_executor, upload_to_s3, "upload_result", result_img_bytes, result_file_name),
+                upload_task
+            )
 
         # 5. 결과 이미지 프론트엔드 전송 (S3 URL)
-        return {
+        result = {
             "predictions": predictions_for_frontend,
             "day_or_night": day_or_night,
             "overall_risk": overall_risk,
             "original_image_url": s3_url_upload,
-            "result_image_url": s3_url_result
+            "result_image_url": s3_url_result,
+            # 프론트엔드에서 박스를 직접 그릴 때 쓰는 원본 해상도 (predictions 좌표 기준)
+            "image_width": round(image.width * scale[0]),
+            "image_height": round(image.height * scale[1])
         }
+        return PendingResult(result, publish) if publish is not None else result
+    except Exception:
+        if upload_task is not None and not upload_task.done():
+            upload_task.cancel()
+        raise
+
+@app.post("/predict")
+async def predict_hazard(background_tasks: BackgroundTasks, file: UploadFile = File(...),
+                         latitude: Optional[float] = Form(None, ge=-90, le=90),
+                         longitude: Optional[float] = Form(None, ge=-180, le=180),
+                         captured_at: Optional[float] = Form(None, description="촬영 시각 (unix time)")):
+    try:
+        if not file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail="이미지 파일을 업로드하세요.")
+        
+        data = await file.read()
+        # 같은 이미지가 다시 올라오면 캐시된 응답을 반환 (동시에 들어온 동일 이미지는 한 번만 계산)
+        result = await app.state.result_cache.get_or_compute(
+            content_key(data), lambda: run_prediction(data))
+        # 캐시 적중이어도 관측(차량/시각)은 별개이므로 매번 저장
+        if app.state.hazard_store is not None:
+            background_tasks.add_task(record_observation, data, result, latitude, longitude, captured_at)
+        return result
     except Exception as e:
+        count_error("predict")
         print(f"예측 중 에러 발생: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict_batch")
+async def predict_hazard_batch(background_tasks: BackgroundTasks, files: List[UploadFile] = File(...)):
+    # 여러 장(예: 대시캠 프레임 시퀀스)을 한 요청으로 받아 배치 텐서로 추론
+    # S3 업로드와 결과 이미지 생성 없이 분석 결과만 반환
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_FILES}장까지 업로드할 수 있습니다.")
+    for file in files:
+        if not file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail=f"이미지 파일을 업로드하세요: {file.filename}")
+        if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"파일 크기가 허용 한도({MAX_UPLOAD_BYTES // 2**20}MB)를 초과했습니다: {file.filename}")
+
+    try:
+        datas = [await file.read() for file in files]
+        try:
+            decoded = await asyncio.gather(*(run_in(app.state.cpu_executor, decode_image, data) for data in datas))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"이미지 파싱에 실패했습니다: {str(e)}")
+
+        images = [image for image, _ in decoded]
+        # 스케줄러를 거쳐 /predict 요청과 같은 워커에서 배치로 추론 (YOLO predictor를 동시에 호출하지 않음)
+        scheduler = await get_scheduler()
+        predictions = await scheduler.predict_many(images)
+
+        results = []
+        for file, data, (_, scale), image_predictions in zip(files, datas, decoded, predictions):
+            predictions_for_frontend, day_or_night, overall_risk = analyze_predictions(image_predictions, scale)
+            results.append({
+                "filename": file.filename,
+                "predictions": predictions_for_frontend,
+                "day_or_night": day_or_night,
+                "overall_risk": overall_risk
+            })
+            # 배치 업로드는 파일별 EXIF GPS가 있을 때만 위치 저장소에 기록
+            if app.state.hazard_store is not None:
+                background_tasks.add_task(record_observation, data, results[-1], None, None, None)
+        return {"results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        count_error("predict_batch")
+        print(f"배치 예측 중 에러 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.websocket("/ws/predict")
+async def predict_hazard_stream(websocket: WebSocket):
+    # 프레임(이미지 바이트)을 바이너리 메시지로 계속 받고, 프레임별 결과를 도착 순서대로 JSON으로 전송
+    # 텍스트 메시지 "end"를 보내면 남은 프레임 결과를 모두 보낸 뒤 연결을 닫음
+    await websocket.accept()
+    # 처리 중인 프레임 수를 제한해 클라이언트가 너무 빨리 보내면 수신을 잠시 멈춤
+    pending: asyncio.Queue = asyncio.Queue(maxsize=STREAM_MAX_IN_FLIGHT)
+
+    async def analyze_frame(data: bytes):
+        if len(data) > MAX_UPLOAD_BYTES:
+            raise ValueError(f"프레임 크기가 허용 한도({MAX_UPLOAD_BYTES // 2**20}MB)를 초과했습니다.")
+        image, scale = await run_in(app.state.cpu_executor, decode_image, data)
+        # 동시에 처리 중인 프레임들은 스케줄러에서 하나의 배치로 묶임
+        scheduler = await get_scheduler()
+        predictions = await scheduler.predict(image)
+        return analyze_predictions(predictions, scale)
+
+    async def send_results() -> bool:
+        # 모든 결과를 보냈으면 True, 클라이언트가 떠나 전송에 실패하면 False를 반환하고 종료
+        while True:
+            frame_index, task = await pending.get()
+            if task is None:
+                return True
+            try:
+                predictions_for_frontend, day_or_night, overall_risk = await task
+                message = {
+                    "frame": frame_index,
+                    "predictions": predictions_for_frontend,
+                    "day_or_night": day_or_night,
+                    "overall_risk": overall_risk
+                }
+            except Exception as e:
+                count_error("stream")
+                message = {"frame": frame_index, "error": str(e)}
+            try:
+                await websocket.send_json(message)
+            except Exception:
+                return False
+
+    async def until_sender_stops(awaitable) -> bool:
+        # awaitable이 끝나면 True, 그 전에 전송 태스크가 끝나면(클라이언트 이탈) awaitable을 취소하고 False
+        waiter = asyncio.ensure_future(awaitable)
+        await asyncio.wait({waiter, sender}, return_when=asyncio.FIRST_COMPLETED)
+        if not waiter.done():
+            waiter.cancel()
+            return False
+        return True
+
+    sender = asyncio.create_task(send_results())
+    frames = set()
+    receiver = None
+    frame_index = 0
+    try:
+        while True:
+            receiver = asyncio.create_task(websocket.receive())
+            if not await until_sender_stops(receiver):
+                break
+            message = receiver.result()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                frame = asyncio.create_task(analyze_frame(message["bytes"]))
+                frames.add(frame)
+                frame.add_done_callback(frames.discard)
+                # 큐가 가득 차면 여기서 대기 (백프레셔) - 그 사이 결과 전송이 실패하면 수신 중단
+                if not await until_sender_stops(pending.put((frame_index, frame))):
+                    break
+                frame_index += 1
+            elif message.get("text") == "end":
+                if await until_sender_stops(pending.put((frame_index, None))) and await sender:
+                    await websocket.close()
+                    return
+                break
+        # 결과 전송이 실패해 수신을 멈춘 경우 - 연결이 아직 살아 있으면 오류 코드로 닫음
+        try:
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        # 연결 종료 경로와 관계없이 아직 처리 중인 프레임과 수신/전송 태스크를 정리
+        for task in (receiver, sender, *frames):
+            if task is not None:
+                task.cancel()
+
 # 실행
 if __name__ == "__main__":
     import uvicorn
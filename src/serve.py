@@ -0,0 +1,130 @@
+# 사전 fork(pre-fork) 멀티 워커 서버
+# 부모 프로세스에서 모델을 한 번만 로드한 뒤 워커를 fork 해 가중치 텐서를 copy-on-write로 공유한다.
+# (uvicorn --workers 는 워커마다 두 모델을 따로 로드하므로 워커 수만큼 메모리가 늘어남)
+# 실행: python -m src.serve --workers 4 --port 8000
+import argparse
+import gc
+import glob
+import os
+import signal
+import socket
+import tempfile
+import time
+
+
+def prepare_metrics_dir() -> str:
+    # 워커마다 레지스트리가 따로 있으면 /metrics가 응답한 워커의 값만 보여주므로
+    # prometheus_client 멀티프로세스 모드로 모든 워커의 지표 파일을 합산 (이전 실행의 파일은 삭제)
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="road_hazard_metrics_")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+# prometheus_client는 import 시점에 멀티프로세스 모드를 결정하므로 src.main(지표 생성)보다 먼저 설정
+if os.getenv("METRICS_ENABLED", "1") == "1":
+    prepare_metrics_dir()
+
+import torch
+import uvicorn
+
+from src.main import app, create_model
+from src.utils.metrics_utils import mark_process_dead
+
+# 워커별 torch 스레드 수 (0이면 CPU 코어 수 / 워커 수)
+WORKER_TORCH_THREADS = int(os.getenv("WORKER_TORCH_THREADS", "0"))
+# 이 시간 안에 죽은 워커는 설정 오류로 보고 재시작하지 않음 (재시작 루프 방지)
+MIN_WORKER_UPTIME = 5.0
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    # 모든 워커가 같은 리스닝 소켓에서 accept (커널이 연결을 분배)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, threads: int, log_level: str):
+    torch.set_num_threads(threads)
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 메모리를 공유하는 pre-fork 멀티 워커 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="비교용: 부모에서 모델을 로드하지 않고 워커마다 따로 로드")
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    threads = WORKER_TORCH_THREADS or max(1, (os.cpu_count() or 1) // args.workers)
+    if args.preload:
+        model = create_model()
+        model.prepare_for_fork()
+        app.state.preloaded_model = model
+    # 이후 생성되는 객체만 GC 대상으로 삼아, GC가 공유 페이지의 객체 헤더를 건드려 복사되는 것을 줄임
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    children = {}  # pid -> 시작 시각
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(sock, threads, args.log_level)
+            except BaseException as e:
+                print(f"워커 {os.getpid()} 종료: {str(e)}")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def terminate(signum, frame):
+        nonlocal stopping
+        stopping = True
+        # SIGINT(Ctrl+C)는 프로세스 그룹 전체에 전달되므로 SIGTERM만 워커에 전달
+        if signum == signal.SIGTERM:
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, terminate)
+    for _ in range(args.workers):
+        spawn()
+    print(f"{args.workers}개 워커 시작 (preload={args.preload}, torch threads/worker={threads}) "
+          f"http://{args.host}:{args.port}")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        mark_process_dead(pid)
+        if stopping or started is None:
+            continue
+        if time.monotonic() - started < MIN_WORKER_UPTIME:
+            print(f"워커 {pid}가 시작 직후 종료되었습니다 (status={status}). 서버를 종료합니다.")
+            terminate(signal.SIGTERM, None)
+        else:
+            print(f"워커 {pid} 비정상 종료 (status={status}), 다시 시작합니다.")
+            spawn()
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
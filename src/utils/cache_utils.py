@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Dict, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# 결과 캐시 설정 (RESULT_CACHE_MAX_ENTRIES=0 이면 비활성화)
+CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "64"))
+CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")  # memory | disk | redis
+CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "result_cache.sqlite3")
+CACHE_REDIS_URL = os.getenv("RESULT_CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_PURGE_INTERVAL_SECONDS = float(os.getenv("RESULT_CACHE_PURGE_INTERVAL_SECONDS", "60"))
+
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class PendingResult:
+    """응답은 준비됐지만 부수 작업(예: 백그라운드 S3 업로드)이 성공해야 캐시에 저장할 수 있는 결과.
+
+    ready는 성공 여부(bool)를 돌려주는 awaitable - True일 때만 value를 캐시에 저장한다.
+    """
+
+    def __init__(self, value: Dict, ready: Awaitable[bool]):
+        self.value = value
+        self.ready = ready
+
+
+class SQLiteCacheBackend:
+    # 프로세스 재시작 후에도 유지되는 디스크 캐시
+    # 만료된 행은 다시 조회되지 않으면 남으므로, purge_interval초마다 저장 시점에 한꺼번에 삭제
+    def __init__(self, path: str, purge_interval: float = CACHE_PURGE_INTERVAL_SECONDS):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+        self._conn.commit()
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            if now >= self._next_purge:
+                self._conn.execute("DELETE FROM results WHERE expires_at < ?", (now,))
+                self._next_purge = now + self.purge_interval
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+            self._conn.commit()
+
+
+class RedisCacheBackend:
+    # redis-py 호환 클라이언트(get/set(ex=))라면 무엇이든 사용 가능 (예: 로컬 테스트용 fakeredis)
+    def __init__(self, client=None, url: str = CACHE_REDIS_URL, prefix: str = "predict:"):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def set(self, key: str, value: str, ttl: float):
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+
+class ResultCache:
+    """업로드된 이미지 바이트의 해시를 키로 /predict 최종 응답을 저장한다.
+
+    메모리 계층은 LRU + TTL + 메모리 상한으로 관리하고, 선택적으로 디스크/Redis 백엔드를
+    2차 계층으로 사용한다. 같은 키로 동시에 들어온 요청은 하나의 계산 결과를 공유한다.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: float = CACHE_TTL_SECONDS,
+                 max_bytes: int = int(CACHE_MAX_MB * 1024 * 1024), backend=None,
+                 executor: Optional[Executor] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.max_bytes = max_bytes
+        self.backend = backend
+        # 백엔드 I/O를 실행할 풀 (None이면 이벤트 루프 기본 executor)
+        self.executor = executor
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: Set[asyncio.Task] = set()  # 저장 대기 중인 PendingResult (작업이 GC되지 않도록 참조 유지)
+
+        self.hits = 0
+        self.misses = 0
+        self.inflight_hits = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "inflight_hits": self.inflight_hits,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+        }
+
+    def _get_local(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _set_local(self, key: str, value: Dict, size: int):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get(self, key: str) -> Optional[Dict]:
+        value = self._get_local(key)
+        if value is None and self.backend is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                raw = await loop.run_in_executor(self.executor, self.backend.get, key)
+            except Exception as e:
+                logger.warning(f"결과 캐시 백엔드 조회 실패: {str(e)}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._set_local(key, value, len(raw.encode("utf-8")))
+        return value
+
+    async def set(self, key: str, value: Dict):
+        raw = json.dumps(value, ensure_ascii=False)
+        # 메모리 상한은 문자 수가 아니라 UTF-8 바이트 수로 계산 (한글 위험도/주야 문자열은 글자당 3바이트)
+        self._set_local(key, value, len(raw.encode("utf-8")))
+        if self.backend is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self.executor, self.backend.set, key, raw, self.ttl)
+            except Exception as e:
+                logger.warning(f"결과 캐시 백엔드 저장 실패: {str(e)}")
+
+    async def get_or_compute(self, key: str,
+                             compute: Callable[[], Awaitable[Union[Dict, PendingResult]]]) -> Dict:
+        if not self.enabled:
+            value = await compute()
+            return value.value if isinstance(value, PendingResult) else value
+
+        value = await self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        # 동일한 이미지가 이미 처리 중이면 그 결과를 기다림
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.inflight_hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        # 계산은 별도 작업으로 실행 - 처음 요청한 쪽이 취소(클라이언트 연결 끊김)되어도
+        # 같은 이미지를 기다리는 요청들은 shield 덕분에 계산 결과를 그대로 받음
+        task = asyncio.ensure_future(self._compute_and_store(key, compute))
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute_and_store(self, key: str,
+                                 compute: Callable[[], Awaitable[Union[Dict, PendingResult]]]) -> Dict:
+        try:
+            value = await compute()
+        finally:
+            self._inflight.pop(key, None)
+        if isinstance(value, PendingResult):
+            # 부수 작업이 끝날 때까지 저장을 미룸 (실패하면 저장하지 않아 이후 요청은 다시 계산)
+            store = asyncio.ensure_future(self._store_when_ready(key, value))
+            self._pending.add(store)
+            store.add_done_callback(self._pending.discard)
+            return value.value
+        await self.set(key, value)
+        return value
+
+    async def _store_when_ready(self, key: str, pending: PendingResult):
+        try:
+            ready = await pending.ready
+        except Exception as e:
+            logger.warning(f"결과 캐시 저장 보류 - 부수 작업 실패: {str(e)}")
+            ready = False
+        if ready:
+            await self.set(key, pending.value)
+
+    async def wait_pending(self):
+        # 저장 대기 중인 결과가 모두 처리될 때까지 대기 (종료 처리/테스트용)
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+
+def create_result_cache(executor: Optional[Executor] = None) -> ResultCache:
+    backend = None
+    if CACHE_BACKEND == "disk":
+        backend = SQLiteCacheBackend(CACHE_PATH)
+    elif CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(url=CACHE_REDIS_URL)
+    elif CACHE_BACKEND != "memory":
+        raise ValueError(f"지원하지 않는 RESULT_CACHE_BACKEND 입니다: {CACHE_BACKEND}")
+    return ResultCache(backend=backend, executor=executor)
@@ -0,0 +1,107 @@
+# 낮/밤 밝기 사전 판별(DAY_NIGHT_GATE) 임계값 보정 및 CNN 대비 정확도 확인
+# dataset/images의 train+val에서 CNN 판별과 일치율이 목표 이상인 가장 넓은 임계값을 찾고, test에서 적중률/일치율을 보고
+# 실행: python -m src.utils.calibrate_day_night_gate --target-agreement 0.995
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import torch
+
+from src.core.InferenceBackend import load_classifier
+from src.core.Preprocessor import Preprocessor
+from src.utils.eval_utils import list_images
+from src.utils.image_utils import load_image
+from src.utils.luminance_utils import (
+    DAY_NIGHT_GATE_PATH, NIGHT, STATISTICS, LuminanceGate, calibrate_thresholds, luminance_stats
+)
+
+MODEL_DIR = os.path.join("src", "models")
+
+
+def measure(paths, classifier, preprocess):
+    # 이미지별 밝기 통계와 CNN 판별(밤이면 True), 각각의 이미지당 소요 시간
+    values = {name: [] for name in STATISTICS}
+    night, stats_ms, cnn_ms = [], [], []
+    for path in paths:
+        with open(path, "rb") as f:
+            image, _ = load_image(f.read())
+        start = time.perf_counter()
+        stats = luminance_stats(image)
+        stats_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        with torch.no_grad():
+            night.append(int(classifier(preprocess([image])).argmax(dim=1)[0]) == NIGHT)
+        cnn_ms.append((time.perf_counter() - start) * 1000)
+        for name in STATISTICS:
+            values[name].append(stats[name])
+    return {name: np.array(v) for name, v in values.items()}, np.array(night), stats_ms, cnn_ms
+
+
+def evaluate(gate: LuminanceGate, values: np.ndarray, night: np.ndarray):
+    decisions = [gate.decide_value(v) for v in values]
+    decided = np.array([d is not None for d in decisions])
+    agree = np.array([d == NIGHT if d is not None else n for d, n in zip(decisions, night)]) == night
+    return {
+        "images": len(values),
+        "hit_rate": float(decided.mean()) if len(values) else 0.0,
+        # 밝기로 결정한 이미지 중 CNN과 같은 비율 (나머지는 CNN을 그대로 쓰므로 전체 일치율은 이 값 이상)
+        "agreement_on_hits": float(agree[decided].mean()) if decided.any() else None,
+        "overall_agreement": float(agree.mean()) if len(values) else None,
+    }
+
+
+def optional(value, width: int, spec: str) -> str:
+    return f"{value:>{width}{spec}}" if value is not None else f"{'-':>{width}}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="낮/밤 밝기 사전 판별 임계값 보정")
+    parser.add_argument("--classifier", default=os.path.join(MODEL_DIR, "night_day_model.pth"))
+    parser.add_argument("--calibration-images", nargs="+",
+                        default=[os.path.join("dataset", "images", "train"), os.path.join("dataset", "images", "val")])
+    parser.add_argument("--test-images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--target-agreement", type=float, default=0.995,
+                        help="밝기로 결정한 이미지의 CNN 일치율 하한")
+    parser.add_argument("--statistic", choices=STATISTICS, help="사용할 밝기 통계 (기본: 적중률이 가장 높은 통계)")
+    parser.add_argument("--output", default=DAY_NIGHT_GATE_PATH)
+    args = parser.parse_args()
+
+    classifier = load_classifier(args.classifier, "torch", torch.device("cpu"))
+    preprocess = Preprocessor(size=224)
+    calibration_paths = [p for image_dir in args.calibration_images for p in list_images(image_dir)]
+    values, night, stats_ms, cnn_ms = measure(calibration_paths, classifier, preprocess)
+    test_values, test_night, test_stats_ms, test_cnn_ms = measure(list_images(args.test_images), classifier, preprocess)
+    print(f"calibration={len(night)} images (CNN night={int(night.sum())})  test={len(test_night)} images")
+
+    print(f"{'statistic':<10}{'night<=':>9}{'day>=':>9}{'hit rate':>10}{'agree':>8}")
+    candidates = {}
+    for name in STATISTICS:
+        gate = LuminanceGate(name, *calibrate_thresholds(values[name], night, args.target_agreement))
+        report = evaluate(gate, values[name], night)
+        candidates[name] = (gate, report)
+        print(f"{name:<10}{optional(gate.night_below, 9, '.1f')}{optional(gate.day_above, 9, '.1f')}"
+              f"{report['hit_rate']:>10.3f}{optional(report['agreement_on_hits'], 8, '.3f')}")
+
+    statistic = args.statistic or max(candidates, key=lambda name: candidates[name][1]["hit_rate"])
+    gate, calibration = candidates[statistic]
+    test = evaluate(gate, test_values[statistic], test_night)
+    all_stats_ms, all_cnn_ms = stats_ms + test_stats_ms, cnn_ms + test_cnn_ms
+    # 적중한 이미지는 CNN을 건너뛰므로 이미지당 기대 분류 비용 = 통계 + (1 - 적중률) * CNN
+    expected_ms = np.median(all_stats_ms) + (1 - calibration["hit_rate"]) * np.median(all_cnn_ms)
+    print(f"selected={statistic}  test hit rate={test['hit_rate']:.3f}  "
+          f"agreement on hits={optional(test['agreement_on_hits'], 0, '.3f')}  "
+          f"overall agreement={optional(test['overall_agreement'], 0, '.3f')}")
+    print(f"per image: stats={np.median(all_stats_ms):.2f}ms  CNN={np.median(all_cnn_ms):.1f}ms  "
+          f"expected with gate={expected_ms:.1f}ms")
+
+    config = dict(gate.to_dict(), target_agreement=args.target_agreement,
+                  calibration=calibration, test=test)
+    with open(args.output, "w") as f:
+        json.dump(config, f, indent=2)
+    print(f"saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
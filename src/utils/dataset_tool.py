@@ -0,0 +1,334 @@
+# 데이터셋 전처리 CLI (기존 process.py / process_negative_numbers.py / find_orphans.py 통합)
+# 실행 예:
+#   python -m src.utils.dataset_tool clamp  --root dataset
+#   python -m src.utils.dataset_tool masks  --root dataset --split test
+#   python -m src.utils.dataset_tool cache  --root dataset --split train
+#   python -m src.utils.dataset_tool orphans --root dataset --split train [--delete]
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+
+from src.utils.label_store import build_label_cache, parse_label_file, rasterize, read_image_size
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# 마스크로 만들 클래스 아이디 세트
+TARGET_CLASSES = {1, 4, 7, 9, 10}
+MANIFEST_NAME = ".dataset_tool_manifest.json"
+SIZE_INDEX_NAME = ".image_sizes.json"
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def atomic_write(path: str, data: bytes):
+    # 같은 디렉터리의 임시 파일에 쓴 뒤 교체해, 중단되어도 반쯤 쓰인 파일이 남지 않게 함
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp는 0600으로 만들므로 기존 파일의 권한(새 파일이면 open()과 같은 0666 & ~umask)으로 맞춤
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_current_umask()
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class Manifest:
+    """처리한 입력 파일의 (mtime, size, sha1)를 기록해 다음 실행에서 바뀌지 않은 파일을 건너뛴다.
+
+    sha1은 None일 수 있다(예: 이미지는 전체를 읽지 않도록 mtime/size로만 추적). 해시는 mtime만 바뀐
+    파일에 대해서만 계산하고, 해시를 기록하지 않은 파일의 mtime/size가 바뀌면 변경된 것으로 본다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, List] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def is_unchanged(self, key: str, paths: Sequence[str]) -> bool:
+        entry = self.entries.get(key)
+        if entry is None or len(entry[0]) != len(paths):
+            return False
+        current = [[s.st_mtime_ns, s.st_size] for s in (os.stat(p) for p in paths)]
+        if entry[0] == current:
+            return True
+        # mtime만 바뀐 경우(touch, 복사 등)는 그 파일만 내용 해시로 다시 확인
+        for path, old, new, digest in zip(paths, entry[0], current, entry[1]):
+            if old == new:
+                continue
+            if old[1] != new[1] or digest is None or file_digest(path) != digest:
+                return False
+        self.entries[key] = [current, entry[1]]
+        return True
+
+    def record(self, key: str, paths: Sequence[str], digests: List[Optional[str]]):
+        stats = [os.stat(p) for p in paths]
+        self.entries[key] = [[[s.st_mtime_ns, s.st_size] for s in stats], digests]
+
+    def save(self):
+        atomic_write(self.path, json.dumps(self.entries).encode("utf-8"))
+
+
+def list_files(directory: str, extensions: Tuple[str, ...]) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as it:
+        return sorted(e.path for e in it if e.is_file() and e.name.lower().endswith(extensions))
+
+
+def report(name: str, processed: int, skipped: int, changed: int, elapsed: float):
+    rate = processed / elapsed if elapsed > 0 else float("inf")
+    print(f"[{name}] 처리 {processed}개 (변경 {changed}개), 건너뜀 {skipped}개, "
+          f"{elapsed:.2f}s, {rate:.1f} files/s")
+
+
+# ---------------------------------------------------------------------------
+# clamp: 라벨 좌표를 [0, 1] 범위로 자르기
+# ---------------------------------------------------------------------------
+
+def clamp(val: float) -> float:
+    return max(0.0, min(1.0, val))
+
+
+def clamp_label_file(file_path: str) -> Tuple[str, bool, List[str], str]:
+    with open(file_path, "r") as f:
+        original = f.read()
+
+    new_lines, warnings = [], []
+    for line in original.splitlines():
+        tokens = line.strip().split()
+        if not tokens:
+            continue
+        try:
+            clamped_coords = [str(clamp(float(v))) for v in tokens[1:]]
+        except ValueError:
+            warnings.append(f"⚠️ Invalid value in {file_path}: {line.strip()}")
+            continue
+        new_lines.append(f"{tokens[0]} " + " ".join(clamped_coords))
+
+    content = "".join(line + "\n" for line in new_lines)
+    data = content.encode("utf-8")
+    # 내용이 그대로면 다시 쓰지 않음
+    changed = content != original
+    if changed:
+        atomic_write(file_path, data)
+    # manifest용 해시는 워커에서 계산해 부모 프로세스가 파일을 다시 읽지 않게 함
+    return file_path, changed, warnings, hashlib.sha1(data).hexdigest()
+
+
+def cmd_clamp(args) -> int:
+    label_root = os.path.join(args.root, "labels")
+    paths = [
+        os.path.join(subdir, f)
+        for subdir, _, files in os.walk(label_root)
+        for f in files if f.endswith(".txt")
+    ]
+    manifest = Manifest(os.path.join(label_root, MANIFEST_NAME))
+    todo = [p for p in paths if args.force or not manifest.is_unchanged("clamp:" + p, [p])]
+
+    start = time.perf_counter()
+    changed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for file_path, was_changed, warnings, digest in pool.map(clamp_label_file, todo, chunksize=args.chunksize):
+            for warning in warnings:
+                print(warning)
+            changed += was_changed
+            manifest.record("clamp:" + file_path, [file_path], [digest])
+    manifest.save()
+    report("clamp", len(todo), len(paths) - len(todo), changed, time.perf_counter() - start)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# masks: YOLO-seg 라벨을 PNG 마스크로 래스터화
+# ---------------------------------------------------------------------------
+
+def find_image(image_dir: str, name: str) -> Optional[str]:
+    # 이미지 경로 추정 (jpg 또는 png)
+    for ext in (".jpg", ".png"):
+        img_path = os.path.join(image_dir, name + ext)
+        if os.path.isfile(img_path):
+            return img_path
+    return None
+
+
+class SizeIndex:
+    # 이미지 크기 캐시 (name -> [w, h, mtime_ns]) - 다음 실행부터는 이미지 파일을 열지 않음
+    def __init__(self, path: str):
+        self.path = path
+        self.sizes: Dict[str, List[int]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.sizes = json.load(f)
+
+    def get(self, name: str, img_path: str) -> Optional[Tuple[int, int]]:
+        entry = self.sizes.get(name)
+        if entry is not None and entry[2] == os.stat(img_path).st_mtime_ns:
+            return entry[0], entry[1]
+        return None
+
+    def set(self, name: str, img_path: str, size: Tuple[int, int]):
+        self.sizes[name] = [size[0], size[1], os.stat(img_path).st_mtime_ns]
+
+    def save(self):
+        atomic_write(self.path, json.dumps(self.sizes).encode("utf-8"))
+
+
+def rasterize_mask(task: Tuple[str, str, str, Optional[Tuple[int, int]]]
+                   ) -> Tuple[List[Optional[str]], Tuple[int, int]]:
+    lbl_path, img_path, mask_path, size = task
+    # 크기 인덱스에 없을 때만 이미지 헤더를 읽음
+    w, h = size if size is not None else read_image_size(img_path)
+    classes, vertex_offsets, coords = parse_label_file(lbl_path)
+    # 대상 클래스 폴리곤을 클래스 아이디 픽셀 값으로 한 번에 래스터화
+    mask = rasterize(classes, vertex_offsets, coords, w, h, TARGET_CLASSES)
+
+    ok, encoded = cv2.imencode(".png", mask)
+    if not ok:
+        raise RuntimeError(f"마스크 PNG 인코딩 실패: {mask_path}")
+    atomic_write(mask_path, encoded.tobytes())
+    # 이미지는 헤더만 읽으므로 내용 해시 없이 mtime/size로만 추적 (라벨은 작아서 해시도 기록)
+    return [file_digest(lbl_path), None], (w, h)
+
+
+def cmd_masks(args) -> int:
+    image_dir = os.path.join(args.root, "images", args.split)
+    label_dir = os.path.join(args.root, "labels", args.split)
+    mask_dir = os.path.join(args.root, "masks", args.split)
+    os.makedirs(mask_dir, exist_ok=True)
+
+    tasks, skipped = [], 0
+    manifest = Manifest(os.path.join(mask_dir, MANIFEST_NAME))
+    size_index = SizeIndex(os.path.join(image_dir, SIZE_INDEX_NAME))
+    for lbl_path in list_files(label_dir, (".txt",)):
+        name = os.path.splitext(os.path.basename(lbl_path))[0]
+        img_path = find_image(image_dir, name)
+        if img_path is None:
+            continue  # 이미지가 없으면 건너뜀
+        mask_path = os.path.join(mask_dir, name + ".png")
+        if not args.force and os.path.exists(mask_path) and \
+                manifest.is_unchanged("mask:" + name, [lbl_path, img_path]):
+            skipped += 1
+            continue
+        tasks.append((lbl_path, img_path, mask_path, size_index.get(name, img_path)))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for task, (digests, size) in zip(tasks, pool.map(rasterize_mask, tasks, chunksize=args.chunksize)):
+            name = os.path.splitext(os.path.basename(task[0]))[0]
+            manifest.record("mask:" + name, task[:2], digests)
+            size_index.set(name, task[1], size)
+    manifest.save()
+    size_index.save()
+    report("masks", len(tasks), skipped, len(tasks), time.perf_counter() - start)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# cache: 라벨을 .npy 배열로 묶어 텍스트 파싱 없이 읽을 수 있게 저장
+# ---------------------------------------------------------------------------
+
+def cmd_cache(args) -> int:
+    label_dir = os.path.join(args.root, "labels", args.split)
+    image_dir = os.path.join(args.root, "images", args.split)
+    out_dir = args.out or os.path.join(args.root, "label_cache", args.split)
+    size_index = SizeIndex(os.path.join(image_dir, SIZE_INDEX_NAME))
+
+    start = time.perf_counter()
+    label_paths = list_files(label_dir, (".txt",))
+    sizes = {name: entry[:2] for name, entry in size_index.sizes.items()}
+    count = build_label_cache(label_paths, out_dir, sizes)
+    print(f"라벨 캐시 저장: {out_dir}")
+    report("cache", count, 0, count, time.perf_counter() - start)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# orphans: 라벨이 없는 이미지/마스크 찾기
+# ---------------------------------------------------------------------------
+
+def find_orphans(directory: str, extensions: Tuple[str, ...], label_stems: set) -> List[str]:
+    # 디렉터리를 한 번만 스캔하고 확장자로 거름
+    return [
+        p for p in list_files(directory, extensions)
+        if os.path.splitext(os.path.basename(p))[0] not in label_stems
+    ]
+
+
+def cmd_orphans(args) -> int:
+    label_dir = os.path.join(args.root, "labels", args.split)
+    label_stems = {os.path.splitext(os.path.basename(p))[0] for p in list_files(label_dir, (".txt",))}
+
+    start = time.perf_counter()
+    targets = [("images", IMAGE_EXTENSIONS)]
+    if args.include_masks:
+        targets.append(("masks", (".png",)))
+
+    total = 0
+    for kind, extensions in targets:
+        orphans = find_orphans(os.path.join(args.root, kind, args.split), extensions, label_stems)
+        total += len(orphans)
+        print(f"\n-- {kind}/{args.split} ({len(orphans)}개) --")
+        for p in orphans:
+            if args.delete:
+                os.remove(p)
+                print("Deleted:", p)
+            else:
+                print("  ", p)
+    if not args.delete:
+        print("\n(dry-run: 실제로 삭제하려면 --delete 를 지정하세요)")
+    report("orphans", total, 0, total if args.delete else 0, time.perf_counter() - start)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="데이터셋 라벨/마스크 전처리 도구")
+    parser.add_argument("--root", default="dataset", help="images/, labels/, masks/ 를 포함하는 데이터셋 루트")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="프로세스 풀 크기")
+    parser.add_argument("--chunksize", type=int, default=64, help="워커당 한 번에 넘길 파일 수")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 모두 다시 처리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("clamp", help="labels/** 의 좌표를 [0, 1]로 clamp")
+
+    masks = sub.add_parser("masks", help="YOLO-seg 라벨을 PNG 마스크로 변환")
+    masks.add_argument("--split", default="test")
+
+    cache = sub.add_parser("cache", help="라벨을 메모리 맵 가능한 .npy 캐시로 변환")
+    cache.add_argument("--split", default="train")
+    cache.add_argument("--out", help="저장 위치 (기본값: <root>/label_cache/<split>)")
+
+    orphans = sub.add_parser("orphans", help="라벨 없는 이미지/마스크 찾기")
+    orphans.add_argument("--split", default="train")
+    orphans.add_argument("--include-masks", action="store_true")
+    orphans.add_argument("--delete", action="store_true")
+
+    args = parser.parse_args(argv)
+    return {"clamp": cmd_clamp, "masks": cmd_masks, "cache": cmd_cache, "orphans": cmd_orphans}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
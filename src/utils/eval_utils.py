@@ -0,0 +1,105 @@
+import glob
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def list_images(image_dir: str) -> List[str]:
+    return sorted(
+        p for p in glob.glob(os.path.join(image_dir, "*"))
+        if p.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def label_path_for(image_path: str, label_dir: str) -> str:
+    return os.path.join(label_dir, os.path.splitext(os.path.basename(image_path))[0] + ".txt")
+
+
+def load_yolo_labels(label_path: str, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    # YOLO bbox(cls cx cy w h) / seg(cls x1 y1 x2 y2 ...) 라벨을 픽셀 단위 xyxy 박스로 변환
+    classes, boxes = [], []
+    if os.path.exists(label_path):
+        with open(label_path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 5:
+                    continue
+                coords = np.asarray(parts[1:], dtype=np.float64)
+                if len(coords) == 4:
+                    cx, cy, w, h = coords
+                    box = [cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2]
+                else:
+                    xs, ys = coords[0::2], coords[1::2]
+                    box = [xs.min(), ys.min(), xs.max(), ys.max()]
+                classes.append(int(parts[0]))
+                boxes.append(box)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4) * [width, height, width, height]
+    return np.asarray(classes, dtype=np.int64), boxes
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(rb - lt, 0, None).prod(axis=2)
+    area_a = (a[:, 2:] - a[:, :2]).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).prod(axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    # COCO 방식 101-point 보간
+    mrec = np.concatenate(([0.0], recall, [1.0]))
+    mpre = np.concatenate(([1.0], precision, [0.0]))
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    x = np.linspace(0, 1, 101)
+    return float(np.trapz(np.interp(x, mrec, mpre), x))
+
+
+def evaluate_detections(predictions: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                        ground_truths: List[Tuple[np.ndarray, np.ndarray]],
+                        iou_threshold: float = 0.5, recall_conf: float = 0.5) -> Dict:
+    """이미지별 (classes, confs, xyxy) 예측과 (classes, xyxy) 정답으로 mAP와 recall을 계산한다.
+
+    recall은 서비스에서 실제로 쓰는 신뢰도(recall_conf) 이상 예측만으로 계산한다.
+    """
+    per_class_scores: Dict[int, List[Tuple[float, bool]]] = {}
+    per_class_gt: Dict[int, int] = {}
+    matched_at_conf, total_gt = 0, 0
+
+    for (pred_cls, pred_conf, pred_xyxy), (gt_cls, gt_xyxy) in zip(predictions, ground_truths):
+        total_gt += len(gt_cls)
+        for c in np.unique(gt_cls):
+            per_class_gt[int(c)] = per_class_gt.get(int(c), 0) + int((gt_cls == c).sum())
+        iou = box_iou(pred_xyxy, gt_xyxy) if len(pred_xyxy) and len(gt_xyxy) else np.zeros((len(pred_xyxy), len(gt_xyxy)))
+        # 신뢰도 높은 예측부터 같은 클래스의 아직 매칭되지 않은 정답과 greedy 매칭
+        used = np.zeros(len(gt_cls), dtype=bool)
+        for i in np.argsort(-pred_conf):
+            candidates = np.where((gt_cls == pred_cls[i]) & ~used & (iou[i] >= iou_threshold))[0] if len(gt_cls) else []
+            hit = len(candidates) > 0
+            if hit:
+                j = candidates[iou[i, candidates].argmax()]
+                used[j] = True
+                if pred_conf[i] >= recall_conf:
+                    matched_at_conf += 1
+            per_class_scores.setdefault(int(pred_cls[i]), []).append((float(pred_conf[i]), hit))
+
+    aps = {}
+    for c, n_gt in per_class_gt.items():
+        scores = sorted(per_class_scores.get(c, []), key=lambda s: -s[0])
+        if not scores:
+            aps[c] = 0.0
+            continue
+        hits = np.array([hit for _, hit in scores], dtype=np.float64)
+        tp = np.cumsum(hits)
+        fp = np.cumsum(1 - hits)
+        aps[c] = average_precision(tp / n_gt, tp / np.maximum(tp + fp, 1e-9))
+
+    return {
+        "map50": float(np.mean(list(aps.values()))) if aps else 0.0,
+        "ap50_per_class": aps,
+        "recall": matched_at_conf / total_gt if total_gt else 0.0,
+        "num_ground_truths": total_gt,
+    }
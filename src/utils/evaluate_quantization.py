@@ -0,0 +1,131 @@
+# fp32 vs INT8 모델 비교: mAP@0.5, 낮/밤 정확도, 이미지당 지연시간, RSS
+# 실행: python -m src.utils.evaluate_quantization --output quant_report.json
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+
+MODEL_DIR = os.path.join("src", "models")
+DAY_NIGHT = ("day", "night")
+
+
+def evaluate_variant(backend: str, classifier_path: str, detector_path: str, image_dir: str,
+                     label_dir: str, conf: float, warmup: int) -> Dict:
+    # RSS를 변형별로 분리해 측정하기 위해 별도 프로세스에서 실행됨
+    import psutil
+    import torch
+    from PIL import Image
+
+    from src.core.InferenceBackend import load_classifier, load_detector
+    from src.core.Preprocessor import Preprocessor
+    from src.utils.eval_utils import evaluate_detections, label_path_for, list_images, load_yolo_labels
+
+    process = psutil.Process()
+    rss_start = process.memory_info().rss
+    classifier = load_classifier(classifier_path, backend, torch.device("cpu"))
+    detector = load_detector(detector_path, backend)
+    rss_loaded = process.memory_info().rss
+    preprocess = Preprocessor()
+
+    paths = list_images(image_dir)
+    images = [Image.open(p).convert("RGB") for p in paths]
+    for image in images[:warmup]:
+        with torch.no_grad():
+            classifier(preprocess([image]))
+        detector(image, conf=conf, verbose=False)
+
+    predictions, ground_truths, day_night, latencies = [], [], {}, []
+    for path, image in zip(paths, images):
+        start = time.perf_counter()
+        with torch.no_grad():
+            probs = torch.softmax(classifier(preprocess([image])), dim=1)[0]
+        result = detector(image, conf=conf, verbose=False)[0]
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        day_night[os.path.basename(path)] = DAY_NIGHT[int(probs.argmax())]
+        boxes = result.boxes
+        predictions.append((boxes.cls.cpu().numpy().astype(np.int64), boxes.conf.cpu().numpy(),
+                            boxes.xyxy.cpu().numpy()))
+        ground_truths.append(load_yolo_labels(label_path_for(path, label_dir), *image.size))
+
+    detection = evaluate_detections(predictions, ground_truths, iou_threshold=0.5)
+    lat = np.array(latencies)
+    return {
+        "backend": backend,
+        "images": len(paths),
+        "map50": detection["map50"],
+        "recall@0.5conf": detection["recall"],
+        "latency_ms": {
+            "p50": float(np.percentile(lat, 50)),
+            "p95": float(np.percentile(lat, 95)),
+            "mean": float(lat.mean()),
+        },
+        "rss_mb": {
+            "models": (rss_loaded - rss_start) / 2 ** 20,
+            # Linux에서 ru_maxrss 단위는 KiB
+            "peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+        "day_night": day_night,
+    }
+
+
+def load_day_night_labels(path: Optional[str]) -> Optional[Dict[str, str]]:
+    # 선택: "filename,day|night" 형식 CSV (없으면 fp32 결과를 기준으로 일치율만 계산)
+    if path is None:
+        return None
+    with open(path, newline="") as f:
+        return {row[0]: row[1].strip() for row in csv.reader(f) if len(row) >= 2}
+
+
+def day_night_accuracy(predicted: Dict[str, str], reference: Dict[str, str]) -> float:
+    keys = [k for k in predicted if k in reference]
+    return sum(predicted[k] == reference[k] for k in keys) / len(keys) if keys else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fp32 / INT8 정확도-지연시간 비교")
+    parser.add_argument("--classifier", default=os.path.join(MODEL_DIR, "night_day_model.pth"))
+    parser.add_argument("--detector", default=os.path.join(MODEL_DIR, "yolo_best.pt"))
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--labels", default=os.path.join("dataset", "labels", "test"))
+    parser.add_argument("--day-night-labels", help="filename,day|night CSV (선택)")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8"])
+    parser.add_argument("--conf", type=float, default=0.001, help="mAP 계산용 YOLO 신뢰도 임계값")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    reports = []
+    for backend in args.backends:
+        # 변형마다 새 프로세스를 띄워 이전 모델의 메모리가 RSS에 섞이지 않게 함
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            reports.append(pool.submit(
+                evaluate_variant, backend, args.classifier, args.detector,
+                args.images, args.labels, args.conf, args.warmup
+            ).result())
+
+    reference = load_day_night_labels(args.day_night_labels) or reports[0]["day_night"]
+    reference_name = "labels" if args.day_night_labels else reports[0]["backend"]
+    print(f"{'backend':<12}{'mAP@0.5':>9}{'recall':>8}{'day/night acc':>15}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'model MB':>10}{'peak MB':>9}")
+    for report in reports:
+        report["day_night_accuracy"] = day_night_accuracy(report["day_night"], reference)
+        report["day_night_reference"] = reference_name
+        print(f"{report['backend']:<12}{report['map50']:>9.4f}{report['recall@0.5conf']:>8.3f}"
+              f"{report['day_night_accuracy']:>15.3f}{report['latency_ms']['p50']:>9.1f}"
+              f"{report['latency_ms']['p95']:>9.1f}{report['rss_mb']['models']:>10.1f}{report['rss_mb']['peak']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+
+# CPU 작업(디코딩, 모델 추론, JPEG 인코딩)과 I/O 작업(S3 업로드)을 분리된 풀에서 실행
+CPU_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+IO_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "16"))
+
+
+def create_cpu_executor(max_workers: int = CPU_WORKERS) -> ThreadPoolExecutor:
+    # torch/PIL/ultralytics 연산은 대부분 GIL을 해제하므로 스레드 풀로 충분
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cpu")
+
+
+def create_io_executor(max_workers: int = IO_WORKERS) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+
+
+async def run_in(executor: Executor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
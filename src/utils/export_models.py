@@ -0,0 +1,144 @@
+# night_day_model.pth / yolo_best.pt 를 TorchScript, ONNX 아티팩트로 내보내고 eager 결과와 일치하는지 확인
+# 실행: python -m src.utils.export_models --formats torchscript onnx --check
+import argparse
+import os
+import sys
+
+import numpy as np
+import torch
+from PIL import Image
+
+from src.core.BatchScheduler import MAX_BATCH_SIZE
+from src.core.InferenceBackend import (
+    CLASSIFIER_EXTENSIONS, artifact_path, build_classifier, detector_static_batch, load_classifier, load_detector,
+    run_detector
+)
+from src.core.Preprocessor import Preprocessor
+from src.utils.eval_utils import box_iou, list_images
+
+MODEL_DIR = os.path.join("src", "models")
+
+
+def export_classifier(model_path: str, formats, opset: int):
+    model = build_classifier(model_path, torch.device("cpu"))
+    example = torch.randn(1, 3, 224, 224)
+    for fmt in formats:
+        out_path = artifact_path(model_path, fmt, CLASSIFIER_EXTENSIONS)
+        if fmt == "torchscript":
+            with torch.no_grad():
+                traced = torch.jit.trace(model, example)
+            traced = torch.jit.freeze(traced)
+            traced.save(out_path)
+        elif fmt == "onnx":
+            torch.onnx.export(
+                model, example, out_path,
+                input_names=["images"], output_names=["logits"],
+                dynamic_axes={"images": {0: "batch"}, "logits": {0: "batch"}},
+                opset_version=opset,
+                # dynamic_axes를 쓰는 TorchScript 기반 exporter를 명시 (최신 torch 기본값인 dynamo exporter는 onnxscript 필요)
+                dynamo=False
+            )
+        print(f"분류 모델 export 완료: {out_path}")
+
+
+def export_detector(model_path: str, formats, imgsz: int, opset: int, batch: int = MAX_BATCH_SIZE):
+    # ultralytics는 import 비용이 커서 YOLO를 내보낼 때만 import
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    for fmt in formats:
+        # ultralytics가 원본 .pt 옆에 yolo_best.torchscript / yolo_best.onnx 로 저장
+        if fmt == "onnx":
+            out_path = model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True, opset=opset)
+        else:
+            # 서빙은 1~INFER_MAX_BATCH_SIZE장(타일 모드는 그 이상)을 한 번에 넘기므로 배치 차원을 고정하지 않고 export
+            # (dynamic 없이 만든 이전 아티팩트는 ModelWrapper가 trace한 배치 크기로 나누고 채워서 호출)
+            out_path = model.export(format=fmt, imgsz=imgsz, batch=batch, dynamic=True)
+        print(f"YOLO 모델 export 완료: {out_path}")
+
+
+def check_parity(classifier_path: str, detector_path: str, formats, images, prob_tol: float,
+                 conf_tol: float, iou_min: float, conf: float, batch: int = MAX_BATCH_SIZE) -> bool:
+    device = torch.device("cpu")
+    preprocess = Preprocessor()
+    reference_classifier = load_classifier(classifier_path, "torch", device)
+    reference_detector = load_detector(detector_path, "torch")
+    with torch.no_grad():
+        reference_probs = torch.softmax(reference_classifier(preprocess(images)), dim=1).numpy()
+    reference_boxes = reference_detector(images, conf=conf, verbose=False)
+
+    ok = True
+    for fmt in formats:
+        classifier = load_classifier(classifier_path, fmt, device)
+        with torch.no_grad():
+            probs = torch.softmax(classifier(preprocess(images)), dim=1).numpy()
+        prob_diff = float(np.abs(probs - reference_probs).max())
+        prob_ok = prob_diff <= prob_tol
+        print(f"[{fmt}] classifier max|Δprob|={prob_diff:.2e} (tol {prob_tol:.0e}) {'OK' if prob_ok else 'FAIL'}")
+
+        detector = load_detector(detector_path, fmt)
+        static_batch = detector_static_batch(detector_path, fmt)
+        worst_iou, worst_conf, count_mismatch = 1.0, 0.0, 0
+        # 서빙과 같은 경로(run_detector)로 전체 이미지와, 스케줄러가 보낼 수 있는 1..batch장 및
+        # 나눠 호출해야 하는 batch+1장 입력을 모두 비교
+        expected_results = list(reference_boxes)
+        actual_results = run_detector(detector, images, static_batch, conf=conf, verbose=False)
+        for size in range(1, batch + 2):
+            indices = [i % len(images) for i in range(size)]
+            expected_results += [reference_boxes[i] for i in indices]
+            actual_results += run_detector(detector, [images[i] for i in indices], static_batch,
+                                           conf=conf, verbose=False)
+        for expected, actual in zip(expected_results, actual_results):
+            exp_xyxy = expected.boxes.xyxy.cpu().numpy()
+            act_xyxy = actual.boxes.xyxy.cpu().numpy()
+            if len(exp_xyxy) != len(act_xyxy):
+                count_mismatch += 1
+            if len(exp_xyxy) == 0 or len(act_xyxy) == 0:
+                continue
+            # 기준 박스마다 가장 많이 겹치는 박스와 비교
+            iou = box_iou(exp_xyxy, act_xyxy)
+            best = iou.argmax(axis=1)
+            worst_iou = min(worst_iou, float(iou.max(axis=1).min()))
+            conf_diff = np.abs(expected.boxes.conf.cpu().numpy() - actual.boxes.conf.cpu().numpy()[best])
+            worst_conf = max(worst_conf, float(conf_diff.max()))
+        det_ok = count_mismatch == 0 and worst_iou >= iou_min and worst_conf <= conf_tol
+        print(f"[{fmt}] detector min IoU={worst_iou:.3f} (min {iou_min}) max|Δconf|={worst_conf:.3f} "
+              f"(tol {conf_tol}) box-count mismatches={count_mismatch} {'OK' if det_ok else 'FAIL'}")
+        ok = ok and prob_ok and det_ok
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추론 백엔드용 모델 아티팩트 export 및 parity 검사")
+    parser.add_argument("--classifier", default=os.path.join(MODEL_DIR, "night_day_model.pth"))
+    parser.add_argument("--detector", default=os.path.join(MODEL_DIR, "yolo_best.pt"))
+    parser.add_argument("--formats", nargs="+", default=["torchscript", "onnx"], choices=["torchscript", "onnx"])
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--batch", type=int, default=MAX_BATCH_SIZE,
+                        help="TorchScript YOLO trace 예시 입력의 배치 크기 (parity 검사는 1..batch+1장 입력을 확인)")
+    parser.add_argument("--skip-export", action="store_true", help="이미 만든 아티팩트로 parity 검사만 수행")
+    parser.add_argument("--check", action="store_true", help="eager 모델과 출력 비교")
+    parser.add_argument("--images", default=os.path.join("dataset", "images", "test"))
+    parser.add_argument("--prob-tol", type=float, default=1e-3)
+    parser.add_argument("--conf-tol", type=float, default=0.02)
+    parser.add_argument("--iou-min", type=float, default=0.95)
+    parser.add_argument("--conf", type=float, default=0.5, help="비교에 사용할 YOLO 신뢰도 임계값")
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        export_classifier(args.classifier, args.formats, args.opset)
+        export_detector(args.detector, args.formats, args.imgsz, args.opset, args.batch)
+
+    if args.check:
+        paths = list_images(args.images)
+        if not paths:
+            raise SystemExit(f"이미지를 찾을 수 없습니다: {args.images}")
+        images = [Image.open(p).convert("RGB") for p in paths]
+        if not check_parity(args.classifier, args.detector, args.formats, images,
+                            args.prob_tol, args.conf_tol, args.iou_min, args.conf, args.batch):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
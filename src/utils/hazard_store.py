@@ -0,0 +1,155 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+# 위치 정보가 있는 분석 결과를 모아 두는 SQLite 저장소 (경로가 비어 있으면 비활성화)
+HAZARD_STORE_PATH = os.getenv("HAZARD_STORE_PATH", "")
+# 같은 클래스의 검출을 하나의 위험 요소로 합치는 격자 크기 (미터)
+HAZARD_CELL_METERS = float(os.getenv("HAZARD_CELL_METERS", "10"))
+
+METERS_PER_DEGREE = 111_320.0
+RISK_RANKS = {"A": 1, "B": 2, "C": 3}
+RISK_LABELS = {rank: label for label, rank in RISK_RANKS.items()}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    captured_at REAL,
+    lat REAL,
+    lon REAL,
+    overall_risk TEXT,
+    day_or_night TEXT,
+    image_url TEXT,
+    predictions TEXT
+);
+CREATE TABLE IF NOT EXISTS hazard_cells (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER,
+    cell_y INTEGER,
+    cell_x INTEGER,
+    count INTEGER,
+    sum_lat REAL,
+    sum_lon REAL,
+    max_risk_rank INTEGER,
+    first_seen REAL,
+    last_seen REAL,
+    last_observation_id INTEGER,
+    UNIQUE (class_id, cell_y, cell_x)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS hazard_cells_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+"""
+
+
+class HazardStore:
+    """위치별 검출 결과 저장소.
+
+    관측(이미지 1장)은 observations에 그대로 남기고, 검출은 (클래스, 약 cell_meters 격자) 단위로
+    hazard_cells에 누적한다. 같은 포트홀을 여러 차량이 찍어도 한 행의 count만 늘어나므로,
+    bbox 조회는 R-tree로 겹치는 격자만 찾고 관측 수와 무관하게 위험 요소 수에 비례해 끝난다.
+    """
+
+    def __init__(self, path: str, cell_meters: float = HAZARD_CELL_METERS):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # 격자 크기는 저장소 생성 시 고정 (이미 만들어진 저장소는 저장된 값을 사용)
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('cell_meters', ?)", (str(cell_meters),))
+        self._conn.commit()
+        self.cell_meters = float(self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'cell_meters'").fetchone()[0])
+        self.cell_deg = self.cell_meters / METERS_PER_DEGREE
+
+    def _cell(self, lat: float, lon: float):
+        # 위도 방향은 고정 간격, 경도 방향은 격자 행 중심 위도의 cos으로 보정해 거의 정사각형 격자로 나눔
+        cell_y = math.floor((lat + 90) / self.cell_deg)
+        lon_deg = self.cell_deg / max(math.cos(math.radians((cell_y + 0.5) * self.cell_deg - 90)), 1e-6)
+        cell_x = math.floor((lon + 180) / lon_deg)
+        bounds = (cell_y * self.cell_deg - 90, (cell_y + 1) * self.cell_deg - 90,
+                  cell_x * lon_deg - 180, (cell_x + 1) * lon_deg - 180)
+        return cell_y, cell_x, bounds
+
+    def add_observation(self, lat: float, lon: float, captured_at: float, predictions: List[Dict],
+                        overall_risk: str, day_or_night: Optional[str] = None,
+                        image_url: Optional[str] = None) -> int:
+        cell_y, cell_x, bounds = self._cell(lat, lon)
+        with self._lock, self._conn:
+            observation_id = self._conn.execute(
+                "INSERT INTO observations (captured_at, lat, lon, overall_risk, day_or_night, image_url, predictions) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (captured_at, lat, lon, overall_risk, day_or_night, image_url,
+                 json.dumps(predictions, ensure_ascii=False))
+            ).lastrowid
+            # 같은 이미지의 같은 클래스 검출은 하나로 합침 (최고 위험도 유지)
+            ranks: Dict[int, int] = {}
+            for item in predictions:
+                class_id = item["class_id"]
+                ranks[class_id] = max(ranks.get(class_id, 0), RISK_RANKS.get(item["risk_level"], 0))
+            for class_id, rank in ranks.items():
+                row = self._conn.execute(
+                    "SELECT id FROM hazard_cells WHERE class_id = ? AND cell_y = ? AND cell_x = ?",
+                    (class_id, cell_y, cell_x)
+                ).fetchone()
+                if row is None:
+                    cell_id = self._conn.execute(
+                        "INSERT INTO hazard_cells (class_id, cell_y, cell_x, count, sum_lat, sum_lon, max_risk_rank, "
+                        "first_seen, last_seen, last_observation_id) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?)",
+                        (class_id, cell_y, cell_x, lat, lon, rank, captured_at, captured_at, observation_id)
+                    ).lastrowid
+                    self._conn.execute("INSERT INTO hazard_cells_index VALUES (?, ?, ?, ?, ?)", (cell_id, *bounds))
+                else:
+                    self._conn.execute(
+                        "UPDATE hazard_cells SET count = count + 1, sum_lat = sum_lat + ?, sum_lon = sum_lon + ?, "
+                        "max_risk_rank = MAX(max_risk_rank, ?), first_seen = MIN(first_seen, ?), "
+                        "last_seen = MAX(last_seen, ?), last_observation_id = ? WHERE id = ?",
+                        (lat, lon, rank, captured_at, captured_at, observation_id, row[0])
+                    )
+        return observation_id
+
+    def query(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+              class_id: Optional[int] = None, min_risk: Optional[str] = None,
+              since: Optional[float] = None, limit: int = 500) -> List[Dict]:
+        sql = ("SELECT c.class_id, c.count, c.sum_lat / c.count, c.sum_lon / c.count, c.max_risk_rank, "
+               "c.first_seen, c.last_seen, c.last_observation_id "
+               "FROM hazard_cells_index r JOIN hazard_cells c ON c.id = r.id "
+               "WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?")
+        params: list = [min_lat, max_lat, min_lon, max_lon]
+        if class_id is not None:
+            sql += " AND c.class_id = ?"
+            params.append(class_id)
+        if min_risk is not None:
+            sql += " AND c.max_risk_rank >= ?"
+            params.append(RISK_RANKS[min_risk])
+        if since is not None:
+            sql += " AND c.last_seen >= ?"
+            params.append(since)
+        sql += " ORDER BY c.max_risk_rank DESC, c.count DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [{
+            "class_id": class_id,
+            "count": count,
+            "lat": lat,
+            "lon": lon,
+            "max_risk": RISK_LABELS.get(rank, "-"),
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "last_observation_id": observation_id,
+        } for class_id, count, lat, lon, rank, first_seen, last_seen, observation_id in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            observations = self._conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+            cells = self._conn.execute("SELECT COUNT(*) FROM hazard_cells").fetchone()[0]
+        return {"observations": observations, "hazards": cells, "cell_meters": self.cell_meters}
+
+
+def create_hazard_store(path: str = HAZARD_STORE_PATH) -> Optional[HazardStore]:
+    return HazardStore(path) if path else None
+
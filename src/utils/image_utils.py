@@ -0,0 +1,87 @@
+import io
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+# 디코딩 후 이미지의 긴 변 최대 길이 (0이면 원본 해상도 그대로 디코딩)
+# 두 모델 모두 내부에서 640(YOLO) / 224(분류)로 줄이므로 그보다 큰 해상도는 디코딩 비용만 늘림
+MAX_INPUT_SIDE = int(os.getenv("MAX_INPUT_SIDE", "1280"))
+
+Scale = Tuple[float, float]
+
+
+def load_image(data: bytes, max_side: int = MAX_INPUT_SIDE) -> Tuple[Image.Image, Scale]:
+    """업로드 바이트를 RGB 이미지로 디코딩하고 (image, (sx, sy))를 반환한다.
+
+    긴 변이 max_side보다 크면 JPEG은 draft 모드로 DCT 단계에서 1/2~1/8로 줄여 디코딩한 뒤
+    max_side에 맞게 축소한다. (sx, sy)는 디코딩된 좌표를 원본 좌표로 되돌리는 배율이다.
+    """
+    img = Image.open(io.BytesIO(data))
+    w0, h0 = img.size
+    if max_side and max(w0, h0) > max_side:
+        ratio = max_side / max(w0, h0)
+        target = (max(1, round(w0 * ratio)), max(1, round(h0 * ratio)))
+        if img.format == "JPEG":
+            # 요청 크기 이상을 유지하는 가장 작은 스케일로 디코딩 (JPEG 외 포맷은 무시됨)
+            img.draft("RGB", target)
+        img = img.convert("RGB")
+        if max(img.size) > max_side:
+            img = img.resize(target, Image.BILINEAR, reducing_gap=2.0)
+    else:
+        img = img.convert("RGB")
+    w, h = img.size
+    return img, (w0 / w, h0 / h)
+
+
+def rescale_detections(detections: List[Dict], scale: Scale) -> List[Dict]:
+    # 축소 디코딩한 이미지의 검출 결과(bbox, 마스크 면적/길이)를 원본 해상도 픽셀 단위로 변환
+    sx, sy = scale
+    if sx == 1.0 and sy == 1.0:
+        return detections
+    rescaled = []
+    for detection in detections:
+        x, y, w, h = detection["bbox"]
+        detection = dict(detection, bbox=[int(x * sx), int(y * sy), int(w * sx), int(h * sy)])
+        if "mask_area_px" in detection:
+            detection["mask_area_px"] = detection["mask_area_px"] * sx * sy
+            detection["mask_length_px"] = detection["mask_length_px"] * (sx + sy) / 2
+        rescaled.append(detection)
+    return rescaled
+
+
+# EXIF 태그 번호
+_EXIF_IFD, _GPS_IFD = 0x8769, 0x8825
+_DATETIME_ORIGINAL, _DATETIME = 0x9003, 0x0132
+_GPS_LAT_REF, _GPS_LAT, _GPS_LON_REF, _GPS_LON = 1, 2, 3, 4
+
+
+def _dms_to_degrees(dms, ref) -> float:
+    degrees, minutes, seconds = (float(v) for v in dms)
+    value = degrees + minutes / 60 + seconds / 3600
+    return -value if ref in ("S", "W") else value
+
+
+def read_exif_geotag(data: bytes) -> Optional[Tuple[float, float, Optional[float]]]:
+    """EXIF에서 (위도, 경도, 촬영 시각 unix time 또는 None)을 읽는다. GPS 정보가 없으면 None.
+
+    헤더만 파싱하므로 픽셀 디코딩 비용은 없다.
+    """
+    try:
+        exif = Image.open(io.BytesIO(data)).getexif()
+        gps = exif.get_ifd(_GPS_IFD)
+        if _GPS_LAT not in gps or _GPS_LON not in gps:
+            return None
+        lat = _dms_to_degrees(gps[_GPS_LAT], gps.get(_GPS_LAT_REF, "N"))
+        lon = _dms_to_degrees(gps[_GPS_LON], gps.get(_GPS_LON_REF, "E"))
+        captured = exif.get_ifd(_EXIF_IFD).get(_DATETIME_ORIGINAL) or exif.get(_DATETIME)
+    except Exception:
+        return None
+    captured_at = None
+    if captured:
+        try:
+            captured_at = datetime.strptime(str(captured).strip("\x00 "), "%Y:%m:%d %H:%M:%S").timestamp()
+        except ValueError:
+            pass
+    return lat, lon, captured_at
@@ -0,0 +1,134 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# cv2.fillPoly 서브픽셀 정밀도 (좌표에 2**SHIFT를 곱해 정수로 전달)
+FILL_SHIFT = 4
+
+CACHE_FILES = ("classes.npy", "vertex_offsets.npy", "coords.npy", "image_offsets.npy")
+
+
+def parse_label_text(text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """YOLO-seg 라벨 텍스트를 (classes[n], vertex_offsets[n+1], coords[m, 2]) 배열로 파싱한다.
+
+    모든 숫자를 한 번의 NumPy 변환으로 읽고, 줄별 토큰 수로 폴리곤 경계를 계산한다.
+    """
+    lines = [line.split() for line in text.splitlines()]
+    # 클래스 + (x, y) 쌍으로 이루어진 줄만 사용
+    lines = [tokens for tokens in lines if tokens and len(tokens) % 2 == 1]
+    if not lines:
+        return (np.empty(0, dtype=np.int16), np.zeros(1, dtype=np.int64),
+                np.empty((0, 2), dtype=np.float32))
+
+    counts = np.fromiter((len(tokens) for tokens in lines), dtype=np.int64, count=len(lines))
+    values = np.array([v for tokens in lines for v in tokens], dtype=np.float64)
+    line_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    classes = values[line_starts].astype(np.int16)
+
+    is_coord = np.ones(len(values), dtype=bool)
+    is_coord[line_starts] = False
+    coords = values[is_coord].astype(np.float32).reshape(-1, 2)
+    vertex_offsets = np.concatenate(([0], np.cumsum((counts - 1) // 2)))
+    return classes, vertex_offsets, coords
+
+
+def parse_label_file(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    with open(path) as f:
+        return parse_label_text(f.read())
+
+
+def read_image_size(path: str) -> Tuple[int, int]:
+    # PIL은 open 시 헤더만 읽음 (픽셀 디코딩 없음)
+    with Image.open(path) as img:
+        return img.size
+
+
+def rasterize(classes: np.ndarray, vertex_offsets: np.ndarray, coords: np.ndarray,
+              width: int, height: int, target_classes: Iterable[int]) -> np.ndarray:
+    """대상 클래스 폴리곤을 클래스 아이디 값으로 채운 (H, W) uint8 마스크를 만든다.
+
+    좌표 변환은 이미지 전체에 대해 한 번에 수행하고, 폴리곤은 라벨 순서대로 하나씩 채운다
+    (나중 폴리곤이 덮어씀). fillPoly에 여러 폴리곤을 한 번에 넘기면 겹친 영역이 even-odd 규칙으로
+    비워지므로, 같은 클래스라도 폴리곤마다 따로 호출해 합집합을 채운다.
+    """
+    mask = np.zeros((height, width), dtype=np.uint8)
+    keep = np.isin(classes, np.fromiter(target_classes, dtype=np.int16))
+    if not keep.any():
+        return mask
+
+    scale = np.array([width, height], dtype=np.float32) * (1 << FILL_SHIFT)
+    points = np.rint(coords * scale).astype(np.int32)
+    polygons = np.split(points, vertex_offsets[1:-1])
+
+    for i in np.flatnonzero(keep):
+        if len(polygons[i]) >= 3:
+            cv2.fillPoly(mask, [polygons[i]], int(classes[i]), lineType=cv2.LINE_8, shift=FILL_SHIFT)
+    return mask
+
+
+def build_label_cache(label_paths: List[str], out_dir: str,
+                      image_sizes: Optional[Dict[str, Tuple[int, int]]] = None) -> int:
+    """라벨 파일들을 연결된 .npy 배열로 저장한다 (학습/평가 시 np.load(mmap_mode="r")로 바로 사용).
+
+    - classes.npy        : 폴리곤별 클래스 (int16)
+    - vertex_offsets.npy : 폴리곤별 coords 시작 위치 (len = 폴리곤 수 + 1)
+    - coords.npy         : 정규화 좌표 (float32, [정점 수, 2])
+    - image_offsets.npy  : 이미지별 폴리곤 시작 위치 (len = 이미지 수 + 1)
+    - index.json         : 이미지 이름 목록과 (선택) 이미지 크기
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    all_classes, all_offsets, all_coords, image_offsets = [], [], [], [0]
+    polygon_total, vertex_total = 0, 0
+    names = []
+    for path in label_paths:
+        classes, vertex_offsets, coords = parse_label_file(path)
+        all_classes.append(classes)
+        all_offsets.append(vertex_offsets[:-1] + vertex_total)
+        all_coords.append(coords)
+        polygon_total += len(classes)
+        vertex_total += len(coords)
+        image_offsets.append(polygon_total)
+        names.append(os.path.splitext(os.path.basename(path))[0])
+
+    arrays = {
+        "classes.npy": np.concatenate(all_classes) if all_classes else np.empty(0, dtype=np.int16),
+        "vertex_offsets.npy": np.concatenate(all_offsets + [np.array([vertex_total])]).astype(np.int64),
+        "coords.npy": np.concatenate(all_coords) if all_coords else np.empty((0, 2), dtype=np.float32),
+        "image_offsets.npy": np.asarray(image_offsets, dtype=np.int64),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, name), array)
+    with open(os.path.join(out_dir, "index.json"), "w") as f:
+        json.dump({"names": names, "sizes": image_sizes or {}}, f)
+    return len(names)
+
+
+class LabelStore:
+    # build_label_cache 결과를 메모리 맵으로 열어 텍스트 파싱 없이 이미지별 폴리곤을 조회
+    def __init__(self, cache_dir: str):
+        arrays = {name: np.load(os.path.join(cache_dir, name), mmap_mode="r") for name in CACHE_FILES}
+        self.classes = arrays["classes.npy"]
+        self.vertex_offsets = arrays["vertex_offsets.npy"]
+        self.coords = arrays["coords.npy"]
+        self.image_offsets = arrays["image_offsets.npy"]
+        with open(os.path.join(cache_dir, "index.json")) as f:
+            index = json.load(f)
+        self.names: List[str] = index["names"]
+        self.sizes: Dict[str, List[int]] = index["sizes"]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # parse_label_file과 같은 (classes, vertex_offsets, coords) 형식으로 반환
+        i = self._positions[name]
+        p0, p1 = self.image_offsets[i], self.image_offsets[i + 1]
+        v0, v1 = self.vertex_offsets[p0], self.vertex_offsets[p1]
+        return (np.asarray(self.classes[p0:p1]),
+                np.asarray(self.vertex_offsets[p0:p1 + 1]) - v0,
+                np.asarray(self.coords[v0:v1]))
@@ -0,0 +1,116 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+# 밝기 통계로 확실히 밝거나 어두운 이미지는 CNN 없이 낮/밤을 결정 (애매한 구간만 분류 모델 실행)
+# 임계값은 calibrate_day_night_gate.py로 dataset/images에서 보정해 JSON으로 저장
+DAY_NIGHT_GATE = os.getenv("DAY_NIGHT_GATE", "0") == "1"
+DAY_NIGHT_GATE_PATH = os.getenv("DAY_NIGHT_GATE_PATH",
+                                os.path.join(os.path.dirname(__file__), "day_night_gate.json"))
+
+# 통계를 계산할 썸네일의 짧은 변 (정수 배 box 축소라 원본 크기와 거의 무관한 비용)
+THUMBNAIL_SIDE = 64
+# 모두 값이 클수록 밝음을 뜻하는 통계 (0~255)
+STATISTICS = ("mean", "p10", "p25", "p50", "p75", "p90")
+_PERCENTILES = np.array([0.10, 0.25, 0.50, 0.75, 0.90])
+
+DAY, NIGHT = 0, 1  # ModelWrapper classes ["day", "night"] 순서
+
+
+def luminance_stats(image: Image.Image) -> Dict[str, float]:
+    # 썸네일의 휘도(ITU-R 601 L) 히스토그램에서 평균과 백분위수를 계산
+    factor = max(1, min(image.size) // THUMBNAIL_SIDE)
+    thumbnail = image.reduce(factor) if factor > 1 else image
+    luma = np.asarray(thumbnail.convert("L"))
+    hist = np.bincount(luma.ravel(), minlength=256)
+    cdf = np.cumsum(hist)
+    levels = np.searchsorted(cdf, _PERCENTILES * cdf[-1]).astype(float)
+    stats = {"mean": float(hist @ np.arange(256) / cdf[-1])}
+    stats.update({name: value for name, value in zip(STATISTICS[1:], levels.tolist())})
+    return stats
+
+
+class LuminanceGate:
+    """밝기 통계 하나(statistic)가 night_below 이하면 밤, day_above 이상이면 낮, 그 사이면 None(CNN 필요).
+
+    임계값이 None이면 그 방향으로는 결정하지 않는다.
+    """
+
+    def __init__(self, statistic: str, night_below: Optional[float], day_above: Optional[float]):
+        if statistic not in STATISTICS:
+            raise ValueError(f"지원하지 않는 밝기 통계입니다: {statistic}")
+        self.statistic = statistic
+        self.night_below = night_below
+        self.day_above = day_above
+        self.day = 0
+        self.night = 0
+        self.fallback = 0
+
+    def decide_value(self, value: float) -> Optional[int]:
+        if self.night_below is not None and value <= self.night_below:
+            return NIGHT
+        if self.day_above is not None and value >= self.day_above:
+            return DAY
+        return None
+
+    def decide(self, images: List[Image.Image]) -> List[Optional[int]]:
+        decisions = [self.decide_value(luminance_stats(image)[self.statistic]) for image in images]
+        for decision in decisions:
+            if decision == DAY:
+                self.day += 1
+            elif decision == NIGHT:
+                self.night += 1
+            else:
+                self.fallback += 1
+        return decisions
+
+    def stats(self) -> Dict:
+        total = self.day + self.night + self.fallback
+        return {
+            "day": self.day,
+            "night": self.night,
+            "fallback": self.fallback,
+            # CNN 없이 결정한 비율
+            "hit_ratio": round((self.day + self.night) / total, 4) if total else 0.0,
+            "statistic": self.statistic,
+        }
+
+    def to_dict(self) -> Dict:
+        return {"statistic": self.statistic, "night_below": self.night_below, "day_above": self.day_above}
+
+    @classmethod
+    def load(cls, path: str = DAY_NIGHT_GATE_PATH) -> "LuminanceGate":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"낮/밤 밝기 임계값 파일이 없습니다: {path} (calibrate_day_night_gate.py로 생성하세요)")
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config["statistic"], config["night_below"], config["day_above"])
+
+
+def calibrate_thresholds(values: np.ndarray, night: np.ndarray, target_agreement: float):
+    """CNN 판별(night: bool)과의 일치율이 target_agreement 이상을 유지하는 가장 넓은 임계값을 찾는다.
+
+    어두운 쪽부터 누적한 밤 비율이 목표 이상인 가장 긴 구간의 끝을 night_below로,
+    밝은 쪽부터 누적한 낮 비율이 목표 이상인 가장 긴 구간의 끝을 day_above로 정한다.
+    """
+    order = np.argsort(values, kind="stable")
+    sorted_values, sorted_night = values[order], night[order].astype(float)
+    n = np.arange(1, len(values) + 1)
+
+    # 같은 값은 함께 결정되므로 값이 바뀌는 위치(동률 그룹의 끝)에서만 자름
+    dark_ends = np.flatnonzero(np.append(sorted_values[1:] != sorted_values[:-1], True))
+    dark_ok = dark_ends[(np.cumsum(sorted_night) / n)[dark_ends] >= target_agreement]
+    night_below = float(sorted_values[dark_ok[-1]]) if len(dark_ok) else None
+
+    bright_values, bright_day = sorted_values[::-1], 1 - sorted_night[::-1]
+    bright_ends = np.flatnonzero(np.append(bright_values[1:] != bright_values[:-1], True))
+    bright_ok = bright_ends[(np.cumsum(bright_day) / n)[bright_ends] >= target_agreement]
+    day_above = float(bright_values[bright_ok[-1]]) if len(bright_ok) else None
+
+    # 두 구간이 겹치면 (데이터가 적을 때) 낮 쪽을 포기
+    if night_below is not None and day_above is not None and day_above <= night_below:
+        day_above = None
+    return night_below, day_above
@@ -0,0 +1,32 @@
+from typing import Tuple
+
+import numpy as np
+from skimage.morphology import skeletonize
+
+
+def mask_geometry(masks: np.ndarray, orig_shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """YOLO-seg 마스크(N, Hm, Wm)에서 객체별 면적과 골격(skeleton) 길이를 원본 이미지 픽셀 단위로 계산한다.
+
+    마스크는 letterbox된 모델 입력 해상도이므로 축소 비율 r = min(Hm/h0, Wm/w0)로 되돌린다.
+    면적은 전체 마스크에 대한 한 번의 합계로 구하고, 골격화는 객체 bbox 영역만 잘라 수행한다.
+    """
+    n, hm, wm = masks.shape
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+    masks = masks.astype(bool, copy=False)
+    h0, w0 = orig_shape
+    r = min(hm / h0, wm / w0)
+
+    counts = masks.reshape(n, -1).sum(axis=1)
+    rows = masks.any(axis=2)
+    cols = masks.any(axis=1)
+    # 객체별 bbox (마스크가 비어 있으면 argmax 결과는 무시됨)
+    y0 = rows.argmax(axis=1)
+    y1 = hm - rows[:, ::-1].argmax(axis=1)
+    x0 = cols.argmax(axis=1)
+    x1 = wm - cols[:, ::-1].argmax(axis=1)
+
+    lengths = np.zeros(n)
+    for i in np.flatnonzero(counts):
+        lengths[i] = skeletonize(masks[i, y0[i]:y1[i], x0[i]:x1[i]]).sum()
+    return counts / (r * r), lengths / r
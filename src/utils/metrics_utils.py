@@ -0,0 +1,110 @@
+import os
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Prometheus 지표 (/metrics)
+# METRICS_ENABLED=0 이면 prometheus_client를 import 하지 않고, 타이머/카운터 호출은 분기 한 번으로 끝남
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# 멀티 워커(src.serve)에서는 PROMETHEUS_MULTIPROC_DIR에 워커별 지표 파일을 쓰고 /metrics에서 합산
+# (prometheus_client import 전에 설정되어 있어야 함 - src.serve가 src.main보다 먼저 설정)
+MULTIPROCESS = METRICS_ENABLED and bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# 요청 처리 단계 (stage 라벨 값)
+STAGES = ("decode", "upload_original", "classifier", "detector", "risk", "render", "upload_result")
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL_TIMER = nullcontext()
+
+if METRICS_ENABLED:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+    )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+    STAGE_SECONDS = Histogram("road_hazard_stage_seconds", "요청 처리 단계별 소요 시간 (classifier/detector는 배치 단위)",
+                              ["stage"], buckets=LATENCY_BUCKETS)
+    DETECTIONS = Counter("road_hazard_detections", "응답에 포함된 클래스별 검출 수", ["class_name"])
+    ERRORS = Counter("road_hazard_errors", "처리 중 발생한 에러 수", ["endpoint"])
+    # 라벨 조회 비용을 줄이기 위해 단계별 child를 미리 만들어 둠
+    _stage_children = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+
+
+def stage_timer(stage: str):
+    # with stage_timer("decode"): ...  (비활성화 시 공용 nullcontext 반환)
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _stage_children[stage].time()
+
+
+def count_detections(class_names: Iterable[str]):
+    if not METRICS_ENABLED:
+        return
+    for name in class_names:
+        DETECTIONS.labels(name).inc()
+
+
+def count_error(endpoint: str):
+    if METRICS_ENABLED:
+        ERRORS.labels(endpoint).inc()
+
+
+class StatsCollector:
+    """stats() dict의 숫자 값을 스크레이프 시점에 게이지/카운터로 내보낸다 (요청 경로에는 비용 없음).
+
+    stats_fn이 None을 반환하면 (예: 모델 로딩 전) 아무 지표도 내보내지 않는다.
+    멀티프로세스 모드에서는 응답한 워커 한 곳의 값이므로 pid 라벨을 붙여 워커별 값임을 드러낸다.
+    """
+
+    def __init__(self, prefix: str, stats_fn: Callable[[], Optional[Dict]], counters: Tuple[str, ...] = (),
+                 per_process: bool = False):
+        self.prefix = prefix
+        self.stats_fn = stats_fn
+        self.counters = set(counters)
+        self.per_process = per_process
+
+    def collect(self):
+        stats = self.stats_fn()
+        if not stats:
+            return
+        labels = ["pid"] if self.per_process else None
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{self.prefix}_{key}"
+            family = CounterMetricFamily if key in self.counters else GaugeMetricFamily
+            if labels is None:
+                yield family(name, f"{self.prefix} {key}", value=value)
+            else:
+                metric = family(name, f"{self.prefix} {key}", labels=labels)
+                metric.add_metric([str(os.getpid())], value)
+                yield metric
+
+
+_stats_collectors = []
+
+
+def register_stats_collector(prefix: str, stats_fn: Callable[[], Optional[Dict]], counters: Tuple[str, ...] = ()):
+    if not METRICS_ENABLED:
+        return
+    collector = StatsCollector(prefix, stats_fn, counters, per_process=MULTIPROCESS)
+    if MULTIPROCESS:
+        _stats_collectors.append(collector)
+    else:
+        REGISTRY.register(collector)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if MULTIPROCESS:
+        # 스크레이프마다 모든 워커의 지표 파일을 합산하는 레지스트리를 새로 구성 (prometheus_client 권장 방식)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _stats_collectors:
+            registry.register(collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    # 종료된 워커의 live 게이지 파일 정리 (카운터/히스토그램 누적값은 유지)
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,126 @@
+# night_day_model / yolo_best 를 INT8로 양자화 (INFER_BACKEND=int8 에서 사용)
+# 실행: python -m src.utils.quantize_models --calib-images dataset/images/val
+import argparse
+import os
+
+import numpy as np
+import torch
+from PIL import Image
+from ultralytics import YOLO
+
+from src.core.InferenceBackend import (
+    CLASSIFIER_EXTENSIONS, DETECTOR_EXTENSIONS, artifact_path, build_classifier
+)
+from src.core.Preprocessor import Preprocessor
+from src.utils.eval_utils import list_images
+
+MODEL_DIR = os.path.join("src", "models")
+
+
+def quantize_classifier(model_path: str, calib_paths, mode: str, batch_size: int = 16) -> str:
+    model = build_classifier(model_path, torch.device("cpu"))
+    example = torch.randn(1, 3, 224, 224)
+
+    if mode == "dynamic":
+        # ResNet18은 Linear가 fc 하나뿐이라 효과가 작음 (비교용)
+        quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        torch.backends.quantized.engine = "x86"
+        prepared = prepare_fx(model, get_default_qconfig_mapping("x86"), example_inputs=(example,))
+        preprocess = Preprocessor()
+        with torch.no_grad():
+            for i in range(0, len(calib_paths), batch_size):
+                images = [Image.open(p).convert("RGB") for p in calib_paths[i:i + batch_size]]
+                prepared(preprocess(images))
+        quantized = convert_fx(prepared)
+
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(quantized.eval(), example))
+    out_path = artifact_path(model_path, "int8", CLASSIFIER_EXTENSIONS)
+    traced.save(out_path)
+    return out_path
+
+
+def letterbox(path: str, imgsz: int) -> np.ndarray:
+    # ultralytics 전처리와 같은 방식: 비율 유지 리사이즈 후 114 회색으로 패딩, [0,1] 정규화, NCHW
+    image = Image.open(path).convert("RGB")
+    w, h = image.size
+    scale = min(imgsz / w, imgsz / h)
+    new_w, new_h = round(w * scale), round(h * scale)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - new_h) // 2, (imgsz - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = np.asarray(image.resize((new_w, new_h), Image.BILINEAR))
+    return (canvas.transpose(2, 0, 1)[None].astype(np.float32) / 255.0)
+
+
+def quantize_detector(model_path: str, calib_paths, mode: str, imgsz: int) -> str:
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_dynamic, quantize_static
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    fp32_path = YOLO(model_path).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+    prepared_path = os.path.splitext(fp32_path)[0] + "_prep.onnx"
+    quant_pre_process(fp32_path, prepared_path)
+    out_path = artifact_path(model_path, "int8", DETECTOR_EXTENSIONS)
+
+    if mode == "dynamic":
+        quantize_dynamic(prepared_path, out_path, weight_type=QuantType.QUInt8)
+    else:
+        input_name = onnx.load(prepared_path, load_external_data=False).graph.input[0].name
+
+        class LetterboxReader(CalibrationDataReader):
+            def __init__(self):
+                self._paths = iter(calib_paths)
+
+            def get_next(self):
+                path = next(self._paths, None)
+                return None if path is None else {input_name: letterbox(path, imgsz)}
+
+        quantize_static(
+            prepared_path, out_path, LetterboxReader(),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+    os.remove(prepared_path)
+
+    # ultralytics가 task/클래스 이름/imgsz를 복원할 수 있도록 export 메타데이터를 그대로 복사
+    source = onnx.load(fp32_path)
+    quantized = onnx.load(out_path)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(source.metadata_props)
+    onnx.save(quantized, out_path)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분류/검출 모델 INT8 양자화")
+    parser.add_argument("--classifier", default=os.path.join(MODEL_DIR, "night_day_model.pth"))
+    parser.add_argument("--detector", default=os.path.join(MODEL_DIR, "yolo_best.pt"))
+    parser.add_argument("--mode", choices=["static", "dynamic"], default="static")
+    parser.add_argument("--calib-images", default=os.path.join("dataset", "images", "val"))
+    parser.add_argument("--calib-limit", type=int, default=200)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--only", choices=["classifier", "detector"])
+    args = parser.parse_args()
+
+    calib_paths = list_images(args.calib_images)[:args.calib_limit]
+    if args.mode == "static" and not calib_paths:
+        raise SystemExit(f"캘리브레이션 이미지를 찾을 수 없습니다: {args.calib_images}")
+    print(f"캘리브레이션 이미지: {len(calib_paths)}장 ({args.calib_images})")
+
+    if args.only != "detector":
+        print(f"분류 모델 INT8 저장: {quantize_classifier(args.classifier, calib_paths, args.mode)}")
+    if args.only != "classifier":
+        print(f"YOLO 모델 INT8 저장: {quantize_detector(args.detector, calib_paths, args.mode, args.imgsz)}")
+
+
+if __name__ == "__main__":
+    main()
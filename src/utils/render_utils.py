@@ -0,0 +1,77 @@
+import os
+from typing import Dict, List
+
+import cv2
+import numpy as np
+from PIL import Image
+
+try:
+    # libjpeg-turbo SIMD 인코더 (선택 설치: pip install simplejpeg) - 없으면 OpenCV로 인코딩
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# 결과 이미지 JPEG 설정
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", "80"))
+JPEG_SUBSAMPLING = os.getenv("JPEG_SUBSAMPLING", "420")  # 444 | 422 | 420
+
+_CV2_SUBSAMPLING = {
+    "444": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444,
+    "422": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422,
+    "420": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+}
+if JPEG_SUBSAMPLING not in _CV2_SUBSAMPLING:
+    raise ValueError(f"지원하지 않는 JPEG_SUBSAMPLING 입니다: {JPEG_SUBSAMPLING}")
+
+# 위험도별 박스 색상 (RGB)
+RISK_COLORS = {
+    "A": (46, 204, 113),
+    "B": (243, 156, 18),
+    "C": (231, 76, 60),
+}
+DEFAULT_COLOR = (149, 165, 166)
+
+
+def encode_jpeg(array: np.ndarray, bgr: bool = False, quality: int = JPEG_QUALITY,
+                subsampling: str = JPEG_SUBSAMPLING) -> bytes:
+    # (H, W, 3) uint8 배열을 JPEG 바이트로 인코딩 (PIL Image/BytesIO 변환 없이 한 번에)
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(np.ascontiguousarray(array), quality=quality,
+                                      colorspace="BGR" if bgr else "RGB", colorsubsampling=subsampling)
+    if not bgr:
+        array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+    ok, encoded = cv2.imencode(".jpg", array, [cv2.IMWRITE_JPEG_QUALITY, quality,
+                                               cv2.IMWRITE_JPEG_SAMPLING_FACTOR, _CV2_SUBSAMPLING[subsampling]])
+    if not ok:
+        raise RuntimeError("JPEG 인코딩에 실패했습니다.")
+    return encoded.tobytes()
+
+
+def render_boxes(image: Image.Image, predictions: List[Dict], scale=(1.0, 1.0),
+                 quality: int = JPEG_QUALITY, subsampling: str = JPEG_SUBSAMPLING) -> bytes:
+    """응답에 포함된(필터링된) 검출만 위험도 색상의 박스로 그려 JPEG으로 반환한다.
+
+    predictions는 원본 해상도 좌표이므로 scale(원본/디코딩 배율)로 나눠 디코딩된 이미지에 그린다.
+    """
+    # simplejpeg는 RGB를 그대로 인코딩하고, OpenCV는 BGR로 변환하는 복사에 그림을 그림 (복사는 한 번만)
+    bgr = simplejpeg is None
+    canvas = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR) if bgr else np.array(image)
+    sx, sy = scale
+    thickness = max(2, round(max(canvas.shape[:2]) / 400))
+    font_scale = thickness / 4
+    for item in predictions:
+        color = RISK_COLORS.get(item["risk_level"], DEFAULT_COLOR)
+        if bgr:
+            color = color[::-1]
+        x0, y0 = int(item["x"] / sx), int(item["y"] / sy)
+        x1, y1 = int((item["x"] + item["width"]) / sx), int((item["y"] + item["height"]) / sy)
+        cv2.rectangle(canvas, (x0, y0), (x1, y1), color, thickness)
+
+        # 라벨은 ASCII만 그릴 수 있어 클래스 id / 위험도 / 신뢰도로 표시
+        label = f"{item['class_id']} {item['risk_level']} {item['confidence']:.2f}"
+        (tw, th), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)
+        ty = max(y0, th + baseline)
+        cv2.rectangle(canvas, (x0, ty - th - baseline), (x0 + tw, ty), color, cv2.FILLED)
+        cv2.putText(canvas, label, (x0, ty - baseline), cv2.FONT_HERSHEY_SIMPLEX, font_scale,
+                    (255, 255, 255), 1, cv2.LINE_AA)
+    return encode_jpeg(canvas, bgr=bgr, quality=quality, subsampling=subsampling)
@@ -1,67 +1,166 @@
-from shapely.geometry import Polygon
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 PIXEL_TO_CM = 0.26
 PIXEL_TO_M = PIXEL_TO_CM / 100
 
+# 균열류 (거북등, 종방향, 횡방향): 마스크가 있으면 골격 길이를 길이로, 면적/길이를 평균 폭으로 사용
+CRACK_CLASSES = {1, 8, 12}
+
+RISK_RULES_PATH = os.getenv("RISK_RULES_PATH", os.path.join(os.path.dirname(__file__), "risk_rules.json"))
+
+UNKNOWN_RISK = "정보 부족"
+METRICS = ("width_cm", "length_cm", "area_m2")
+# 이름 기반 classify_risk의 입력 (requires에 쓸 수 있는 이름)
+INPUTS = METRICS + ("count",)
+
 def polygon_area(polygon_coords):
-    poly = Polygon(polygon_coords)
-    area_pixels = poly.area
+    # 신발끈(shoelace) 공식 - shapely Polygon 생성 없이 NumPy로 계산
+    coords = np.asarray(polygon_coords, dtype=np.float64)
+    x, y = coords[:, 0], coords[:, 1]
+    area_pixels = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
     return area_pixels * (PIXEL_TO_M ** 2)
 
+def measure_detections(detections: List[Dict]) -> Dict[str, np.ndarray]:
+    """검출 결과 리스트에서 class_id / width_cm / length_cm / area_m2 / from_mask 배열을 만든다.
+
+    마스크 정보(mask_area_px, mask_length_px)가 있으면 실제 면적과 골격 길이, 없으면 bbox 기준.
+    """
+    n = len(detections)
+    class_ids = np.fromiter((d["class"] for d in detections), dtype=np.int64, count=n)
+    wh = np.array([d["bbox"][2:4] for d in detections], dtype=np.float64).reshape(n, 2)
+    width = wh[:, 0] * PIXEL_TO_CM
+    length = wh[:, 1] * PIXEL_TO_CM
+    area = wh[:, 0] * wh[:, 1] * (PIXEL_TO_M ** 2)
+
+    from_mask = np.fromiter(("mask_area_px" in d for d in detections), dtype=bool, count=n)
+    if from_mask.any():
+        area_px = np.array([d.get("mask_area_px", 0.0) for d in detections], dtype=np.float64)
+        length_px = np.array([d.get("mask_length_px", 0.0) for d in detections], dtype=np.float64)
+        area = np.where(from_mask, area_px * (PIXEL_TO_M ** 2), area)
+        crack = from_mask & np.isin(class_ids, list(CRACK_CLASSES)) & (length_px > 0)
+        safe_length = np.where(crack, length_px, 1.0)
+        width = np.where(crack, area_px / safe_length * PIXEL_TO_CM, width)
+        length = np.where(crack, length_px * PIXEL_TO_CM, length)
+
+    return {"class_id": class_ids, "width_cm": width, "length_cm": length, "area_m2": area,
+            "from_mask": from_mask}
+
+
+class RiskEngine:
+    """class id를 키로 하는 규칙 테이블(risk_rules.json)로 위험도를 계산한다.
+
+    규칙은 생성 시 (클래스 수 x 최대 구간 수) 배열로 펼쳐 두고, 이미지(또는 배치)의 모든
+    검출을 클래스별 분기 없이 한 번의 NumPy 연산으로 평가한다.
+    """
+
+    def __init__(self, rules: Dict):
+        table = {int(k): v for k, v in rules["rules"].items()}
+        self.labels: List[str] = [UNKNOWN_RISK]
+        for rule in table.values():
+            for level in rule["levels"]:
+                if level not in self.labels:
+                    self.labels.append(level)
+        label_index = {label: i for i, label in enumerate(self.labels)}
+
+        size = max(table) + 1 if table else 1
+        max_bins = max((len(r["thresholds"]) for r in table.values()), default=0)
+        self.metric = np.full(size, -1, dtype=np.int64)            # -1: 측정값 불필요
+        self.thresholds = np.full((size, max(max_bins, 1)), np.inf)  # 미사용 구간은 +inf
+        self.levels = np.zeros((size, max_bins + 1), dtype=np.int64)  # 0: 정보 부족
+        self.max_count = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        self.last_level = np.zeros(size, dtype=np.int64)
+        self.names: Dict[str, int] = {}
+        self.requires: Dict[int, tuple] = {}
+        for class_id, rule in table.items():
+            if rule["metric"] is not None:
+                self.metric[class_id] = METRICS.index(rule["metric"])
+            self.thresholds[class_id, :len(rule["thresholds"])] = rule["thresholds"]
+            codes = [label_index[level] for level in rule["levels"]]
+            self.levels[class_id, :len(codes)] = codes
+            self.last_level[class_id] = len(codes) - 1
+            if "max_count" in rule:
+                self.max_count[class_id] = rule["max_count"]
+            self.names[rule["name"]] = class_id
+            requires = tuple(rule.get("requires", [rule["metric"]] if rule["metric"] is not None else []))
+            unknown = set(requires) - set(INPUTS)
+            if unknown:
+                raise ValueError(f"알 수 없는 requires 입력입니다 (class {class_id}): {sorted(unknown)}")
+            self.requires[class_id] = requires
+        self.names.update({name: int(class_id) for name, class_id in rules.get("aliases", {}).items()})
+
+    @classmethod
+    def from_file(cls, path: str = RISK_RULES_PATH) -> "RiskEngine":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def classify(self, class_ids: np.ndarray, width_cm: np.ndarray, length_cm: np.ndarray,
+                 area_m2: np.ndarray, image_index: Optional[np.ndarray] = None,
+                 counts: Optional[np.ndarray] = None) -> np.ndarray:
+        """검출별 위험도 코드(self.labels의 인덱스) 배열을 반환한다.
+
+        counts를 주지 않으면 같은 이미지(image_index) 안의 같은 클래스 검출 수를 계산해 사용한다.
+        """
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        n = len(class_ids)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        known = (class_ids >= 0) & (class_ids < len(self.metric))
+        cls = np.where(known, class_ids, 0)
+
+        if counts is None:
+            image_index = np.zeros(n, dtype=np.int64) if image_index is None else np.asarray(image_index)
+            keys = image_index * len(self.metric) + cls
+            _, inverse, key_counts = np.unique(keys, return_inverse=True, return_counts=True)
+            counts = key_counts[inverse]
+
+        values = np.stack([width_cm, length_cm, area_m2]).astype(np.float64)
+        metric = self.metric[cls]
+        value = values[np.maximum(metric, 0), np.arange(n)]
+        level_idx = np.where(metric >= 0, (value[:, None] >= self.thresholds[cls]).sum(axis=1), 0)
+        level_idx = np.minimum(level_idx, self.last_level[cls])
+        level_idx = np.where(np.asarray(counts) > self.max_count[cls], self.last_level[cls], level_idx)
+        return np.where(known, self.levels[cls, level_idx], 0)
+
+    def classify_labels(self, *args, **kwargs) -> List[str]:
+        return [self.labels[code] for code in self.classify(*args, **kwargs)]
+
+
+_engine: Optional[RiskEngine] = None
+
+def get_risk_engine() -> RiskEngine:
+    global _engine
+    if _engine is None:
+        _engine = RiskEngine.from_file()
+    return _engine
+
+def classify_image_risks(detections: List[Dict]):
+    # 한 이미지의 모든 검출을 한 번에 측정/분류 -> (측정값 배열 dict, 위험도 리스트, 이미지 종합 위험도)
+    measurements = measure_detections(detections)
+    risks = get_risk_engine().classify_labels(
+        measurements["class_id"], measurements["width_cm"], measurements["length_cm"], measurements["area_m2"])
+    return measurements, risks, summarize_image_risk(risks)
+
 def classify_risk(damage_type, area=None, length=None, width=None, count=None):
-    if damage_type == "종방향":
-        if count is not None and count <= 2 and length < 50:
-            return "A"
-        else:
-            return "B"
-    elif damage_type == "횡방향":
-        if count is not None and length is not None:
-            if count <= 2 and length < 20:
-                return "A"
-            else:
-                return "B"
-    elif damage_type == "거북등":
-        if area is not None:
-            if area < 0.1:
-                return "A"
-            else:
-                return "B"
-    elif damage_type == "불량 보수":
-        if area is not None:
-            if area < 0.1:
-                return "A"
-            else:
-                return "B"
-    elif damage_type == "포트홀":
-        if width is not None:
-            if width < 15:
-                return "A"
-            elif width < 30:
-                return "B"
-            else:
-                return "C"
-    elif damage_type == "젖은 도로":
-        if area is not None:
-            return "C"
-    elif damage_type == "쓰레기":
-        if width is not None:
-            if width < 10:
-                return "A"
-            elif width < 30:
-                return "B"
-            else:
-                return "C"
-    elif damage_type == "Others":
-        if area is not None:
-            return "A"
-    elif damage_type == "차선 손상":
-        if area is not None:
-            return "A"
-    elif damage_type == "차선":
-        return "-"
-    return "정보 부족"
-
-def summarize_image_risk(risks):
+    # 단일 검출용 호환 함수: 클래스 이름(DAMAGE_CLASSES 또는 coco.yaml 이름)으로 규칙 조회
+    # 규칙의 requires 입력이 없으면 기존처럼 "정보 부족", 그 외에 count를 모르면 개수 조건은 충족하지 못한 것으로 봄
+    engine = get_risk_engine()
+    class_id = engine.names.get(damage_type)
+    if class_id is None:
+        return UNKNOWN_RISK
+    provided = {"width_cm": width, "length_cm": length, "area_m2": area, "count": count}
+    if any(provided[name] is None for name in engine.requires[class_id]):
+        return UNKNOWN_RISK
+    counts = np.array([np.iinfo(np.int64).max if count is None else count])
+    return engine.classify_labels(
+        np.array([class_id]),
+        np.array([width or 0.0]), np.array([length or 0.0]), np.array([area or 0.0]),
+        counts=counts)[0]
+
+def summarize_image_risk(risks: Sequence[str]):
     count = len(risks)
     has_c = 'C' in risks
     has_b = 'B' in risks
@@ -70,4 +169,4 @@ def summarize_image_risk(risks):
     elif has_b or count >= 2:
         return 'B'
     else:
-        return 'A' 
\ No newline at end of file
+        return 'A'
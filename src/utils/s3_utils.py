@@ -1,9 +1,12 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
+import io
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 from dotenv import load_dotenv
+from src.utils.executor_utils import IO_WORKERS
 import uuid
 import logging
 
@@ -13,13 +16,52 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# S3 클라이언트 설정
+# - 커넥션 풀은 업로드를 실행하는 IO 스레드 수 이상이어야 "Connection pool is full" 경고 없이 재사용됨
+# - adaptive 재시도: 지수 백오프 + 스로틀링(503 SlowDown) 시 클라이언트 측 전송 속도 조절
+# - S3_ENDPOINT_URL: MinIO 등 S3 호환 엔드포인트 (예: python -m src.bench.s3_stand_in 으로 띄운 로컬 스텁)
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", str(IO_WORKERS)))
+S3_RETRY_MODE = os.getenv("S3_RETRY_MODE", "adaptive")  # legacy | standard | adaptive
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "3"))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", "10"))
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "")
+
+# 이 크기 이상이면 멀티파트로 나눠 병렬 업로드 (일반적인 사진은 한 번의 PUT이 더 빠름)
+S3_MULTIPART_THRESHOLD = int(float(os.getenv("S3_MULTIPART_THRESHOLD_MB", "16")) * 2**20)
+S3_MULTIPART_CHUNKSIZE = int(float(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "8")) * 2**20)
+S3_MULTIPART_CONCURRENCY = int(os.getenv("S3_MULTIPART_CONCURRENCY", "4"))
+
+# (매직 바이트, Content-Type, 확장자)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"GIF87a", "image/gif", "gif"),
+    (b"GIF89a", "image/gif", "gif"),
+    (b"BM", "image/bmp", "bmp"),
+    (b"II*\x00", "image/tiff", "tiff"),
+    (b"MM\x00*", "image/tiff", "tiff"),
+)
+DEFAULT_CONTENT_TYPE = ("application/octet-stream", "bin")
+
+
+def detect_content_type(data: bytes) -> Tuple[str, str]:
+    # 실제 인코딩된 형식의 (Content-Type, 확장자) - 파일 이름이나 클라이언트가 보낸 값은 신뢰하지 않음
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    for signature, content_type, ext in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return content_type, ext
+    return DEFAULT_CONTENT_TYPE
+
 def make_filename(prefix: str, ext: str = "jpg") -> str:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     uid = str(uuid.uuid4())[:8]
     return f"{prefix}/{timestamp}_{uid}.{ext}"
 
 class S3Uploader:
-    def __init__(self):
+    def __init__(self, endpoint_url: str = S3_ENDPOINT_URL,
+                 max_pool_connections: int = S3_MAX_POOL_CONNECTIONS):
         logger.info("S3Uploader 초기화 시작")
         self.aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID')
         self.aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY')
@@ -29,42 +71,72 @@ class S3Uploader:
         logger.info(f"Loaded AWS_ACCESS_KEY_ID: {self.aws_access_key_id[:5]}...")
         logger.info(f"Loaded AWS_REGION: {self.aws_region}")
         logger.info(f"Loaded S3_BUCKET_NAME: {self.bucket_name}")
+        self.endpoint_url = endpoint_url.rstrip("/") or None
 
         if not self.aws_access_key_id or not self.aws_secret_access_key or not self.aws_region or not self.bucket_name:
             logger.error("필수 AWS 환경 변수가 설정되지 않았습니다.")
             raise ValueError("AWS 환경 변수(ACCESS_KEY_ID, SECRET_ACCESS_KEY, REGION, BUCKET_NAME)를 설정해야 합니다.")
 
+        config = Config(
+            max_pool_connections=max_pool_connections,
+            retries={"mode": S3_RETRY_MODE, "total_max_attempts": S3_MAX_ATTEMPTS},  # 첫 시도 포함
+            connect_timeout=S3_CONNECT_TIMEOUT,
+            read_timeout=S3_READ_TIMEOUT,
+            tcp_keepalive=True,
+            # S3 호환 엔드포인트는 버킷을 호스트명 대신 경로로 지정해야 하는 경우가 많음
+            s3={"addressing_style": "path"} if self.endpoint_url else None,
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=S3_MULTIPART_CONCURRENCY,
+        )
         try:
             self.s3_client = boto3.client(
                 's3',
                 aws_access_key_id=self.aws_access_key_id,
                 aws_secret_access_key=self.aws_secret_access_key,
-                region_name=self.aws_region
+                region_name=self.aws_region,
+                endpoint_url=self.endpoint_url,
+                config=config
             )
-            logger.info("S3 클라이언트 초기화 성공.")
+            logger.info(f"S3 클라이언트 초기화 성공. (max_pool_connections={max_pool_connections}, "
+                        f"retry={S3_RETRY_MODE}/{S3_MAX_ATTEMPTS}, endpoint={self.endpoint_url or 'aws'})")
         except Exception as e:
             logger.error(f"S3 클라이언트 초기화 실패: {str(e)}")
             raise
 
-    def upload_file(self, file_data: bytes, file_name: Optional[str] = None) -> str:
-        logger.info("파일 S3 업로드 시도 중...")
+    def upload_file(self, file_data: bytes, file_name: Optional[str] = None,
+                    content_type: Optional[str] = None) -> str:
+        # 업로드마다 호출되는 경로이므로 성공 로그는 DEBUG 레벨로만 남김 (지연 시간은 /metrics 참고)
+        detected_type, ext = detect_content_type(file_data)
+        content_type = content_type or detected_type
         if file_name is None:
-            file_name = make_filename("website/uploads")
-            logger.info(f"파일 이름 자동 생성: {file_name}")
-        
-        logger.info(f"업로드 대상 버킷: {self.bucket_name}, 키: {file_name}")
-        logger.info(f"파일 데이터 크기: {len(file_data)} bytes")
+            file_name = make_filename("website/uploads", ext)
 
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_name,
-                Body=file_data,
-                ContentType='image/jpeg'
-            )
-            url = f"https://{self.bucket_name}.s3.{self.aws_region}.amazonaws.com/{file_name}"
-            logger.info(f"파일 S3 업로드 성공. URL: {url}")
+            if len(file_data) >= self.transfer_config.multipart_threshold:
+                # 큰 파일은 파트를 나눠 병렬 업로드 (풀의 커넥션을 여러 개 사용)
+                self.s3_client.upload_fileobj(
+                    io.BytesIO(file_data), self.bucket_name, file_name,
+                    ExtraArgs={"ContentType": content_type}, Config=self.transfer_config
+                )
+            else:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=file_name,
+                    Body=file_data,
+                    ContentType=content_type
+                )
+            url = self.url_for(file_name)
+            logger.debug("S3 업로드 성공: %s (%d bytes)", url, len(file_data))
             return url
         except Exception as e:
             logger.error(f"S3 업로드 중 에러 발생: {str(e)}", exc_info=True)
-            raise 
\ No newline at end of file
+            raise
+
+    def url_for(self, file_name: str) -> str:
+        # 업로드 완료 전에도 키만으로 최종 URL을 알 수 있음 (백그라운드 업로드 시 사용)
+        if self.endpoint_url:
+            return f"{self.endpoint_url}/{self.bucket_name}/{file_name}"
+        return f"https://{self.bucket_name}.s3.{self.aws_region}.amazonaws.com/{file_name}"
@@ -0,0 +1,68 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+import torch
+from torchvision.ops import batched_nms
+
+Box = Tuple[int, int, int, int]
+
+
+def validate_tile_config(tile_size: int, overlap: float, max_tiles: int):
+    # 잘못된 값이면 tile_grid의 타일 간격이 0 이하가 되거나 타일 크기를 무한히 키우므로 설정 시점에 거부
+    if tile_size <= 0:
+        raise ValueError(f"TILE_SIZE는 1 이상이어야 합니다: {tile_size}")
+    if not 0 <= overlap < 1:
+        raise ValueError(f"TILE_OVERLAP은 0 이상 1 미만이어야 합니다: {overlap}")
+    if max_tiles < 1:
+        raise ValueError(f"MAX_TILES는 1 이상이어야 합니다: {max_tiles}")
+
+
+def tile_grid(width: int, height: int, tile_size: int, overlap: float, max_tiles: int) -> List[Box]:
+    """이미지를 overlap 비율만큼 겹치는 tile_size 정사각 타일로 나눈 (x0, y0, x1, y1) 목록을 반환한다.
+
+    타일 수가 max_tiles를 넘으면 타일 크기를 키워 한도에 맞추고, 타일 하나로 전체가 덮이면
+    (전체 프레임 추론과 같으므로) 빈 목록을 반환한다.
+    """
+    size = tile_size
+    while True:
+        step = size * (1 - overlap)
+        nx = math.ceil((width - size) / step) + 1 if width > size else 1
+        ny = math.ceil((height - size) / step) + 1 if height > size else 1
+        if nx * ny <= max_tiles:
+            break
+        size = math.ceil(size * 1.25)
+    if nx * ny <= 1:
+        return []
+    # 마지막 타일이 이미지 끝에 맞도록 시작 위치를 균등 배치
+    xs = np.linspace(0, max(width - size, 0), nx).round().astype(int).tolist()
+    ys = np.linspace(0, max(height - size, 0), ny).round().astype(int).tolist()
+    return [(x, y, min(x + size, width), min(y + size, height)) for y in ys for x in xs]
+
+
+def merge_tile_boxes(xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray,
+                     iou_threshold: float = 0.5, containment: float = 0.8) -> np.ndarray:
+    """전체 프레임/타일에서 나온 박스(원본 좌표)를 합쳐 남길 인덱스를 점수 내림차순으로 반환한다.
+
+    1) 클래스별 NMS (torchvision batched_nms)
+    2) 타일 경계에서 잘린 부분 박스는 온전한 박스와 IoU가 낮아 1)에서 남으므로, 같은 클래스의
+       더 높은 점수 박스 안에 면적의 containment 비율 이상이 들어가면 제거 (행렬 연산 한 번)
+    """
+    if len(xyxy) == 0:
+        return np.zeros(0, dtype=np.int64)
+    boxes = torch.from_numpy(np.ascontiguousarray(xyxy, dtype=np.float32))
+    scores = torch.from_numpy(np.ascontiguousarray(conf, dtype=np.float32))
+    classes = torch.from_numpy(np.ascontiguousarray(cls, dtype=np.int64))
+    keep = batched_nms(boxes, scores, classes, iou_threshold)
+
+    kept, kept_cls = boxes[keep], classes[keep]
+    lt = torch.maximum(kept[:, None, :2], kept[None, :, :2])
+    rb = torch.minimum(kept[:, None, 2:], kept[None, :, 2:])
+    inter = (rb - lt).clamp(min=0).prod(dim=2)
+    area = (kept[:, 2:] - kept[:, :2]).prod(dim=1).clamp(min=1e-9)
+    # inside[j, i]: 박스 j 면적 중 박스 i와 겹치는 비율 (keep은 점수 내림차순이므로 i < j면 i가 더 높은 점수)
+    inside = inter / area[:, None]
+    order = torch.arange(len(keep))
+    suppressed = ((inside > containment) & (kept_cls[:, None] == kept_cls[None, :])
+                  & (order[None, :] < order[:, None])).any(dim=1)
+    return keep[~suppressed].numpy()
@@ -0,0 +1,121 @@
+# 낮/밤 헤드(DayNightHead) 증류 학습: 기존 ResNet18 분류 모델의 확률을 YOLO 백본 특징 위의 헤드로 옮김
+# 실행: python -m src.utils.train_day_night_head --output src/models/day_night_head.pth
+# 이후 DAY_NIGHT_SOURCE=detector_head 로 서빙하면 분류 모델을 로드/실행하지 않음
+import argparse
+import os
+from typing import List, Tuple
+
+import torch
+import torch.nn.functional as F
+
+from src.core.DayNightHead import DayNightHead, feature_layer
+from src.core.InferenceBackend import load_classifier, load_detector
+from src.core.Preprocessor import Preprocessor
+from src.utils.eval_utils import list_images
+from src.utils.evaluate_quantization import load_day_night_labels
+from src.utils.image_utils import load_image
+
+MODEL_DIR = os.path.join("src", "models")
+DAY_NIGHT = ("day", "night")
+
+
+def extract(paths: List[str], classifier, detector, batch_size: int) -> Tuple[torch.Tensor, torch.Tensor]:
+    # 서빙과 같은 디코딩(load_image) / 같은 YOLO 호출로 백본 특징을 얻고, 같은 이미지에 대한 교사 확률을 함께 계산
+    preprocess = Preprocessor(size=224)
+    captured = []
+    handle = feature_layer(detector).register_forward_hook(
+        lambda module, inputs, output: captured.append(output.detach().float().mean(dim=(2, 3))))
+    features, teacher = [], []
+    try:
+        for start in range(0, len(paths), batch_size):
+            images = []
+            for path in paths[start:start + batch_size]:
+                with open(path, "rb") as f:
+                    images.append(load_image(f.read())[0])
+            captured.clear()
+            detector(images, verbose=False)
+            features.append(torch.cat(captured)[-len(images):])
+            with torch.no_grad():
+                teacher.append(torch.softmax(classifier(preprocess(images)), dim=1))
+    finally:
+        handle.remove()
+    return torch.cat(features), torch.cat(teacher)
+
+
+def train(head: DayNightHead, features: torch.Tensor, teacher: torch.Tensor, labels: torch.Tensor,
+          epochs: int, lr: float, temperature: float, alpha: float):
+    # 특징은 미리 추출해 두었으므로 헤드(MLP)만 전체 배치로 학습
+    optimizer = torch.optim.AdamW(head.parameters(), lr=lr, weight_decay=1e-4)
+    soft_targets = torch.softmax(torch.log(teacher.clamp(min=1e-6)) / temperature, dim=1)
+    has_label = labels >= 0
+    head.train()
+    for epoch in range(epochs):
+        logits = head(features)
+        loss = F.kl_div(F.log_softmax(logits / temperature, dim=1), soft_targets,
+                        reduction="batchmean") * temperature ** 2
+        if alpha > 0 and has_label.any():
+            loss = (1 - alpha) * loss + alpha * F.cross_entropy(logits[has_label], labels[has_label])
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+        if (epoch + 1) % max(epochs // 5, 1) == 0:
+            print(f"epoch {epoch + 1:>4}  loss={loss.item():.4f}")
+    head.eval()
+
+
+def report(name: str, head: DayNightHead, features: torch.Tensor, teacher: torch.Tensor, labels: torch.Tensor):
+    with torch.no_grad():
+        predicted = head(features).argmax(dim=1)
+    line = f"{name:<6} images={len(features):>4}  teacher agreement={(predicted == teacher.argmax(dim=1)).float().mean():.3f}"
+    has_label = labels >= 0
+    if has_label.any():
+        line += (f"  accuracy={(predicted[has_label] == labels[has_label]).float().mean():.3f}"
+                 f"  teacher accuracy={(teacher.argmax(dim=1)[has_label] == labels[has_label]).float().mean():.3f}")
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO 특징 기반 낮/밤 헤드 증류 학습")
+    parser.add_argument("--classifier", default=os.path.join(MODEL_DIR, "night_day_model.pth"))
+    parser.add_argument("--detector", default=os.path.join(MODEL_DIR, "yolo_best.pt"))
+    parser.add_argument("--train-images", default=os.path.join("dataset", "images", "train"))
+    parser.add_argument("--val-images", default=os.path.join("dataset", "images", "val"))
+    parser.add_argument("--day-night-labels", help="filename,day|night CSV (선택, 있으면 정답 라벨도 함께 학습)")
+    parser.add_argument("--hidden", type=int, default=128)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.5, help="정답 라벨 cross-entropy 가중치")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output", default=os.path.join(MODEL_DIR, "day_night_head.pth"))
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    device = torch.device("cpu")
+    classifier = load_classifier(args.classifier, "torch", device)
+    detector = load_detector(args.detector, "torch")
+    label_map = load_day_night_labels(args.day_night_labels) or {}
+
+    splits = {}
+    for name, image_dir in (("train", args.train_images), ("val", args.val_images)):
+        paths = list_images(image_dir)
+        features, teacher = extract(paths, classifier, detector, args.batch_size)
+        labels = torch.tensor([DAY_NIGHT.index(label_map[os.path.basename(p)])
+                               if label_map.get(os.path.basename(p)) in DAY_NIGHT else -1 for p in paths])
+        splits[name] = (features, teacher, labels)
+        night = int((teacher.argmax(dim=1) == 1).sum())
+        print(f"{name}: {len(paths)} images (teacher: day={len(paths) - night}, night={night})")
+
+    features, teacher, labels = splits["train"]
+    head = DayNightHead(features.shape[1], args.hidden)
+    train(head, features, teacher, labels, args.epochs, args.lr, args.temperature, args.alpha)
+    for name, split in splits.items():
+        report(name, head, *split)
+
+    torch.save(head.state(), args.output)
+    print(f"saved: {args.output} ({sum(p.numel() for p in head.parameters()):,} params, "
+          f"{os.path.getsize(args.output) / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    main()
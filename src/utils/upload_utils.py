@@ -0,0 +1,74 @@
+import json
+from typing import Dict
+
+# ASGI 미들웨어: 요청 본문 크기 제한
+# Content-Length가 한도를 넘으면 본문을 읽지 않고 바로 413, 헤더가 없거나(chunked) 거짓이면
+# 수신 중 누적 바이트가 한도를 넘는 순간 읽기를 멈추고 413을 반환한다.
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app, limits: Dict[str, int]):
+        # limits: 경로 -> 최대 바이트
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started, rejected
+            if exceeded and not response_started:
+                # 본문 파싱 실패로 만들어진 응답(FastAPI는 400으로 변환) 대신 413을 보냄
+                if not rejected:
+                    rejected = True
+                    await self._reject(send, limit)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except BodyTooLarge:
+            if response_started:
+                raise
+            if not rejected:
+                await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit: int):
+        body = json.dumps({"detail": f"업로드 크기가 허용 한도({limit // 2**20}MB)를 초과했습니다."},
+                          ensure_ascii=False).encode()
+        await send({"type": "http.response.start", "status": 413,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                                (b"connection", b"close")]})
+        await send({"type": "http.response.body", "body": body})
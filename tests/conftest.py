@@ -0,0 +1,70 @@
+import io
+import os
+
+# src.main / s3_utils는 import 시점에 환경 변수를 읽으므로 먼저 설정
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "AKIATESTKEY")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("S3_BUCKET_NAME", "test-bucket")
+os.environ.setdefault("MODEL_LOAD_MODE", "startup")
+os.environ.setdefault("METRICS_ENABLED", "0")
+os.environ.setdefault("YOLO_CONFIG_DIR", "/tmp")
+
+import pytest
+import torch
+from PIL import Image
+
+from src.bench.in_memory_s3 import InMemoryS3
+
+
+class EmptyResult:
+    # 검출이 없는 ultralytics Results 대역
+    boxes = None
+    masks = None
+
+    def __init__(self, image):
+        self.orig_shape = (image.height, image.width)
+
+
+class CountingDetector:
+    # YOLO 대신 호출 횟수와 호출별 입력 이미지 수만 기록 (on_call: 추론 중 시점에 실행할 검사)
+    # result_type: 이미지마다 만들 Results 대역 (기본은 검출 없음)
+    def __init__(self):
+        self.on_call = None
+        self.calls = []
+        self.result_type = EmptyResult
+
+    def __call__(self, images, verbose=False):
+        self.calls.append(len(images))
+        if self.on_call is not None:
+            self.on_call()
+        return [self.result_type(image) for image in images]
+
+
+def make_classifier() -> torch.nn.Module:
+    return torch.nn.Sequential(torch.nn.AdaptiveAvgPool2d(1), torch.nn.Flatten(), torch.nn.Linear(3, 2)).eval()
+
+
+def make_image_bytes(color=(128, 128, 128), size=(64, 48)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def detector():
+    return CountingDetector()
+
+
+@pytest.fixture
+def client(monkeypatch, detector):
+    from fastapi.testclient import TestClient
+
+    import src.main as main
+    from src.core.ModelWrapper import ModelWrapper
+
+    monkeypatch.setattr(ModelWrapper, "_load_models",
+                        lambda self, paths, parallel=True: [make_classifier(), detector])
+    with TestClient(main.app) as test_client:
+        main.app.state.s3_uploader.s3_client = InMemoryS3()
+        yield test_client
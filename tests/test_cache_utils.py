@@ -0,0 +1,206 @@
+import asyncio
+import json
+
+import pytest
+
+import src.utils.cache_utils as cache_utils
+from src.utils.cache_utils import PendingResult, RedisCacheBackend, ResultCache, SQLiteCacheBackend
+
+
+class FakeClock:
+    # cache_utils의 time 모듈 대역 - 이벤트 루프 시계는 건드리지 않고 캐시 만료 시각만 조절
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+class FakeRedis:
+    # redis-py처럼 bytes를 돌려주는 get/set(ex=) 인메모리 대역
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return value.encode("utf-8") if value is not None else None
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.expiry[key] = ex
+
+
+def test_follower_survives_cancelled_leader():
+    async def scenario():
+        cache = ResultCache(max_entries=8)
+        started, release = asyncio.Event(), asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await release.wait()
+            return {"value": 1}
+
+        leader = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await started.wait()
+        follower = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == {"value": 1}
+        assert leader.cancelled()
+        assert calls == 1
+        assert cache.inflight_hits == 1
+        # 취소된 요청의 계산 결과도 캐시에 저장됨
+        assert await cache.get_or_compute("key", compute) == {"value": 1}
+        assert cache.hits == 1
+
+    asyncio.run(scenario())
+
+
+def test_follower_receives_leader_exception():
+    async def scenario():
+        cache = ResultCache(max_entries=8)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            raise ValueError("boom")
+
+        leader = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        release.set()
+
+        for request in (leader, follower):
+            with pytest.raises(ValueError):
+                await request
+        assert cache._inflight == {}
+
+    asyncio.run(scenario())
+
+
+def test_pending_result_stored_only_when_ready():
+    async def scenario():
+        cache = ResultCache(max_entries=8)
+
+        async def upload(ok):
+            if not ok:
+                raise ConnectionError("upload failed")
+            return True
+
+        for key, ok in (("failed", False), ("done", True)):
+            value = {"url": key}
+            assert await cache.get_or_compute(key, lambda: _pending(value, upload(ok))) == value
+        await cache.wait_pending()
+
+        assert await cache.get("failed") is None
+        assert await cache.get("done") == {"url": "done"}
+
+    asyncio.run(scenario())
+
+
+async def _pending(value, ready):
+    return PendingResult(value, asyncio.ensure_future(ready))
+
+
+def test_sqlite_backend_purges_expired_rows(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), purge_interval=0)
+    backend.set("old-1", "{}", ttl=-1)
+    backend.set("old-2", "{}", ttl=-1)
+    backend.set("fresh", "{}", ttl=60)
+
+    # 만료된 행은 다시 조회하지 않아도 다음 저장 시 삭제됨
+    rows = [key for (key,) in backend._conn.execute("SELECT key FROM results ORDER BY key")]
+    assert rows == ["fresh"]
+    assert backend.get("fresh") == "{}"
+
+
+def test_memory_cap_counts_utf8_bytes():
+    async def scenario():
+        value = {"overall_risk": "위험", "day_or_night": "야간"}
+        raw = json.dumps(value, ensure_ascii=False)
+        size = len(raw.encode("utf-8"))
+        assert size > len(raw)
+
+        # 문자 수로는 상한 안에 들어가지만 실제 바이트 수는 상한을 넘는 값은 저장되지 않아야 함
+        cache = ResultCache(max_entries=8, max_bytes=size - 1)
+        await cache.set("over", value)
+        assert await cache.get("over") is None
+        assert cache.stats()["bytes"] == 0
+
+        cache = ResultCache(max_entries=8, max_bytes=size)
+        await cache.set("fits", value)
+        assert await cache.get("fits") == value
+        assert cache.stats()["bytes"] == size
+
+    asyncio.run(scenario())
+
+
+def test_lru_evicts_least_recently_used_entry():
+    async def scenario():
+        cache = ResultCache(max_entries=2)
+        await cache.set("a", {"v": "a"})
+        await cache.set("b", {"v": "b"})
+        # a를 조회해 가장 최근 항목으로 만들면 다음 저장 시 b가 밀려남
+        assert await cache.get("a") == {"v": "a"}
+        await cache.set("c", {"v": "c"})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"v": "a"}
+        assert await cache.get("c") == {"v": "c"}
+        assert cache.evictions == 1
+
+    asyncio.run(scenario())
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_utils, "time", clock)
+
+    async def scenario():
+        cache = ResultCache(max_entries=8, ttl_seconds=60)
+        await cache.set("key", {"v": 1})
+        before = cache.stats()["bytes"]
+
+        clock.now += 59
+        assert await cache.get("key") == {"v": 1}
+        clock.now += 2
+        assert await cache.get("key") is None
+        # 만료된 항목은 조회 시 제거되어 메모리 사용량에서도 빠짐
+        assert before > 0
+        assert (cache.stats()["entries"], cache.stats()["bytes"]) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_redis_tier_refills_memory_cache():
+    client = FakeRedis()
+    value = {"overall_risk": "위험", "predictions": []}
+
+    async def scenario():
+        writer = ResultCache(max_entries=8, ttl_seconds=120, backend=RedisCacheBackend(client=client))
+        await writer.set("key", value)
+        assert client.expiry == {"predict:key": 120}
+
+        # 다른 워커(메모리 계층이 빈 캐시)도 Redis 계층에서 결과를 받고 메모리 계층에 채움
+        reader = ResultCache(max_entries=8, backend=RedisCacheBackend(client=client))
+        assert await reader.get_or_compute("key", _unexpected_compute) == value
+        assert reader.hits == 1
+        assert reader.stats()["entries"] == 1
+        assert await reader.get("missing") is None
+
+    asyncio.run(scenario())
+
+
+async def _unexpected_compute():
+    raise AssertionError("Redis 계층에 있는 결과를 다시 계산함")
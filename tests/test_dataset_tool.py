@@ -0,0 +1,77 @@
+import os
+import stat
+
+from src.utils.dataset_tool import Manifest, atomic_write, file_digest, rasterize_mask
+
+
+def mode_of(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_new_file_follows_umask(tmp_path):
+    previous = os.umask(0o022)
+    try:
+        atomic_write(str(tmp_path / "labels.txt"), b"0 0.5 0.5\n")
+    finally:
+        os.umask(previous)
+    assert (tmp_path / "labels.txt").read_bytes() == b"0 0.5 0.5\n"
+    assert mode_of(tmp_path / "labels.txt") == 0o644
+
+
+def test_atomic_write_keeps_existing_mode(tmp_path):
+    path = tmp_path / "labels.txt"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    atomic_write(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert mode_of(path) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["labels.txt"]
+
+
+def touch_later(path):
+    # 내용은 그대로 두고 mtime만 바꿈
+    stats = os.stat(path)
+    os.utime(path, ns=(stats.st_atime_ns, stats.st_mtime_ns + 10**9))
+
+
+def test_manifest_rechecks_only_touched_files_by_hash(tmp_path, monkeypatch):
+    import src.utils.dataset_tool as dataset_tool
+
+    label, image = tmp_path / "a.txt", tmp_path / "a.jpg"
+    label.write_bytes(b"1 0.1 0.1 0.5 0.5 0.1 0.5\n")
+    image.write_bytes(b"jpeg bytes")
+    paths = (str(label), str(image))
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    manifest.record("mask:a", paths, [file_digest(str(label)), None])
+
+    hashed = []
+    monkeypatch.setattr(dataset_tool, "file_digest", lambda p: hashed.append(p) or file_digest(p))
+    assert manifest.is_unchanged("mask:a", paths)
+    assert hashed == []
+
+    # 해시가 기록된 라벨은 touch만 됐으면 그대로로 판단
+    touch_later(label)
+    assert manifest.is_unchanged("mask:a", paths)
+    assert hashed == [str(label)]
+
+    # 해시 없이 추적하는 이미지는 mtime이 바뀌면 다시 처리
+    touch_later(image)
+    assert not manifest.is_unchanged("mask:a", paths)
+    assert hashed == [str(label)]
+
+
+def test_rasterize_mask_does_not_read_whole_image(tmp_path, monkeypatch):
+    import src.utils.dataset_tool as dataset_tool
+
+    label, image, mask = tmp_path / "a.txt", tmp_path / "a.jpg", tmp_path / "a.png"
+    label.write_bytes(b"1 0.1 0.1 0.5 0.1 0.5 0.5\n")
+    image.write_bytes(b"not read")
+    hashed = []
+    monkeypatch.setattr(dataset_tool, "file_digest", lambda p: hashed.append(p) or file_digest(p))
+
+    digests, size = rasterize_mask((str(label), str(image), str(mask), (8, 6)))
+
+    assert hashed == [str(label)]
+    assert digests == [file_digest(str(label)), None]
+    assert size == (8, 6)
+    assert mask.exists()
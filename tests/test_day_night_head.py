@@ -0,0 +1,122 @@
+import threading
+
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+from PIL import Image
+
+from src.core.DayNightHead import DayNightHead, feature_layer
+from tests.conftest import EmptyResult
+
+CHANNELS = 6
+
+
+class StubNet(nn.Module):
+    # ultralytics DetectionModel 대역: model[len(yaml["backbone"]) - 1]이 백본 마지막 레이어
+    yaml = {"backbone": [None, None]}
+
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.model = nn.Sequential(
+            nn.Conv2d(3, 4, 3, stride=2, padding=1),
+            nn.Conv2d(4, CHANNELS, 3, stride=2, padding=1),
+            nn.Conv2d(CHANNELS, 2, 1),
+        )
+
+    def forward(self, x):
+        return self.model(x)
+
+
+def to_batch(images) -> torch.Tensor:
+    return torch.stack([
+        torch.from_numpy(np.array(image.resize((32, 32)), dtype=np.float32)).permute(2, 0, 1) / 255
+        for image in images
+    ])
+
+
+class StubDetector:
+    # 이미지를 32x32로 줄여 한 배치로 백본을 통과시키는 YOLO 대역
+    def __init__(self):
+        self.model = StubNet().eval()
+
+    def __call__(self, images, verbose=False):
+        with torch.no_grad():
+            self.model(to_batch(images))
+        return [EmptyResult(image) for image in images]
+
+
+def expected_features(detector, images):
+    # 백본 마지막 레이어(model[1])까지 직접 실행해 공간 평균
+    with torch.no_grad():
+        return detector.model.model[:2](to_batch(images)).mean(dim=(2, 3))
+
+
+def make_images():
+    # 왼쪽 절반만 밝은 넓은 이미지 (타일과 전체 프레임의 특징이 서로 다름) + 어두운 정사각 이미지
+    wide = np.zeros((100, 200, 3), dtype=np.uint8)
+    wide[:, :100] = 220
+    return [Image.fromarray(wide), Image.new("RGB", (100, 100), (30, 30, 30))]
+
+
+def test_captured_features_match_batch():
+    detector, head = StubDetector(), DayNightHead(CHANNELS)
+    head.attach(detector)
+    images = make_images()
+
+    head.reset()
+    detector(images[:1])  # 워밍업처럼 앞선 forward는 pop_features(n)에서 버려짐
+    detector(images)
+    features = head.pop_features(len(images))
+
+    assert features.shape == (len(images), CHANNELS)
+    assert torch.allclose(features, expected_features(detector, images), atol=1e-6)
+    assert head(features).shape == (len(images), 2)
+
+
+def test_features_are_kept_per_thread():
+    detector, head = StubDetector(), DayNightHead(CHANNELS)
+    head.attach(detector)
+
+    worker = threading.Thread(target=detector, args=(make_images(),))
+    worker.start()
+    worker.join()
+
+    # 다른 스레드의 추론에서 잡힌 특징은 이 스레드에서 보이지 않음
+    with pytest.raises(RuntimeError):
+        head.pop_features()
+
+
+def test_detach_removes_hook():
+    detector, head = StubDetector(), DayNightHead(CHANNELS)
+    head.attach(detector)
+    head.attach(detector)  # 다시 붙여도 hook은 하나
+    assert len(feature_layer(detector)._forward_hooks) == 1
+
+    head.detach()
+    detector(make_images())
+
+    assert len(feature_layer(detector)._forward_hooks) == 0
+    with pytest.raises(RuntimeError):
+        head.pop_features()
+
+
+def test_tiled_mode_uses_only_full_frame_rows(monkeypatch):
+    from src.core.ModelWrapper import ModelWrapper
+
+    detector, head = StubDetector(), DayNightHead(CHANNELS).eval()
+    monkeypatch.setattr(ModelWrapper, "_load_models", lambda self, paths, parallel=True: [head, detector])
+    wrapper = ModelWrapper(["night_day_model.pth", "yolo_best.pt"], tiled=True, tile_size=100, tile_overlap=0.0,
+                           max_tiles=4, day_night_source="detector_head")
+    received = []
+    classify = head.forward
+    monkeypatch.setattr(head, "forward", lambda features: received.append(features) or classify(features))
+    images = make_images()
+
+    results = wrapper.predict_batch(images)
+
+    # YOLO 입력은 [넓은 이미지, 타일 2개, 정사각 이미지] - 헤드에는 전체 프레임 두 행만 들어가야 함
+    assert len(received) == 1
+    assert torch.allclose(received[0], expected_features(detector, images), atol=1e-6)
+    assert [sorted(r["classification"]) for r in results] == [["day", "night"], ["day", "night"]]
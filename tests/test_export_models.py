@@ -0,0 +1,34 @@
+import importlib.util
+
+import pytest
+import torch
+from torchvision.models import resnet18
+
+from src.core.InferenceBackend import load_classifier
+from src.utils.export_models import export_classifier
+
+PROB_TOL = 1e-4
+# ONNX export에는 onnx, 실행에는 onnxruntime이 필요
+HAS_ONNX = all(importlib.util.find_spec(name) is not None for name in ("onnx", "onnxruntime"))
+
+
+@pytest.mark.parametrize("backend", [
+    "torchscript",
+    pytest.param("onnx", marks=pytest.mark.skipif(not HAS_ONNX, reason="onnx / onnxruntime가 설치되지 않음")),
+])
+def test_exported_classifier_matches_eager(tmp_path, backend):
+    torch.manual_seed(0)
+    model_path = str(tmp_path / "night_day_model.pth")
+    torch.save(resnet18(weights=None, num_classes=2).state_dict(), model_path)
+    export_classifier(model_path, [backend], opset=17)
+
+    device = torch.device("cpu")
+    reference = load_classifier(model_path, "torch", device)
+    exported = load_classifier(model_path, backend, device)
+    # 서빙 배치 크기가 요청마다 달라지므로 trace에 쓴 1장 외의 크기도 확인
+    for batch in (1, 3):
+        images = torch.randn(batch, 3, 224, 224)
+        with torch.no_grad():
+            expected = torch.softmax(reference(images), dim=1)
+            actual = torch.softmax(exported(images), dim=1)
+        assert (actual - expected).abs().max().item() <= PROB_TOL
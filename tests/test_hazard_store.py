@@ -0,0 +1,119 @@
+import io
+
+import pytest
+import torch
+from PIL import Image
+
+from src.utils.hazard_store import HazardStore
+from tests.conftest import make_image_bytes
+
+POTHOLE = 11
+
+
+def pothole(risk="B"):
+    return {"class_id": POTHOLE, "risk_level": risk}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HazardStore(str(tmp_path / "hazards.sqlite3"), cell_meters=10)
+
+
+def test_query_returns_only_cells_in_bbox(store):
+    store.add_observation(37.5000, 127.0000, 1.0, [pothole("B")], "B")
+    store.add_observation(37.50001, 127.00001, 2.0, [pothole("C"), {"class_id": 1, "risk_level": "A"}], "C")
+    store.add_observation(37.6000, 127.1000, 3.0, [pothole("A")], "A")
+
+    hazards = store.query(37.49, 126.99, 37.51, 127.01)
+
+    # 같은 격자의 같은 클래스는 한 행으로 합쳐지고 최고 위험도 순으로 정렬됨
+    assert [(h["class_id"], h["count"], h["max_risk"]) for h in hazards] == [(POTHOLE, 2, "C"), (1, 1, "A")]
+    assert hazards[0]["first_seen"] == 1.0 and hazards[0]["last_seen"] == 2.0
+    assert store.query(37.49, 126.99, 37.51, 127.01, class_id=1)[0]["class_id"] == 1
+    assert [h["class_id"] for h in store.query(37.49, 126.99, 37.51, 127.01, min_risk="C")] == [POTHOLE]
+    assert store.query(37.59, 127.09, 37.61, 127.11)[0]["max_risk"] == "A"
+    assert store.query(0, 0, 1, 1) == []
+    assert store.stats() == {"observations": 3, "hazards": 3, "cell_meters": 10.0}
+
+
+def test_observation_on_cell_boundary(store):
+    cell_y, cell_x, (min_lat, max_lat, min_lon, max_lon) = store._cell(37.5, 127.0)
+    lat, lon = min_lat, min_lon  # 격자 모서리에 정확히 놓인 점
+
+    boundary_y, boundary_x, bounds = store._cell(lat, lon)
+    # 경계 위의 점은 인접한 두 격자 중 하나에만 속하고, 그 격자의 범위 안에 있어야 함
+    assert bounds[0] <= lat <= bounds[1] and bounds[2] <= lon <= bounds[3]
+    assert abs(boundary_y - cell_y) <= 1 and abs(boundary_x - cell_x) <= 1
+
+    store.add_observation(lat, lon, 1.0, [pothole()], "B")
+    store.add_observation(lat, lon, 2.0, [pothole()], "B")
+    # 경계의 한 점만 덮는 bbox로도 조회되고, 같은 점의 관측은 한 격자에 누적됨
+    hazards = store.query(lat, lon, lat, lon)
+    assert [(h["count"], h["lat"], h["lon"]) for h in hazards] == [(2, pytest.approx(lat), pytest.approx(lon))]
+
+    # 경계 양쪽으로 격자 크기의 절반씩 떨어진 점은 서로 다른 격자
+    step = store.cell_deg / 2
+    assert store._cell(lat - step, lon)[:2] != store._cell(lat + step, lon)[:2]
+
+
+class Boxes:
+    def __init__(self):
+        self.xyxy = torch.tensor([[4.0, 4.0, 24.0, 20.0]])
+        self.conf = torch.tensor([0.9])
+        self.cls = torch.tensor([float(POTHOLE)])
+
+    def __len__(self):
+        return 1
+
+
+class PotholeResult:
+    masks = None
+
+    def __init__(self, image):
+        self.orig_shape = (image.height, image.width)
+        self.boxes = Boxes()
+
+
+@pytest.fixture
+def geo_client(client, detector, monkeypatch, store):
+    import src.main as main
+
+    detector.result_type = PotholeResult
+    monkeypatch.setattr(main.app.state, "hazard_store", store)
+    return client
+
+
+def make_geotagged_jpeg(lat_dms, lon_dms) -> bytes:
+    exif = Image.Exif()
+    exif[0x8825] = {1: "N", 2: lat_dms, 3: "E", 4: lon_dms}
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (90, 90, 90)).save(buffer, format="JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def test_predict_stores_hazard_from_form_fields(geo_client, store):
+    response = geo_client.post("/predict", files={"file": ("frame.jpg", make_image_bytes(), "image/jpeg")},
+                               data={"latitude": "37.5", "longitude": "127.0", "captured_at": "100"})
+
+    assert response.status_code == 200
+    hazards = geo_client.get("/hazards", params={"min_lat": 37.49, "min_lon": 126.99,
+                                                 "max_lat": 37.51, "max_lon": 127.01}).json()["hazards"]
+    assert [(h["class_id"], h["name"], h["count"], h["last_seen"]) for h in hazards] == [
+        (POTHOLE, "포트홀", 1, 100.0)]
+
+
+def test_predict_stores_hazard_from_exif(geo_client, store):
+    data = make_geotagged_jpeg((37.0, 30.0, 0.0), (127.0, 0.0, 36.0))
+    response = geo_client.post("/predict", files={"file": ("frame.jpg", data, "image/jpeg")})
+
+    assert response.status_code == 200
+    hazards = store.query(37.49, 127.0, 37.51, 127.02)
+    assert [(h["class_id"], h["lat"], h["lon"]) for h in hazards] == [
+        (POTHOLE, pytest.approx(37.5), pytest.approx(127.01))]
+
+
+def test_predict_without_location_stores_nothing(geo_client, store):
+    response = geo_client.post("/predict", files={"file": ("frame.jpg", make_image_bytes(), "image/jpeg")})
+
+    assert response.status_code == 200
+    assert store.stats()["observations"] == 0
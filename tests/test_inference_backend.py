@@ -0,0 +1,31 @@
+import io
+
+import pytest
+from PIL import Image
+
+from src.core.InferenceBackend import run_detector
+from tests.conftest import CountingDetector, make_image_bytes
+
+
+def make_images(count):
+    return [Image.open(io.BytesIO(make_image_bytes((i * 30, 80, 120)))) for i in range(count)]
+
+
+@pytest.mark.parametrize("count, calls", [(1, [4]), (4, [4]), (5, [4, 4]), (9, [4, 4, 4])])
+def test_run_detector_pads_and_splits_to_static_batch(count, calls):
+    detector = CountingDetector()
+
+    results = run_detector(detector, make_images(count), static_batch=4, verbose=False)
+
+    # 고정 배치 모델에는 항상 trace한 크기만큼 넣고, 채운 입력의 결과는 버림
+    assert detector.calls == calls
+    assert len(results) == count
+
+
+def test_run_detector_passes_dynamic_batches_through():
+    detector = CountingDetector()
+
+    results = run_detector(detector, make_images(3), verbose=False)
+
+    assert detector.calls == [3]
+    assert len(results) == 3
@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.utils.label_store import rasterize
+
+
+def make_labels(polygons):
+    # (class_id, [(x, y), ...] 정규화 좌표) 목록 -> rasterize 입력 배열
+    classes = np.array([c for c, _ in polygons], dtype=np.int16)
+    coords = np.concatenate([np.array(points, dtype=np.float32) for _, points in polygons])
+    vertex_offsets = np.cumsum([0] + [len(points) for _, points in polygons])
+    return classes, vertex_offsets, coords
+
+
+def square(x0, y0, x1, y1):
+    return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+
+
+def test_overlapping_same_class_polygons_fill_union():
+    classes, offsets, coords = make_labels([(11, square(0.1, 0.1, 0.6, 0.6)), (11, square(0.4, 0.4, 0.9, 0.9))])
+    mask = rasterize(classes, offsets, coords, 100, 100, [11])
+
+    # 겹친 영역(40~60)도 채워져야 함 (even-odd 규칙이면 비어 있음)
+    assert (mask[42:58, 42:58] == 11).all()
+    assert (mask[12:58, 12:58] == 11).all()
+    assert (mask[42:88, 42:88] == 11).all()
+    assert mask[5, 5] == 0 and mask[20, 80] == 0 and mask[80, 20] == 0
+
+
+def test_later_polygon_overwrites_earlier_class():
+    classes, offsets, coords = make_labels([(1, square(0.1, 0.1, 0.6, 0.6)), (11, square(0.4, 0.4, 0.9, 0.9)),
+                                            (5, square(0.0, 0.0, 0.2, 0.2))])
+    mask = rasterize(classes, offsets, coords, 100, 100, [1, 11])
+
+    assert mask[50, 50] == 11
+    assert mask[30, 30] == 1
+    # 대상이 아닌 클래스(5)는 그리지 않음
+    assert mask[5, 5] == 0
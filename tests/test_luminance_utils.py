@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from src.utils.luminance_utils import DAY, NIGHT, LuminanceGate, calibrate_thresholds, luminance_stats
+
+DARK, AMBIGUOUS, BRIGHT = (15, 15, 15), (120, 120, 120), (235, 235, 235)
+
+
+def make_image(color, size=(320, 240)):
+    return Image.new("RGB", size, color)
+
+
+def make_gate():
+    return LuminanceGate("mean", night_below=60, day_above=180)
+
+
+def test_luminance_stats_of_uniform_images():
+    stats = luminance_stats(make_image(AMBIGUOUS))
+    assert stats["mean"] == pytest.approx(120)
+    assert stats["p10"] == stats["p90"] == 120
+
+
+def test_gate_decides_only_clear_images():
+    gate = make_gate()
+
+    assert gate.decide([make_image(DARK), make_image(BRIGHT), make_image(AMBIGUOUS)]) == [NIGHT, DAY, None]
+    assert gate.stats() == {"day": 1, "night": 1, "fallback": 1, "hit_ratio": round(2 / 3, 4), "statistic": "mean"}
+    # 임계값이 None인 방향으로는 결정하지 않음
+    assert LuminanceGate("p50", None, 180).decide([make_image(DARK)]) == [None]
+
+
+def test_gate_load_round_trip(tmp_path):
+    path = tmp_path / "gate.json"
+    path.write_text(json.dumps(make_gate().to_dict()))
+
+    assert LuminanceGate.load(str(path)).to_dict() == {"statistic": "mean", "night_below": 60, "day_above": 180}
+    with pytest.raises(FileNotFoundError):
+        LuminanceGate.load(str(tmp_path / "missing.json"))
+    with pytest.raises(ValueError):
+        LuminanceGate("median", 60, 180)
+
+
+def test_calibrate_thresholds_keeps_target_agreement():
+    values = np.array([220, 10, 110, 30, 200, 100, 20, 210], dtype=float)
+    night = np.array([0, 1, 1, 1, 0, 0, 1, 0], dtype=bool)
+
+    # 완전 일치: 어두운 쪽은 100(낮)에서, 밝은 쪽은 110(밤)에서 멈춤
+    assert calibrate_thresholds(values, night, 1.0) == (30.0, 200.0)
+    # 80% 일치: 어두운 쪽은 110까지 넓어지고, 그와 겹치는 낮 쪽 임계값은 포기
+    assert calibrate_thresholds(values, night, 0.8) == (110.0, None)
+
+
+def test_calibrate_thresholds_never_splits_ties():
+    values = np.array([50, 50, 200], dtype=float)
+    night = np.array([1, 0, 0], dtype=bool)
+
+    # 같은 값 50은 한꺼번에 결정되므로 밤 50%로는 밤 임계값을 만들 수 없음
+    assert calibrate_thresholds(values, night, 1.0) == (None, 200.0)
+
+
+class MeanClassifier(torch.nn.Module):
+    # 입력 밝기가 높을수록 낮(logit 0) 쪽으로 기우는 분류 모델 대역 - 호출별 배치 크기를 기록
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def forward(self, x):
+        self.calls.append(len(x))
+        return torch.stack([x.mean(dim=(1, 2, 3)), torch.zeros(len(x))], dim=1)
+
+
+def test_classify_runs_cnn_only_for_ambiguous_images_in_order(monkeypatch):
+    from src.core.ModelWrapper import ModelWrapper
+    from tests.conftest import CountingDetector
+
+    classifier = MeanClassifier()
+    monkeypatch.setattr(ModelWrapper, "_load_models",
+                        lambda self, paths, parallel=True: [classifier, CountingDetector()])
+    wrapper = ModelWrapper(["night_day_model.pth", "yolo_best.pt"], day_night_gate=False)
+    wrapper.day_night_gate = make_gate()
+    ambiguous_dark, ambiguous_bright = make_image((90, 90, 90)), make_image((160, 160, 160))
+    images = [make_image(BRIGHT), ambiguous_dark, make_image(DARK), ambiguous_bright]
+
+    with torch.no_grad():
+        probs = wrapper._classify(images)
+        expected = torch.softmax(classifier(wrapper.preprocess([ambiguous_dark, ambiguous_bright])), dim=1).numpy()
+
+    # 애매한 두 장만 한 배치로 CNN을 거치고, 결과는 입력 순서 자리에 다시 들어감
+    assert classifier.calls[0] == 2
+    assert probs[0].tolist() == [1.0, 0.0]
+    assert probs[2].tolist() == [0.0, 1.0]
+    np.testing.assert_allclose(probs[[1, 3]], expected, rtol=1e-6)
+    assert probs[1][0] < probs[3][0]
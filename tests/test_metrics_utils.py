@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+# prometheus_client는 import 시점에 멀티프로세스 모드를 정하므로 별도 프로세스에서 확인
+SCRIPT = """
+import os
+from src.utils import metrics_utils
+
+assert metrics_utils.MULTIPROCESS
+for _ in range(2):
+    pid = os.fork()
+    if pid == 0:
+        metrics_utils.count_error("predict")
+        with metrics_utils.stage_timer("decode"):
+            pass
+        os._exit(0)
+    os.waitpid(pid, 0)
+    metrics_utils.mark_process_dead(pid)
+metrics_utils.count_error("predict")
+metrics_utils.register_stats_collector("road_hazard_batching", lambda: {"batches_total": 5}, counters=("batches_total",))
+print(metrics_utils.render_metrics()[0].decode())
+"""
+
+
+def test_multiprocess_metrics_sum_all_workers(tmp_path):
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "METRICS_ENABLED": "1", "PATH": ""}
+    output = subprocess.run([sys.executable, "-c", SCRIPT], env=env, capture_output=True, text=True,
+                            check=True).stdout
+
+    # 부모 1 + 워커 2의 카운터/히스토그램이 합산됨
+    assert 'road_hazard_errors_total{endpoint="predict"} 3.0' in output
+    assert 'road_hazard_stage_seconds_count{stage="decode"} 2.0' in output
+    # 워커별 stats 지표는 pid 라벨로 구분
+    assert 'road_hazard_batching_batches_total{pid="' in output
@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from tests.conftest import make_image_bytes
+
+
+def test_predict_runs_detector_once(client, detector):
+    response = client.post("/predict", files={"file": ("frame.jpg", make_image_bytes(), "image/jpeg")})
+
+    assert response.status_code == 200
+    assert response.json()["predictions"] == []
+    assert detector.calls == [1]
+
+
+def test_predict_batch_runs_detector_once_per_batch(client, detector):
+    files = [("files", (f"frame{i}.jpg", make_image_bytes((i * 40, 80, 120)), "image/jpeg")) for i in range(3)]
+    response = client.post("/predict_batch", files=files)
+
+    assert response.status_code == 200
+    assert [r["filename"] for r in response.json()["results"]] == ["frame0.jpg", "frame1.jpg", "frame2.jpg"]
+    # 이미지별 호출이 아니라 배치 전체를 한 번에 넣어야 함
+    assert detector.calls == [3]
+
+
+def test_predict_batch_goes_through_scheduler(client, detector):
+    import src.main as main
+
+    scheduler = main.app.state.scheduler
+    batches_before = scheduler.batches_total
+    files = [("files", (f"frame{i}.jpg", make_image_bytes((i * 20, 80, 120)), "image/jpeg"))
+             for i in range(scheduler.max_batch_size + 2)]
+    response = client.post("/predict_batch", files=files)
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == len(files)
+    # max_batch_size 단위로 나뉘어 스케줄러 워커에서만 실행됨
+    assert detector.calls == [scheduler.max_batch_size, 2]
+    assert scheduler.batches_total - batches_before == 2
+
+
+def test_stream_returns_frames_in_order_and_closes_on_end(client, detector, monkeypatch):
+    from starlette.websockets import WebSocketDisconnect
+
+    import src.main as main
+
+    # 큐보다 많은 프레임을 보내 백프레셔 경로도 함께 거치게 함
+    monkeypatch.setattr(main, "STREAM_MAX_IN_FLIGHT", 2)
+    with client.websocket_connect("/ws/predict") as websocket:
+        for i in range(6):
+            websocket.send_bytes(make_image_bytes((i * 40, 80, 120)))
+        websocket.send_text("end")
+        results = [websocket.receive_json() for _ in range(6)]
+        # "end" 이후 남은 결과를 모두 보낸 뒤 서버가 연결을 닫음
+        with pytest.raises(WebSocketDisconnect):
+            websocket.receive_json()
+
+    assert [result["frame"] for result in results] == list(range(6))
+    assert all(result["predictions"] == [] for result in results)
+    assert sum(detector.calls) == 6
+
+
+def test_stream_stops_receiving_when_sends_fail(client, detector, monkeypatch):
+    from starlette.websockets import WebSocket
+
+    import src.main as main
+
+    async def broken_send_json(self, data, mode="text"):
+        raise OSError("client gone")
+
+    monkeypatch.setattr(main, "STREAM_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(WebSocket, "send_json", broken_send_json)
+    with client.websocket_connect("/ws/predict") as websocket:
+        for i in range(8):
+            websocket.send_bytes(make_image_bytes((i * 30, 80, 120)))
+        # 첫 결과 전송이 실패하면 큐가 가득 찬 채로 멈추지 않고 수신을 끝낸 뒤 연결을 닫아야 함
+        outcome = []
+        reader = threading.Thread(target=lambda: outcome.append(websocket.receive()), daemon=True)
+        reader.start()
+        reader.join(timeout=10)
+        assert outcome and outcome[0]["type"] == "websocket.close"
+        assert outcome[0]["code"] == 1011
+
+    # 전송 중인 1개 + 큐 2개 + put 대기 중인 1개를 넘는 프레임은 분석되지 않음
+    assert sum(detector.calls) <= main.STREAM_MAX_IN_FLIGHT + 2
@@ -0,0 +1,108 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.main import DAMAGE_CLASSES
+from src.utils.risk_utils import METRICS, UNKNOWN_RISK, classify_risk, get_risk_engine
+
+# 기존 classify_risk가 사용하던 클래스 이름 (나머지는 DAMAGE_CLASSES 이름 그대로)
+LEGACY_NAMES = {0: "Others", 1: "거북등", 8: "종방향", 12: "횡방향"}
+# 기존 분기가 없던(항상 "정보 부족") 낮/밤/양호는 위험 요소가 아니므로 "-"
+NON_HAZARD = {2, 3, 6}
+
+
+def legacy_classify_risk(damage_type, area=None, length=None, width=None, count=None):
+    # 규칙 테이블 도입 전 classify_risk의 분기 그대로
+    if damage_type == "종방향":
+        if count is not None and count <= 2 and length < 50:
+            return "A"
+        else:
+            return "B"
+    elif damage_type == "횡방향":
+        if count is not None and length is not None:
+            if count <= 2 and length < 20:
+                return "A"
+            else:
+                return "B"
+    elif damage_type in ("거북등", "불량 보수"):
+        if area is not None:
+            return "A" if area < 0.1 else "B"
+    elif damage_type == "포트홀":
+        if width is not None:
+            return "A" if width < 15 else "B" if width < 30 else "C"
+    elif damage_type == "젖은 도로":
+        if area is not None:
+            return "C"
+    elif damage_type == "쓰레기":
+        if width is not None:
+            return "A" if width < 10 else "B" if width < 30 else "C"
+    elif damage_type in ("Others", "차선 손상"):
+        if area is not None:
+            return "A"
+    elif damage_type == "차선":
+        return "-"
+    return UNKNOWN_RISK
+
+
+def probe_values(class_id):
+    # 규칙의 각 임계값 바로 아래/정확히/바로 위와 양 끝값
+    engine = get_risk_engine()
+    thresholds = engine.thresholds[class_id][np.isfinite(engine.thresholds[class_id])]
+    values = [0.0, 1000.0]
+    for t in thresholds:
+        values += [np.nextafter(t, -np.inf), t, np.nextafter(t, np.inf)]
+    return values
+
+
+@pytest.mark.parametrize("class_id", sorted(DAMAGE_CLASSES))
+def test_engine_matches_legacy_rules(class_id):
+    engine = get_risk_engine()
+    metric = engine.metric[class_id]
+    for value in probe_values(class_id):
+        for count in (1, 2, 3):
+            measured = {name: 1.0 for name in METRICS}
+            if metric >= 0:
+                measured[METRICS[metric]] = value
+            code = engine.classify(np.array([class_id]), np.array([measured["width_cm"]]),
+                                   np.array([measured["length_cm"]]), np.array([measured["area_m2"]]),
+                                   counts=np.array([count]))[0]
+            label = engine.labels[code]
+
+            assert label != UNKNOWN_RISK
+            if class_id in NON_HAZARD:
+                assert label == "-"
+                continue
+            expected = legacy_classify_risk(LEGACY_NAMES.get(class_id, DAMAGE_CLASSES[class_id]),
+                                            area=measured["area_m2"], length=measured["length_cm"],
+                                            width=measured["width_cm"], count=count)
+            assert label == expected, (class_id, value, count)
+            # 이름 기반 호환 함수도 같은 결과
+            assert classify_risk(DAMAGE_CLASSES[class_id], area=measured["area_m2"], length=measured["length_cm"],
+                                 width=measured["width_cm"], count=count) == expected
+
+
+def test_engine_counts_same_class_per_image():
+    engine = get_risk_engine()
+    # 같은 이미지의 짧은 종방향 균열 3개 -> 개수 조건으로 모두 B, 다른 이미지의 1개는 A
+    labels = engine.classify_labels(np.array([8, 8, 8, 8]), np.ones(4), np.full(4, 10.0), np.ones(4),
+                                    image_index=np.array([0, 0, 0, 1]))
+    assert labels == ["B", "B", "B", "A"]
+
+
+@pytest.mark.parametrize("class_id", sorted(set(DAMAGE_CLASSES) - NON_HAZARD))
+def test_classify_risk_missing_inputs_match_legacy(class_id):
+    # 입력(면적/길이/폭/개수)이 None인 모든 조합에서 기존 분기와 같은 결과 (기존 코드가 예외를 내던 조합은 제외)
+    name = DAMAGE_CLASSES[class_id]
+    legacy_name = LEGACY_NAMES.get(class_id, name)
+    nominal = {"area": 0.05, "length": 10.0, "width": 12.0, "count": 1}
+    for missing in itertools.chain.from_iterable(itertools.combinations(nominal, k) for k in range(1, 5)):
+        kwargs = {key: None if key in missing else value for key, value in nominal.items()}
+        try:
+            expected = legacy_classify_risk(legacy_name, **kwargs)
+        except TypeError:
+            continue
+        if class_id == 8 and kwargs["length"] is None:
+            # 기존 종방향 분기는 개수를 모르면 길이 없이도 B - 길이가 없으면 "정보 부족"으로 통일
+            expected = UNKNOWN_RISK
+        assert classify_risk(name, **kwargs) == expected, (name, kwargs)
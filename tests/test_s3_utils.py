@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.bench.in_memory_s3 import InMemoryS3
+from src.bench.s3_stand_in import serve
+from src.utils.s3_utils import S3_MAX_ATTEMPTS, S3Uploader, detect_content_type
+from tests.conftest import make_image_bytes
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    # 재시도 사이 백오프 대기 없이 botocore 재시도 횟수만 확인
+    monkeypatch.setattr("botocore.retries.standard.ExponentialBackoff.delay_amount", lambda self, context: 0)
+    server = serve(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_uploader(server) -> S3Uploader:
+    return S3Uploader(endpoint_url=f"http://127.0.0.1:{server.server_address[1]}")
+
+
+def test_client_retries_failed_upload(stand_in):
+    stand_in.store.fail_requests = 2
+    uploader = make_uploader(stand_in)
+
+    url = uploader.upload_file(make_image_bytes(), file_name="website/uploads/retry.jpg")
+
+    assert url.endswith("/website/uploads/retry.jpg")
+    # 재시도는 S3 클라이언트 한 계층에서만: 실패 2번 + 성공 1번
+    assert stand_in.store.requests == 3
+    assert stand_in.store.objects[(uploader.bucket_name, "website/uploads/retry.jpg")][1] == "image/jpeg"
+
+
+def test_client_gives_up_after_max_attempts(stand_in):
+    stand_in.store.fail_requests = S3_MAX_ATTEMPTS + 5
+    uploader = make_uploader(stand_in)
+
+    with pytest.raises(ClientError):
+        uploader.upload_file(make_image_bytes(), file_name="website/uploads/retry.jpg")
+    assert stand_in.store.requests == S3_MAX_ATTEMPTS
+
+
+def test_in_memory_stub_accepts_multipart_sized_uploads():
+    # 멀티파트 임계값 이상이면 S3Uploader는 put_object 대신 upload_fileobj를 호출함
+    uploader = S3Uploader()
+    uploader.s3_client = InMemoryS3()
+    body = make_image_bytes() + bytes(uploader.transfer_config.multipart_threshold)
+
+    uploader.upload_file(body, file_name="website/uploads/large.jpg")
+
+    assert uploader.s3_client.objects[(uploader.bucket_name, "website/uploads/large.jpg")] == len(body)
+
+
+def test_detect_content_type():
+    assert detect_content_type(make_image_bytes()) == ("image/jpeg", "jpg")
+    assert detect_content_type(b"\x89PNG\r\n\x1a\n....") == ("image/png", "png")
+    assert detect_content_type(b"not an image") == ("application/octet-stream", "bin")
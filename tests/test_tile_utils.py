@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+import torch
+
+from src.utils.tile_utils import merge_tile_boxes, tile_grid, validate_tile_config
+
+
+@pytest.mark.parametrize("tile_size, overlap, max_tiles", [(0, 0.2, 8), (-640, 0.2, 8), (640, -0.1, 8),
+                                                           (640, 1.0, 8), (640, 1.5, 8), (640, 0.2, 0)])
+def test_invalid_tile_config_rejected(tile_size, overlap, max_tiles):
+    with pytest.raises(ValueError):
+        validate_tile_config(tile_size, overlap, max_tiles)
+
+
+def test_tile_grid_covers_image_within_limit():
+    tiles = tile_grid(1920, 1080, 640, 0.2, 8)
+    assert 1 < len(tiles) <= 8
+    assert max(x1 for _, _, x1, _ in tiles) == 1920
+    assert max(y1 for _, _, _, y1 in tiles) == 1080
+
+
+def test_merge_tile_boxes_runs_class_aware_nms():
+    # 겹치는 타일에서 같은 물체가 두 번 검출된 경우 점수가 높은 쪽만 남음 (다른 클래스는 유지)
+    xyxy = np.array([[10, 10, 50, 50], [11, 10, 51, 50], [10, 10, 50, 50]], dtype=np.float32)
+    conf = np.array([0.7, 0.9, 0.8])
+    cls = np.array([11, 11, 1])
+
+    assert merge_tile_boxes(xyxy, conf, cls).tolist() == [1, 2]
+
+
+def test_merge_tile_boxes_suppresses_cut_box_inside_full_box():
+    # 타일 경계에서 잘린 부분 박스는 IoU가 낮아 NMS에서 남지만, 더 높은 점수의 같은 클래스 박스 안에 있으면 제거
+    xyxy = np.array([[0, 0, 100, 100], [60, 10, 100, 50], [60, 10, 100, 50], [200, 0, 300, 100]],
+                    dtype=np.float32)
+    conf = np.array([0.9, 0.7, 0.7, 0.6])
+    cls = np.array([11, 11, 1, 11])
+
+    assert sorted(merge_tile_boxes(xyxy, conf, cls).tolist()) == [0, 2, 3]
+    # 안쪽 박스의 점수가 더 높으면 바깥 박스를 지우지 않음
+    assert sorted(merge_tile_boxes(xyxy[:2], np.array([0.7, 0.9]), cls[:2]).tolist()) == [0, 1]
+    assert merge_tile_boxes(np.zeros((0, 4)), np.zeros(0), np.zeros(0)).tolist() == []
+
+
+class Boxes:
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = torch.tensor(xyxy, dtype=torch.float32)
+        self.conf = torch.tensor(conf, dtype=torch.float32)
+        self.cls = torch.tensor(cls, dtype=torch.float32)
+
+    def __len__(self):
+        return len(self.xyxy)
+
+
+class LocalBoxResult:
+    # 입력(전체 프레임 또는 타일)마다 자기 좌표계의 (2, 2)-(12, 12)에 박스 하나를 검출
+    masks = None
+
+    def __init__(self, image, conf):
+        self.image = image
+        self.orig_shape = (image.height, image.width)
+        self.boxes = Boxes([[2, 2, 12, 12]], [conf], [11])
+
+
+def test_detect_tiled_maps_boxes_and_full_frame_rows(monkeypatch):
+    from PIL import Image
+
+    from src.core.ModelWrapper import ModelWrapper
+    from tests.conftest import make_classifier
+
+    wide, square = Image.new("RGB", (200, 100)), Image.new("RGB", (100, 100))
+    inputs = []
+
+    def detector(images, verbose=False):
+        inputs.extend(images)
+        # 전체 프레임 박스의 점수를 타일 박스보다 높게
+        return [LocalBoxResult(image, 0.9 if image is wide or image is square else 0.8) for image in images]
+
+    monkeypatch.setattr(ModelWrapper, "_load_models", lambda self, paths, parallel=True: [make_classifier(), detector])
+    wrapper = ModelWrapper(["night_day_model.pth", "yolo_best.pt"], tiled=True, tile_size=100, tile_overlap=0.0,
+                           max_tiles=4, day_night_gate=False)
+    batch_results = [{}, {}]
+
+    full_frame_index, num_inputs = wrapper._detect_tiled([wide, square], batch_results)
+
+    # [wide, wide 타일 2개, square] 순서로 한 번에 호출 - square는 타일 하나로 덮이므로 타일 없음
+    assert [image.size for image in inputs] == [(200, 100), (100, 100), (100, 100), (100, 100)]
+    assert (full_frame_index, num_inputs) == ([0, 3], 4)
+    # 첫 타일 박스는 전체 프레임 박스와 겹쳐 합쳐지고, 두 번째 타일 박스는 원본 좌표 (102, 2)로 옮겨짐
+    assert [d["bbox"] for d in batch_results[0]["detection"]["detections"]] == [[2, 2, 10, 10], [102, 2, 10, 10]]
+    assert [d["bbox"] for d in batch_results[1]["detection"]["detections"]] == [[2, 2, 10, 10]]
+    # 시각화용 결과는 이미지마다 자기 전체 프레임 행
+    assert batch_results[0]["yolo_results"][0].image is wide
+    assert batch_results[1]["yolo_results"][0].image is square
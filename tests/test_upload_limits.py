@@ -0,0 +1,17 @@
+import src.main as main
+from src.utils.upload_utils import BodySizeLimitMiddleware
+from tests.conftest import make_image_bytes
+
+ORIGIN = "http://localhost:5173"
+
+
+def test_oversized_upload_gets_413_with_cors_headers(client, monkeypatch):
+    limits = next(m.kwargs["limits"] for m in main.app.user_middleware if m.cls is BodySizeLimitMiddleware)
+    monkeypatch.setitem(limits, "/predict", 1024)
+
+    response = client.post("/predict", headers={"Origin": ORIGIN},
+                           files={"file": ("frame.jpg", make_image_bytes(size=(256, 256)), "image/jpeg")})
+
+    assert response.status_code == 413
+    # CORS 미들웨어가 바깥에 있어야 브라우저가 413 응답을 읽을 수 있음
+    assert response.headers["access-control-allow-origin"] == ORIGIN
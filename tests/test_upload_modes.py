@@ -0,0 +1,111 @@
+import threading
+
+import src.main as main
+from src.bench.in_memory_s3 import InMemoryS3
+from src.utils.cache_utils import PendingResult
+from tests.conftest import make_image_bytes
+
+
+async def wait(awaitable):
+    return await awaitable
+
+
+class FailingS3(InMemoryS3):
+    def put_object(self, **kwargs):
+        raise ConnectionError("stub failure")
+
+
+class BlockingS3(InMemoryS3):
+    # release가 set될 때까지 put_object가 끝나지 않는 스텁 (started: 업로드 시작, in_flight: 진행 중인 업로드 수)
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.in_flight = 0
+        self.order = []
+
+    def put_object(self, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+        self.started.set()
+        try:
+            assert self.release.wait(timeout=10)
+            with self._lock:
+                self.order.append(kwargs["Key"])
+            return super().put_object(**kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_parallel_mode_uploads_original_during_inference(client, detector, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_MODE", "parallel")
+    s3 = BlockingS3()
+    main.app.state.s3_uploader.s3_client = s3
+    seen = []
+
+    def during_inference():
+        # 추론이 끝나기 전에 원본 업로드가 이미 진행 중이어야 함 (끝나지 않게 막아 둔 상태)
+        seen.append(s3.started.wait(timeout=10) and s3.in_flight)
+        s3.release.set()
+
+    detector.on_call = during_inference
+    result = client.portal.call(main.run_prediction, make_image_bytes())
+
+    assert seen == [1]
+    assert s3.order[0] == result["original_image_url"].split("/", 3)[-1]
+    assert len(s3.objects) == 2
+
+
+def test_sequential_mode_uploads_after_inference(client, detector, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_MODE", "sequential")
+    s3 = BlockingS3()
+    s3.release.set()
+    main.app.state.s3_uploader.s3_client = s3
+    seen = []
+    detector.on_call = lambda: seen.append(s3.started.is_set())
+
+    result = client.portal.call(main.run_prediction, make_image_bytes())
+
+    assert seen == [False]
+    assert s3.order == [result["original_image_url"].split("/", 3)[-1], result["result_image_url"].split("/", 3)[-1]]
+
+
+def test_background_mode_returns_before_upload(client, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_MODE", "background")
+    s3 = BlockingS3()
+    main.app.state.s3_uploader.s3_client = s3
+
+    pending = client.portal.call(main.run_prediction, make_image_bytes())
+
+    # 업로드가 막혀 있어도 응답(미리 계산한 URL)은 이미 준비됨
+    assert isinstance(pending, PendingResult)
+    result = pending.value
+    assert result["original_image_url"].endswith(".jpg")
+    assert s3.objects == {}
+    s3.release.set()
+    assert client.portal.call(wait, pending.ready) is True
+    assert {key for _, key in s3.objects} == {
+        result["original_image_url"].split("/", 3)[-1], result["result_image_url"].split("/", 3)[-1]}
+
+
+def test_background_results_cached_only_after_upload_succeeds(client, detector, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_MODE", "background")
+    cache = main.app.state.result_cache
+    image = make_image_bytes((10, 200, 30))
+
+    # 업로드가 실패하면 미리 계산한 URL이 가리키는 객체가 없으므로 캐시하지 않음
+    main.app.state.s3_uploader.s3_client = FailingS3()
+    assert client.post("/predict", files={"file": ("a.jpg", image, "image/jpeg")}).status_code == 200
+    client.portal.call(cache.wait_pending)
+    assert client.post("/predict", files={"file": ("a.jpg", image, "image/jpeg")}).status_code == 200
+    client.portal.call(cache.wait_pending)
+    assert detector.calls == [1, 1]
+
+    # 업로드가 성공한 뒤에는 같은 이미지가 캐시에서 응답됨
+    main.app.state.s3_uploader.s3_client = InMemoryS3()
+    first = client.post("/predict", files={"file": ("a.jpg", image, "image/jpeg")}).json()
+    client.portal.call(cache.wait_pending)
+    second = client.post("/predict", files={"file": ("a.jpg", image, "image/jpeg")}).json()
+    assert detector.calls == [1, 1, 1]
+    assert second == first